@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,6 +8,27 @@ class Settings(BaseSettings):
     debug: bool = False
     auth_token: str
 
+    # Background export jobs (see app/export_jobs.py)
+    export_workers: int = 2
+    export_cache_dir: str = "export_cache"
+    # Processes serializing Excel rows (0: serialize in the request thread)
+    export_processes: int = 0
+
+    # Statements slower than this are logged to logs/slow-queries.log (0: off)
+    slow_query_ms: float = 250
+
+    # SQLite tuning, applied to every new connection (see app/database.py).
+    # WAL lets readers run alongside a writer; NORMAL is durable enough in WAL.
+    sqlite_journal_mode: Literal["delete", "truncate", "persist", "memory", "wal", "off"] = "wal"
+    sqlite_synchronous: Literal["off", "normal", "full", "extra"] = "normal"
+    sqlite_cache_size: int = -65536          # pages, or KiB when negative (64 MiB)
+    sqlite_mmap_size: int = 268435456        # bytes (256 MiB; 0: no memory-mapped I/O)
+    sqlite_temp_store: Literal["default", "file", "memory"] = "memory"
+    sqlite_busy_timeout: int = 5000          # ms to wait for a lock before "database is locked"
+
+    # Connections kept open by the read-only engine behind list, report and export routes
+    read_pool_size: int = 5
+
     # This override of model_config is expected in pydantic-settings
     model_config = SettingsConfigDict(
         env_file=".env"
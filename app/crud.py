@@ -1,17 +1,119 @@
+from collections import Counter
 from datetime import datetime, timezone, timedelta
-from sqlalchemy.orm import Session, selectinload, joinedload, aliased
+from sqlalchemy.orm import Session, selectinload, joinedload, aliased, contains_eager, with_polymorphic
 from . import models, schemas
 from typing import Optional, List, Union
-from sqlalchemy import func, case, desc, and_, or_, select
-from sqlalchemy import cast, String
+from sqlalchemy import func, case, desc, and_, or_, select, exists
+from sqlalchemy import cast, String, event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from .models import Season, CourseTerm, GradSchoolActivity, EntityType, GradeType, ActivityType
 from sqlalchemy.exc import NoResultFound
+from .pagination import Page, PageParams, SortKey, paginate
+from .search import FTS_INDEXES, contains_filter, ranked_matches
 
 
 class EntityNotFoundError(Exception):
     pass
 
 
+# <editor-fold desc="Loader plans">
+# ---------- Loader plans ----------
+# The list views serialize a PersonRoleReadFull for every row
+# (person_role -> role, person_role -> person -> roles -> role), which would
+# otherwise be lazy-loaded one row at a time. These plans load that graph
+# up front; exports that only print names/emails use the lighter variants.
+
+def person_role_full_plan(person_role_attr) -> list:
+    """Eager-load the PersonRoleReadFull graph hanging off `person_role_attr`."""
+    return [
+        joinedload(person_role_attr).joinedload(models.PersonRole.role),
+        joinedload(person_role_attr)
+        .joinedload(models.PersonRole.person)
+        .selectinload(models.Person.roles)
+        .joinedload(models.PersonRole.role),
+    ]
+
+
+def person_plan(person_role_attr) -> list:
+    """Eager-load only person_role -> person (names, emails, role dates)."""
+    return [joinedload(person_role_attr).joinedload(models.PersonRole.person)]
+
+
+RESEARCHER_LIST_PLAN = [
+    *person_role_full_plan(models.Researcher.person_role),
+    joinedload(models.Researcher.title),
+    joinedload(models.Researcher.original_title),
+]
+RESEARCHER_EXPORT_PLAN = [
+    *person_plan(models.Researcher.person_role),
+    joinedload(models.Researcher.title),
+]
+
+PHD_STUDENT_LIST_PLAN = person_role_full_plan(models.PhDStudent.person_role)
+PHD_STUDENT_EXPORT_PLAN = person_plan(models.PhDStudent.person_role)
+
+POSTDOC_LIST_PLAN = [
+    *person_role_full_plan(models.Postdoc.person_role),
+    joinedload(models.Postdoc.current_title),
+    joinedload(models.Postdoc.current_institution),
+]
+POSTDOC_EXPORT_PLAN = [
+    *person_plan(models.Postdoc.person_role),
+    joinedload(models.Postdoc.current_title),
+    joinedload(models.Postdoc.current_institution),
+]
+
+SEMESTER_ABROAD_LIST_PLAN = [
+    joinedload(models.AbroadStudentActivity.student).options(*person_role_full_plan(models.PhDStudent.person_role)),
+]
+SEMESTER_ABROAD_EXPORT_PLAN = [
+    joinedload(models.AbroadStudentActivity.student).options(*person_plan(models.PhDStudent.person_role)),
+]
+
+# Student activities are single-table polymorphic: querying the base class
+# would load is_completed/grade (and the grad school activity) row by row.
+STUDENT_ACTIVITY = with_polymorphic(models.StudentActivity, "*")
+STUDENT_ACTIVITY_LIST_PLAN = [
+    joinedload(STUDENT_ACTIVITY.GradSchoolStudentActivity.activity)
+    .joinedload(models.GradSchoolActivity.activity_type),
+]
+STUDENT_ACTIVITY_EXPORT_PLAN = [
+    joinedload(STUDENT_ACTIVITY.student).options(*person_plan(models.PhDStudent.person_role)),
+]
+
+COURSE_STUDENT_LIST_PLAN: list = []  # CourseStudentRead only has the link's own columns
+COURSE_STUDENT_EXPORT_PLAN = [
+    joinedload(models.PhDStudentCourse.student).options(*person_plan(models.PhDStudent.person_role)),
+]
+
+# Exports stream their rows from the database cursor in batches of this size
+# (`yield_per=`), so no plan above may joinedload a collection.
+EXPORT_BATCH_SIZE = 500
+
+# </editor-fold>
+
+# <editor-fold desc="Data version">
+# ---------- Data version ----------
+# Cached export artifacts are keyed on this counter, so that any write to the
+# registry (by this process or another one) invalidates them.
+
+@event.listens_for(Session, "after_flush")
+def _bump_data_version(db: Session, flush_context):
+    if not (db.new or db.dirty or db.deleted):
+        return
+    bump = sqlite_insert(models.DataVersion).values(id=1, version=1).on_conflict_do_update(
+        index_elements=[models.DataVersion.id],
+        set_={"version": models.DataVersion.version + 1}
+    )
+    db.connection().execute(bump)
+
+
+def get_data_version(db: Session) -> int:
+    return db.query(models.DataVersion.version).filter_by(id=1).scalar() or 0
+
+# </editor-fold>
+
+
 # <editor-fold desc="User-related functions">
 # ---------- User ----------
 
@@ -109,63 +211,52 @@ def get_institutions(db: Session, name: Optional[str] = None, search: Optional[s
         """Returns SQLAlchemy clause: Column is None OR Column >= Today"""
         return or_(column.is_(None), column >= today)
 
-    # --- 3. DEFINE SUBQUERY HELPER ---
-    def make_count_subquery(role_type_enum, active_only: bool):
-        # Start counting entries in the Link table
-        sq = db.query(func.count(models.PersonInstitution.institution_id))
-
-        # Join Link -> PersonRole
-        sq = sq.join(
-            models.PersonRole,
-            models.PersonInstitution.person_role_id == models.PersonRole.id
-        )
-        # Join PersonRole -> Role (to filter by Researcher/PhD/Postdoc)
-        sq = sq.join(
-            models.Role,
-            models.PersonRole.role_id == models.Role.id
-        )
-
-        # Filter 1: Match the specific Role Type (Researcher, PhD, etc.)
-        sq = sq.filter(models.Role.role == role_type_enum)
-
-        # Filter 2: Correlate with the main Institution query
-        sq = sq.filter(models.PersonInstitution.institution_id == models.Institution.id)
-        sq = sq.correlate(models.Institution)
-
-        # Filter 3: Active Status (Only if requested)
+    # --- 3. DEFINE CONDITIONAL COUNT HELPER ---
+    def count_where(role_type_enum, active_only: bool):
+        # Counts the link rows of one role type (optionally only the active ones)
+        condition = models.Role.role == role_type_enum
         if active_only:
-            sq = sq.filter(
-                and_(
-                    # The PersonRole itself must be active
-                    is_active_clause(models.PersonRole.end_date),
-                    # AND the Link to the institution must be active
-                    is_active_clause(models.PersonInstitution.end_date)
-                )
+            condition = and_(
+                condition,
+                # The PersonRole itself must be active
+                is_active_clause(models.PersonRole.end_date),
+                # AND the Link to the institution must be active
+                is_active_clause(models.PersonInstitution.end_date)
             )
-
-        return sq.scalar_subquery()
-
-    # --- 4. BUILD SUBQUERIES ---
-    res_active = make_count_subquery(models.RoleType.RESEARCHER, active_only=True)
-    res_total = make_count_subquery(models.RoleType.RESEARCHER, active_only=False)
-
-    phd_active = make_count_subquery(models.RoleType.PHD_STUDENT, active_only=True)
-    phd_total = make_count_subquery(models.RoleType.PHD_STUDENT, active_only=False)
-
-    doc_active = make_count_subquery(models.RoleType.POSTDOC, active_only=True)
-    doc_total = make_count_subquery(models.RoleType.POSTDOC, active_only=False)
+        return func.sum(case((condition, 1), else_=0))
+
+    # --- 4. ONE GROUPED PASS OVER THE LINK TABLE ---
+    # Link -> PersonRole -> Role, all six counts per institution at once
+    counts = (
+        db.query(
+            models.PersonInstitution.institution_id.label("institution_id"),
+            count_where(models.RoleType.RESEARCHER, active_only=True).label("res_active"),
+            count_where(models.RoleType.RESEARCHER, active_only=False).label("res_total"),
+            count_where(models.RoleType.PHD_STUDENT, active_only=True).label("phd_active"),
+            count_where(models.RoleType.PHD_STUDENT, active_only=False).label("phd_total"),
+            count_where(models.RoleType.POSTDOC, active_only=True).label("doc_active"),
+            count_where(models.RoleType.POSTDOC, active_only=False).label("doc_total"),
+        )
+        .join(models.PersonRole, models.PersonInstitution.person_role_id == models.PersonRole.id)
+        .join(models.Role, models.PersonRole.role_id == models.Role.id)
+        .group_by(models.PersonInstitution.institution_id)
+        .subquery()
+    )
 
     # --- 5. MAIN QUERY ---
-    q = db.query(
-        models.Institution,
-        res_active, res_total,
-        phd_active, phd_total,
-        doc_active, doc_total
+    # outer join: institutions without any links keep zero counts
+    q = (
+        db.query(
+            models.Institution,
+            counts.c.res_active, counts.c.res_total,
+            counts.c.phd_active, counts.c.phd_total,
+            counts.c.doc_active, counts.c.doc_total
+        )
+        .outerjoin(counts, counts.c.institution_id == models.Institution.id)
     )
 
     if search:
-        term = f"%{search}%"
-        q = q.filter(models.Institution.institution.ilike(term))
+        q = q.filter(contains_filter(models.Institution, "institutions_fts", search, ("institution_key",)))
 
     q = q.order_by(models.Institution.institution)
 
@@ -329,6 +420,24 @@ def delete_field(db: Session, field_id: int):
     db.commit()
 
 
+def has_field(link_owner_column, owner_id, field_id: Optional[int] = None, branch_id: Optional[int] = None):
+    """
+    Filter for owners (person roles, projects) linked to the field, or to any
+    field of the branch, through `link_owner_column`'s table, e.g.
+    has_field(models.PersonField.person_role_id, models.PhDStudent.person_role_id, branch_id=3).
+
+    An EXISTS rather than a join, so an owner with several matching fields
+    stays one row: keyset pagination and streamed exports both rely on that.
+    """
+    link = link_owner_column.class_
+    conditions = [link_owner_column == owner_id]
+    if field_id is not None:
+        conditions.append(link.field_id == field_id)
+    if branch_id is not None:
+        conditions += [link.field_id == models.AcademicField.id, models.AcademicField.branch_id == branch_id]
+    return exists().where(*conditions)
+
+
 # </editor-fold>
 
 # <editor-fold desc="Decision Letter-related functions">
@@ -345,6 +454,52 @@ def list_decision_letters(db: Session,
     return q  # type: ignore
 
 
+def list_decision_letters_for(db: Session,
+                              entity_type: EntityType,
+                              entity_ids) -> dict[int, list[models.DecisionLetter]]:
+    """Decision letters of many entities of one type, keyed by entity id, in one query."""
+    ids = set(entity_ids)
+    letters = {entity_id: [] for entity_id in ids}
+    if not ids:
+        return letters
+    q = (
+        db.query(models.DecisionLetter)
+        .filter(
+            models.DecisionLetter.entity_type == entity_type,
+            models.DecisionLetter.entity_id.in_(ids)
+        )
+        .order_by(models.DecisionLetter.entity_id, models.DecisionLetter.id)
+    )
+    for letter in q:
+        letters[letter.entity_id].append(letter)
+    return letters
+
+
+def entity_ids_with_decision_letters(db: Session, entity_type: EntityType, entity_ids) -> set[int]:
+    """The subset of `entity_ids` that have at least one decision letter."""
+    ids = set(entity_ids)
+    if not ids:
+        return set()
+    rows = (
+        db.query(models.DecisionLetter.entity_id)
+        .filter(
+            models.DecisionLetter.entity_type == entity_type,
+            models.DecisionLetter.entity_id.in_(ids)
+        )
+        .distinct()
+        .all()
+    )
+    return {entity_id for (entity_id,) in rows}
+
+
+def mark_decision_letters(db: Session, entity_type: EntityType, objs, key=lambda obj: obj.id):
+    """Set `has_decision_letter` on every object of a list view (one query for all of them)."""
+    with_letters = entity_ids_with_decision_letters(db, entity_type, (key(obj) for obj in objs))
+    for obj in objs:
+        obj.has_decision_letter = key(obj) in with_letters
+    return objs
+
+
 def add_decision_letter(db: Session,
                         entity_type: EntityType,
                         entity_id: int,
@@ -436,7 +591,9 @@ def list_grad_school_activities(
     activity_type_id: Optional[int] = None,
     description:      Optional[str] = None,
     year:             Optional[int] = None,
-    search:           Optional[str] = None
+    search:           Optional[str] = None,
+    page:             Optional[PageParams] = None,
+    yield_per:        Optional[int] = None,
 ) -> list[models.GradSchoolActivity]:
     q = (
         db
@@ -466,18 +623,16 @@ def list_grad_school_activities(
             )
         )
 
-    q = (
-        q.outerjoin(
-            models.GradSchoolActivityType,
-            models.GradSchoolActivity.activity_type_id == models.GradSchoolActivityType.id
-        )
-        .order_by(
-            desc(models.GradSchoolActivity.year),
-            models.GradSchoolActivityType.type
-        )
+    q = q.outerjoin(
+        models.GradSchoolActivityType,
+        models.GradSchoolActivity.activity_type_id == models.GradSchoolActivityType.id
     )
 
-    return q.all()  # type: ignore
+    return paginate(q, [
+        SortKey(models.GradSchoolActivity.year, descending=True),
+        SortKey(models.GradSchoolActivityType.type),
+        SortKey(models.GradSchoolActivity.id),
+    ], page, yield_per=yield_per)  # type: ignore
 
 
 def create_grad_school_activity(db: Session, gsa_in: schemas.GradSchoolActivityCreate):
@@ -653,22 +808,36 @@ def get_course(db: Session, course_id: int):
 def list_courses(db: Session, title: Optional[str] = None, term_id: Optional[int] = None,
                  activity_id: Optional[int] = None, is_active_term: Optional[bool] = None,
                  teacher_role_id: Optional[int] = None,
-                 search: Optional[str] = None):
-
-    # --- CHANGE 1: Define the subquery for the count ---
-    # This selects the count of student IDs where the course_id matches the parent query
-    student_count_sub = (
-        db.query(func.count(models.PhDStudentCourse.phd_student_id))
-        .filter(models.PhDStudentCourse.course_id == models.Course.id)
-        .correlate(models.Course)
-        .label("student_count")
+                 search: Optional[str] = None,
+                 page: Optional[PageParams] = None,
+                 yield_per: Optional[int] = None):
+
+    # --- Per-course counts: one grouped pass over each link table ---
+    students = (
+        db.query(models.PhDStudentCourse.course_id.label("course_id"),
+                 func.count().label("n"))
+        .group_by(models.PhDStudentCourse.course_id)
+        .subquery()
+    )
+    teachers = (
+        db.query(models.CourseTeacher.course_id.label("course_id"),
+                 func.count().label("n"))
+        .group_by(models.CourseTeacher.course_id)
+        .subquery()
+    )
+    institutions = (
+        db.query(models.CourseInstitution.course_id.label("course_id"),
+                 func.count().label("n"))
+        .group_by(models.CourseInstitution.course_id)
+        .subquery()
     )
 
-    # --- CHANGE 2: Add the subquery to the main selection ---
-    # Instead of just models.Course, ask for (models.Course, student_count_sub)
-    q = db.query(models.Course, student_count_sub)
-
-    # q = db.query(models.Course)
+    q = db.query(
+        models.Course,
+        func.coalesce(students.c.n, 0),
+        func.coalesce(teachers.c.n, 0),
+        func.coalesce(institutions.c.n, 0),
+    )
 
     if title is not None:
         q = q.filter_by(title=title)
@@ -688,8 +857,7 @@ def list_courses(db: Session, title: Optional[str] = None, term_id: Optional[int
         )
 
     if search:
-        term = f"%{search}%"
-        q = q.filter(models.Course.title.ilike(term))
+        q = q.filter(contains_filter(models.Course, "courses_fts", search, ("title_key",)))
 
     if is_active_term is not None:
         # outer-join so term-less (i.e. grad-school) courses remain in the result,
@@ -719,6 +887,18 @@ def list_courses(db: Session, title: Optional[str] = None, term_id: Optional[int
         models.GradSchoolActivity,
         models.Course.grad_school_activity_id == models.GradSchoolActivity.id
     )
+    # the joined term/activity also fill in each course's relationships
+    q = q.options(
+        contains_eager(models.Course.course_term),
+        contains_eager(models.Course.grad_school_activity).joinedload(models.GradSchoolActivity.activity_type),
+    )
+
+    # outer joins: courses without links keep zero counts
+    q = (
+        q.outerjoin(students, students.c.course_id == models.Course.id)
+        .outerjoin(teachers, teachers.c.course_id == models.Course.id)
+        .outerjoin(institutions, institutions.c.course_id == models.Course.id)
+    )
 
     # build a *mapping* of condition → sort order so SQLAlchemy sees a Mapping
     season_cases = {
@@ -733,26 +913,30 @@ def list_courses(db: Session, title: Optional[str] = None, term_id: Optional[int
         models.GradSchoolActivity.year.isnot(None): models.GradSchoolActivity.year
     }
 
-    q = q.order_by(
-        desc(case(year_cases, else_=0)),
-        desc(season_ordering)
-    )
+    # results is a list of tuples: [(CourseObject, 5, 1, 2), ...]
+    # Need to attach the integers to the object so Pydantic picks them up.
 
-    # --- CHANGE 3: Process the results ---
-    # q.all() now returns a list of tuples: [(CourseObject, 5), (CourseObject, 0), ...]
-    # Need to attach the integer to the object so Pydantic picks it up.
+    results = paginate(q, [
+        SortKey(case(year_cases, else_=0), descending=True),
+        SortKey(season_ordering, descending=True),
+        SortKey(models.Course.id),
+    ], page, yield_per=yield_per)
 
-    results = q.all()
+    def with_counts(rows):
+        for course_obj, student_count, teacher_count, institution_count in rows:
+            # We manually attach the counts to the object.
+            # Since they are in the Pydantic Schema, it will read these attributes.
+            course_obj.student_count = student_count
+            course_obj.teacher_count = teacher_count
+            course_obj.institution_count = institution_count
+            yield course_obj
 
-    final_list = []
-    for course_obj, count_val in results:
-        # We manually attach the count to the object.
-        # Since 'student_count' is in your Pydantic Schema, it will read this attribute.
-        course_obj.student_count = count_val
-        final_list.append(course_obj)
+    if yield_per is not None:
+        return with_counts(results)  # exports stream the rows, without the list-view flags
 
+    final_list = Page(with_counts(results), next_cursor=results.next_cursor)
     # return q.all()  # type: ignore
-    return final_list
+    return mark_decision_letters(db, EntityType.COURSE, final_list)
 
 
 def create_course(db: Session, c_in: schemas.CourseCreate):
@@ -909,18 +1093,33 @@ def list_projects(db: Session, call_type_id: Optional[int] = None, title: Option
                   project_status: Optional[str] = None,
                   field_id: Optional[int] = None,
                   branch_id: Optional[int] = None,
-                  search: Optional[str] = None):
-    # --- Define the subquery for the count ---
-    field_count_sub = (
-        db.query(func.count(models.ProjectField.field_id))
-        .filter(models.ProjectField.project_id == models.Project.id)
-        .correlate(models.Project)
-        .label("field_count")
+                  search: Optional[str] = None,
+                  page: Optional[PageParams] = None,
+                  yield_per: Optional[int] = None):
+    # --- Per-project counts: one grouped pass over each link table ---
+    fields = (
+        db.query(models.ProjectField.project_id.label("project_id"),
+                 func.count().label("n"))
+        .group_by(models.ProjectField.project_id)
+        .subquery()
+    )
+    members = (
+        db.query(
+            models.PersonProject.project_id.label("project_id"),
+            func.count(func.distinct(models.PersonProject.person_role_id)).label("n"),
+            func.sum(case((models.PersonProject.is_principal_investigator.is_(True), 1), else_=0)).label("pi"),
+        )
+        .group_by(models.PersonProject.project_id)
+        .subquery()
     )
 
-    # --- Select the Model PLUS the subquery ---
-    q = db.query(models.Project, field_count_sub)
-    # q = db.query(models.Project)
+    # --- Select the Model PLUS the counts ---
+    q = db.query(
+        models.Project,
+        func.coalesce(fields.c.n, 0),
+        func.coalesce(members.c.n, 0),
+        func.coalesce(members.c.pi, 0),
+    )
 
     if call_type_id is not None:
         q = q.filter_by(call_type_id=call_type_id)
@@ -970,64 +1169,44 @@ def list_projects(db: Session, call_type_id: Optional[int] = None, title: Option
                 )
             )
 
-    # filter by exact field link
-    if field_id is not None:
-        q = (
-            q.join(
-                models.ProjectField,
-                models.Project.id == models.ProjectField.project_id
-            )
-            .filter_by(field_id=field_id)
-        )
-
-    # filter by branch via the AcademicField join
-    if branch_id is not None:
-        if field_id is None:  # not joined with ProjectField yet
-            q = (
-                q.join(
-                    models.ProjectField,
-                    models.Project.id == models.ProjectField.project_id
-                )
-            )
-
-        q = (
-            q.join(
-                models.AcademicField,
-                models.ProjectField.field_id == models.AcademicField.id
-            )
-            .filter_by(branch_id=branch_id)
-        )
+    # filter by field and/or branch
+    if field_id is not None or branch_id is not None:
+        q = q.filter(has_field(models.ProjectField.project_id, models.Project.id, field_id, branch_id))
 
     if search:
-        term = f"%{search}%"
-        q = q.filter(
-            or_(
-                models.Project.title.ilike(term),
-                models.Project.project_number.ilike(term),
-            )
-        )
+        q = q.filter(contains_filter(models.Project, "projects_fts", search, ("title_key", "project_number")))
+
+    q = q.outerjoin(models.ProjectCallType, models.Project.call_type_id == models.ProjectCallType.id)
+    q = q.options(contains_eager(models.Project.call_type))
 
+    # outer joins: projects without links keep zero counts
     q = (
-        q.outerjoin(models.ProjectCallType, models.Project.call_type_id == models.ProjectCallType.id)
-        .order_by(desc(models.Project.start_date))
+        q.outerjoin(fields, fields.c.project_id == models.Project.id)
+        .outerjoin(members, members.c.project_id == models.Project.id)
     )
 
-    # --- Unpack results to attach the count ---
-    results = q.all()
-    final_list = []
+    # --- Unpack results to attach the counts ---
+    results = paginate(q, [
+        SortKey(models.Project.start_date, descending=True),
+        SortKey(models.Project.id),
+    ], page, yield_per=yield_per)
 
-    for row in results:
-        # row is a tuple: (ProjectObject, int_count)
-        proj_obj = row[0]
-        count_val = row[1]
+    def with_counts(rows):
+        for proj_obj, field_count, member_count, pi_count in rows:
+            # Attach the counts so Pydantic sees 'field_count' etc.
+            proj_obj.field_count = field_count
+            proj_obj.member_count = member_count
+            proj_obj.pi_count = pi_count
+            yield proj_obj
+
+    if yield_per is not None:
+        return with_counts(results)  # exports stream the rows, without the list-view flags
 
-        # Attach the count so Pydantic sees 'field_count'
-        proj_obj.field_count = count_val or 0
-        final_list.append(proj_obj)
+    final_list = Page(with_counts(results), next_cursor=results.next_cursor)
 
     # return q.all()  # type: ignore
 
-    return final_list
+    return mark_decision_letters(db, EntityType.PROJECT, final_list)
 
 
 def create_project(db: Session, p_in: schemas.ProjectCreate):
@@ -1097,18 +1276,19 @@ def get_person(db: Session, person_id: int) -> Optional[models.Person]:
     return db.query(models.Person).filter_by(id=person_id).first()
 
 
-def list_persons(db: Session, search: Optional[str] = None) -> List[models.Person]:
-    q = db.query(models.Person)
+def list_persons(db: Session, search: Optional[str] = None,
+                 page: Optional[PageParams] = None) -> List[models.Person]:
+    # PersonRead lists each person's roles
+    q = db.query(models.Person).options(selectinload(models.Person.roles).joinedload(models.PersonRole.role))
     if search:
-        term = f"%{search}%"
         q = q.filter(
-            or_(
-                models.Person.first_name.ilike(term),
-                models.Person.last_name.ilike(term),
-                models.Person.email.ilike(term),
-            )
+            contains_filter(models.Person, "people_fts", search, ("first_name_key", "last_name_key", "email_key"))
         )
-    return q.order_by(models.Person.first_name, models.Person.last_name).all()  # type: ignore
+    return paginate(q, [
+        SortKey(models.Person.first_name),
+        SortKey(models.Person.last_name),
+        SortKey(models.Person.id),
+    ], page)  # type: ignore
 
 
 def create_person(db: Session, p_in: schemas.PersonCreate) -> models.Person:
@@ -1170,8 +1350,12 @@ def list_person_roles(
     person_id: Optional[int] = None,
     role_id: Optional[int] = None,
     active: Optional[bool] = None,
+    page: Optional[PageParams] = None,
 ) -> List[models.PersonRole]:
-    q = db.query(models.PersonRole)
+    q = db.query(models.PersonRole).options(
+        joinedload(models.PersonRole.role),
+        joinedload(models.PersonRole.person).selectinload(models.Person.roles).joinedload(models.PersonRole.role),
+    )
     if person_id is not None:
         q = q.filter_by(person_id=person_id)
     if role_id is not None:
@@ -1197,7 +1381,10 @@ def list_person_roles(
                 )
             )
 
-    return q.order_by(models.PersonRole.start_date.desc()).all()  # type: ignore
+    return paginate(q, [
+        SortKey(models.PersonRole.start_date, descending=True),
+        SortKey(models.PersonRole.id),
+    ], page)  # type: ignore
 
 
 def create_person_role(db: Session, pr_in: schemas.PersonRoleCreate) -> models.PersonRole:
@@ -1249,6 +1436,28 @@ def delete_person_role(db: Session, person_role_id: int) -> None:
     db.commit()
 
 
+def unique_person_roles(db: Session, grouped) -> List[tuple]:
+    """
+    Load the person roles of `grouped` (a subquery of one row per
+    `person_role_id` plus aggregated flag columns) ordered by name, as
+    (PersonRole, flag, ...) tuples.
+    """
+    flags = [c for c in grouped.c if c.name != "person_role_id"]
+    rows = (
+        db.query(models.PersonRole, *flags)
+        .join(grouped, grouped.c.person_role_id == models.PersonRole.id)
+        .join(models.Person, models.PersonRole.person_id == models.Person.id)
+        .options(
+            contains_eager(models.PersonRole.person),
+            joinedload(models.PersonRole.role)
+        )
+        .order_by(models.Person.first_name, models.Person.last_name, models.PersonRole.id)
+        .all()
+    )
+    # MAX() over boolean columns comes back as 0/1 (or NULL)
+    return [(row[0], *(bool(flag) for flag in row[1:])) for row in rows]
+
+
 # </editor-fold>
 
 # <editor-fold desc="Researcher-related functions">
@@ -1315,9 +1524,12 @@ def list_researchers(
     field_id:         Optional[int] = None,
     branch_id:        Optional[int] = None,
     search:           Optional[str] = None,
+    load_plan:        list = RESEARCHER_LIST_PLAN,
+    page:             Optional[PageParams] = None,
+    yield_per:        Optional[int] = None,
 ) -> List[models.Researcher]:
 
-    q = db.query(models.Researcher)
+    q = db.query(models.Researcher).options(*load_plan)
     seen = set()
 
     # 1) simple equality filters
@@ -1367,22 +1579,8 @@ def list_researchers(
 
     # 4) field/branch filter
     if field_id is not None or branch_id is not None:
-        if "pr" not in seen:
-            q = q.join(models.PersonRole,
-                       models.Researcher.person_role_id == models.PersonRole.id)
-            seen.add("pr")
-        if "pf" not in seen:
-            q = q.join(models.PersonField,
-                       models.PersonRole.id == models.PersonField.person_role_id)
-            seen.add("pf")
-        if field_id is not None:
-            q = q.filter_by(field_id=field_id)
-        if branch_id is not None:
-            if "af" not in seen:
-                q = q.join(models.AcademicField,
-                           models.PersonField.field_id == models.AcademicField.id)
-                seen.add("af")
-            q = q.filter_by(branch_id=branch_id)
+        q = q.filter(has_field(models.PersonField.person_role_id, models.Researcher.person_role_id,
+                               field_id, branch_id))
 
     # 5) substring search on name
     if search:
@@ -1394,13 +1592,7 @@ def list_researchers(
             q = q.join(models.Person,
                        models.PersonRole.person_id == models.Person.id)
             seen.add("p")
-        term = f"%{search}%"
-        q = q.filter(
-            or_(
-                models.Person.first_name.ilike(term),
-                models.Person.last_name.ilike(term),
-            )
-        )
+        q = q.filter(contains_filter(models.Person, "people_fts", search, ("first_name_key", "last_name_key")))
 
     # 6) ordering by last_name, first_name
     if "pr" not in seen:
@@ -1412,9 +1604,18 @@ def list_researchers(
                    models.PersonRole.person_id == models.Person.id)
         seen.add("p")
 
-    q = q.order_by(models.Person.first_name, models.Person.last_name)
+    results = paginate(q, [
+        SortKey(models.Person.first_name),
+        SortKey(models.Person.last_name),
+        SortKey(models.Researcher.id),
+    ], page, yield_per=yield_per)
 
-    return q.all()  # type: ignore
+    if yield_per is not None:
+        return results  # exports stream the rows, without the list-view flags
+
+    return mark_decision_letters(
+        db, EntityType.PERSON_ROLE, results, key=lambda obj: obj.person_role_id
+    )  # type: ignore
 
 
 def create_researcher(db: Session, r_in: schemas.ResearcherCreate) -> models.Researcher:
@@ -1476,9 +1677,12 @@ def list_phd_students(
     field_id:         Optional[int] = None,
     branch_id:        Optional[int] = None,
     search:           Optional[str] = None,
+    load_plan:        list = PHD_STUDENT_LIST_PLAN,
+    page:             Optional[PageParams] = None,
+    yield_per:        Optional[int] = None,
 ) -> list[models.PhDStudent]:
 
-    q = db.query(models.PhDStudent)
+    q = db.query(models.PhDStudent).options(*load_plan)
     seen = set()
 
     # 1) filter by person_role_id
@@ -1534,22 +1738,8 @@ def list_phd_students(
 
     # 5) field/branch filter
     if field_id is not None or branch_id is not None:
-        if "pr" not in seen:
-            q = q.join(models.PersonRole,
-                       models.PhDStudent.person_role_id == models.PersonRole.id)
-            seen.add("pr")
-        if "pf" not in seen:
-            q = q.join(models.PersonField,
-                       models.PersonRole.id == models.PersonField.person_role_id)
-            seen.add("pf")
-        if field_id is not None:
-            q = q.filter_by(field_id=field_id)
-        if branch_id is not None:
-            if "af" not in seen:
-                q = q.join(models.AcademicField,
-                           models.PersonField.field_id == models.AcademicField.id)
-                seen.add("af")
-            q = q.filter_by(branch_id=branch_id)
+        q = q.filter(has_field(models.PersonField.person_role_id, models.PhDStudent.person_role_id,
+                               field_id, branch_id))
 
     # 6) substring search on name
     if search:
@@ -1561,13 +1751,7 @@ def list_phd_students(
             q = q.join(models.Person,
                        models.PersonRole.person_id == models.Person.id)
             seen.add("p")
-        term = f"%{search}%"
-        q = q.filter(
-            or_(
-                models.Person.first_name.ilike(term),
-                models.Person.last_name.ilike(term),
-            )
-        )
+        q = q.filter(contains_filter(models.Person, "people_fts", search, ("first_name_key", "last_name_key")))
 
     # 7) order by person’s last_name, first_name
     if "pr" not in seen:
@@ -1579,9 +1763,18 @@ def list_phd_students(
                    models.PersonRole.person_id == models.Person.id)
         seen.add("p")
 
-    q = q.order_by(models.Person.first_name, models.Person.last_name)
+    results = paginate(q, [
+        SortKey(models.Person.first_name),
+        SortKey(models.Person.last_name),
+        SortKey(models.PhDStudent.id),
+    ], page, yield_per=yield_per)
 
-    return q.all()  # type: ignore
+    if yield_per is not None:
+        return results  # exports stream the rows, without the list-view flags
+
+    return mark_decision_letters(
+        db, EntityType.PERSON_ROLE, results, key=lambda obj: obj.person_role_id
+    )  # type: ignore
 
 
 def create_phd_student(db: Session, s_in: schemas.PhDStudentCreate) -> models.PhDStudent:
@@ -1631,9 +1824,12 @@ def list_postdocs(
     field_id:         Optional[int] = None,
     branch_id:        Optional[int] = None,
     search:           Optional[str] = None,
+    load_plan:        list = POSTDOC_LIST_PLAN,
+    page:             Optional[PageParams] = None,
+    yield_per:        Optional[int] = None,
 ) -> List[models.Postdoc]:
 
-    q = db.query(models.Postdoc)
+    q = db.query(models.Postdoc).options(*load_plan)
     seen = set()
 
     # 1) person_role filter
@@ -1694,26 +1890,11 @@ def list_postdocs(
 
     # 6) field and branch
     if field_id is not None or branch_id is not None:
-        if "pr" not in seen:
-            q = q.join(models.PersonRole,
-                       models.Postdoc.person_role_id == models.PersonRole.id)
-            seen.add("pr")
-        if "pf" not in seen:
-            q = q.join(models.PersonField,
-                       models.PersonRole.id == models.PersonField.person_role_id)
-            seen.add("pf")
-        if field_id is not None:
-            q = q.filter_by(field_id=field_id)
-        if branch_id is not None:
-            if "af" not in seen:
-                q = q.join(models.AcademicField,
-                           models.PersonField.field_id == models.AcademicField.id)
-                seen.add("af")
-            q = q.filter_by(branch_id=branch_id)
+        q = q.filter(has_field(models.PersonField.person_role_id, models.Postdoc.person_role_id,
+                               field_id, branch_id))
 
     # 7) name‐search on Person
     if search:
-        term = f"%{search}%"
         if "pr" not in seen:
             q = q.join(models.PersonRole,
                        models.Postdoc.person_role_id == models.PersonRole.id)
@@ -1722,12 +1903,7 @@ def list_postdocs(
             q = q.join(models.Person,
                        models.PersonRole.person_id == models.Person.id)
             seen.add("p")
-        q = q.filter(
-            or_(
-                models.Person.first_name.ilike(term),
-                models.Person.last_name.ilike(term),
-            )
-        )
+        q = q.filter(contains_filter(models.Person, "people_fts", search, ("first_name_key", "last_name_key")))
 
     # 8) ordering by last_name, first_name
     if "pr" not in seen:
@@ -1739,9 +1915,18 @@ def list_postdocs(
                    models.PersonRole.person_id == models.Person.id)
         seen.add("p")
 
-    q = q.order_by(models.Person.first_name, models.Person.last_name)
+    results = paginate(q, [
+        SortKey(models.Person.first_name),
+        SortKey(models.Person.last_name),
+        SortKey(models.Postdoc.id),
+    ], page, yield_per=yield_per)
 
-    return q.all()  # type: ignore
+    if yield_per is not None:
+        return results  # exports stream the rows, without the list-view flags
+
+    return mark_decision_letters(
+        db, EntityType.PERSON_ROLE, results, key=lambda obj: obj.person_role_id
+    )  # type: ignore
 
 
 def create_postdoc(db: Session, p_in: schemas.PostdocCreate) -> models.Postdoc:
@@ -1799,7 +1984,11 @@ def list_student_activities(
         raise EntityNotFoundError(f"PhD student #{phd_student_id} not found")
 
     # 2) start base query and optional filter by type
-    q = db.query(models.StudentActivity).filter_by(phd_student_id=phd_student_id)
+    q = (
+        db.query(STUDENT_ACTIVITY)
+        .options(*STUDENT_ACTIVITY_LIST_PLAN)
+        .filter_by(phd_student_id=phd_student_id)
+    )
     if activity_type is not None:
         q = q.filter_by(activity_type=activity_type)
 
@@ -1848,16 +2037,15 @@ def report_semester_abroad(
         db: Session,
         *,
         is_active_student: Optional[bool] = None,
-        activity_status: Optional[str] = None
+        activity_status: Optional[str] = None,
+        load_plan: list = SEMESTER_ABROAD_LIST_PLAN,
+        page: Optional[PageParams] = None,
+        yield_per: Optional[int] = None
 ) -> List[models.AbroadStudentActivity]:
     # 1. Base Query: Target the specific Subclass
     # We query AbroadStudentActivity directly to access start_date, end_date, etc.
-    q = db.query(models.AbroadStudentActivity).options(
-        # Eager load the inherited 'student' relationship and the person chain
-        joinedload(models.AbroadStudentActivity.student)
-        .joinedload(models.PhDStudent.person_role)
-        .joinedload(models.PersonRole.person)
-    )
+    # Eager load the inherited 'student' relationship and the person chain
+    q = db.query(models.AbroadStudentActivity).options(*load_plan)
 
     # 2. Joins for filtering/sorting by Student details
     # We join from the subclass -> PhDStudent -> PersonRole -> Person
@@ -1908,14 +2096,13 @@ def report_semester_abroad(
 
     # 4. Ordering
     # Start Date (Desc) -> Host (Asc) -> Student Name (Asc)
-    q = q.order_by(
-        desc(models.AbroadStudentActivity.start_date),
-        models.AbroadStudentActivity.host_institution,
-        models.Person.first_name,
-        models.Person.last_name
-        )
-
-    return q.all()  # type: ignore
+    return paginate(q, [
+        SortKey(models.AbroadStudentActivity.start_date, descending=True),
+        SortKey(models.AbroadStudentActivity.host_institution),
+        SortKey(models.Person.first_name),
+        SortKey(models.Person.last_name),
+        SortKey(models.AbroadStudentActivity.id),
+    ], page, yield_per=yield_per)  # type: ignore
 
 
 def create_grad_school_student_activity(
@@ -2115,7 +2302,8 @@ def delete_student_activity(db: Session, stu_act_id: int, stu_id: int) -> None:
 def list_student_activities_for_grad_school(
     db: Session,
     grad_school_activity_id: int,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    load_plan: list = STUDENT_ACTIVITY_LIST_PLAN,
 ) -> List[models.StudentActivity]:
     # ensure grad school activity exists
     gsa = get_grad_school_activity(db, grad_school_activity_id)
@@ -2124,7 +2312,8 @@ def list_student_activities_for_grad_school(
 
     # base query: only GRAD_SCHOOL entries for this activity_id
     q = (
-        db.query(models.StudentActivity)
+        db.query(STUDENT_ACTIVITY)
+        .options(*load_plan)
         .filter_by(
               activity_type=ActivityType.GRAD_SCHOOL,
               activity_id=grad_school_activity_id
@@ -2145,13 +2334,7 @@ def list_student_activities_for_grad_school(
 
     # optional substring search on student name
     if search:
-        term = f"%{search}%"
-        q = q.filter(
-            or_(
-                models.Person.first_name.ilike(term),
-                models.Person.last_name.ilike(term),
-            )
-        )
+        q = q.filter(contains_filter(models.Person, "people_fts", search, ("first_name_key", "last_name_key")))
 
     # final ordering by first_name then last_name
     q = q.order_by(
@@ -2171,7 +2354,12 @@ def get_course_institutions(db: Session, course_id: int) -> list[models.Institut
     course = get_course(db, course_id)
     if not course:
         raise EntityNotFoundError(f"Course #{course_id} not found")
-    joins = db.query(models.CourseInstitution).filter_by(course_id=course_id).all()
+    joins = (
+        db.query(models.CourseInstitution)
+        .options(joinedload(models.CourseInstitution.institution))
+        .filter_by(course_id=course_id)
+        .all()
+    )
     return [j.institution for j in joins]
 
 
@@ -2213,7 +2401,12 @@ def get_course_teachers(db: Session, course_id: int) -> list[models.PersonRole]:
     course = get_course(db, course_id)
     if not course:
         raise EntityNotFoundError(f"Course #{course_id} not found")
-    joins = db.query(models.CourseTeacher).filter_by(course_id=course_id).all()
+    joins = (
+        db.query(models.CourseTeacher)
+        .options(*person_role_full_plan(models.CourseTeacher.person_role))
+        .filter_by(course_id=course_id)
+        .all()
+    )
     return [j.person_role for j in joins]
 
 
@@ -2250,7 +2443,8 @@ def remove_teacher_from_course(db: Session, course_id: int, person_role_id: int)
 
 
 # --- students for a course ---
-def get_course_students(db: Session, course_id: int, search: Optional[str] = None) -> List[models.PhDStudentCourse]:
+def get_course_students(db: Session, course_id: int, search: Optional[str] = None,
+                        load_plan: list = COURSE_STUDENT_LIST_PLAN) -> List[models.PhDStudentCourse]:
     # 1) verify course exists
     course = get_course(db, course_id)
     if not course:
@@ -2259,6 +2453,7 @@ def get_course_students(db: Session, course_id: int, search: Optional[str] = Non
     # 2) start the query on the join‐table
     q = (
         db.query(models.PhDStudentCourse)
+        .options(*load_plan)
         .filter_by(course_id=course_id)
         .join(
               models.PhDStudent,
@@ -2276,13 +2471,7 @@ def get_course_students(db: Session, course_id: int, search: Optional[str] = Non
 
     # 3) optional substring filter on the person’s name
     if search:
-        term = f"%{search}%"
-        q = q.filter(
-            or_(
-                models.Person.first_name.ilike(term),
-                models.Person.last_name.ilike(term),
-            )
-        )
+        q = q.filter(contains_filter(models.Person, "people_fts", search, ("first_name_key", "last_name_key")))
 
     # 4) order alphabetically by first_name, then last_name
     q = q.order_by(
@@ -2361,6 +2550,67 @@ def remove_student_from_course(db: Session, course_id: int, phd_student_id: int)
     db.commit()
 
 
+def bulk_update_course_students(db: Session, course_id: int,
+                                changes: schemas.CourseStudentBulk) -> List[models.PhDStudentCourse]:
+    """
+    Add, update and remove many student links of a course in one transaction.
+    Students and existing links are looked up with one IN query each; nothing
+    is written unless every change is valid.
+    """
+    course = get_course(db, course_id)
+    if not course:
+        raise EntityNotFoundError(f"Course #{course_id} not found")
+
+    add_ids = [link.phd_student_id for link in changes.add]
+    update_ids = [link.phd_student_id for link in changes.update]
+    all_ids = add_ids + update_ids + changes.remove
+    repeated = sorted(i for i, n in Counter(all_ids).items() if n > 1)
+    if repeated:
+        raise Exception(f"PhD students listed more than once: {repeated}")
+
+    found = {
+        i for (i,) in db.query(models.PhDStudent.id).filter(models.PhDStudent.id.in_(add_ids))
+    } if add_ids else set()
+    missing = sorted(set(add_ids) - found)
+    if missing:
+        raise EntityNotFoundError(f"PhD students not found: {missing}")
+
+    links = {
+        link.phd_student_id: link
+        for link in db.query(models.PhDStudentCourse).filter(
+            models.PhDStudentCourse.course_id == course_id,
+            models.PhDStudentCourse.phd_student_id.in_(all_ids)
+        )
+    } if all_ids else {}
+    duplicates = sorted(set(add_ids) & links.keys())
+    if duplicates:
+        raise Exception(f"PhD students already linked to Course #{course_id}: {duplicates}")
+    unlinked = sorted(set(update_ids + changes.remove) - links.keys())
+    if unlinked:
+        raise EntityNotFoundError(f"PhD students not linked to Course #{course_id}: {unlinked}")
+
+    db.add_all([
+        models.PhDStudentCourse(course_id=course_id,
+                                phd_student_id=link.phd_student_id,
+                                is_completed=bool(link.is_completed),
+                                grade=link.grade)
+        for link in changes.add
+    ])
+    for in_data in changes.update:
+        psc = links[in_data.phd_student_id]
+        # as in update_student_course_link: a null is_completed is ignored, a null grade clears it
+        fields = in_data.model_dump(exclude_unset=True, exclude={"phd_student_id"})
+        if fields.get("is_completed", True) is None:
+            del fields["is_completed"]
+        for key, value in fields.items():
+            setattr(psc, key, value)
+    for phd_student_id in changes.remove:
+        db.delete(links[phd_student_id])
+
+    db.commit()
+    return get_course_students(db, course_id)
+
+
 # </editor-fold>
 
 # <editor-fold desc="Project relationships functions">
@@ -2370,7 +2620,12 @@ def get_project_fields(db: Session, project_id: int) -> list[models.AcademicFiel
     project = get_project(db, project_id)
     if not project:
         raise EntityNotFoundError(f"Project #{project_id} not found")
-    joins = db.query(models.ProjectField).filter_by(project_id=project_id).all()
+    joins = (
+        db.query(models.ProjectField)
+        .options(joinedload(models.ProjectField.field))
+        .filter_by(project_id=project_id)
+        .all()
+    )
     return [j.field for j in joins]
 
 
@@ -2423,8 +2678,8 @@ def get_project_people_roles(
         db.query(models.PersonProject)
         # --- NEW: Eager load relationships for the schema ---
         .options(
-            # Load PersonRole -> Person
-            joinedload(models.PersonProject.person_role).joinedload(models.PersonRole.person),
+            # Load PersonRole -> Person (and the roles PersonRoleReadFull lists)
+            *person_role_full_plan(models.PersonProject.person_role),
             # Load Project -> CallType (since ProjectRead includes call_type)
             joinedload(models.PersonProject.project).joinedload(models.Project.call_type)
         )
@@ -2480,15 +2735,19 @@ def report_project_leaders(
 
         # Project Filters
         call_type_id: Optional[int] = None,
-        project_status: Optional[str] = None  # 'ongoing', 'awaiting_report', 'completed', or None (All)
+        project_status: Optional[str] = None,  # 'ongoing', 'awaiting_report', 'completed', or None (All)
+
+        page: Optional[PageParams] = None,
+        # One row per person role instead of per membership link
+        aggregate: bool = False
 ) -> List[models.PersonProject]:
-    # 1. Base Query with Eager Loading
-    # We load everything needed for the report columns to avoid N+1 queries
-    q = db.query(models.PersonProject).options(
-        joinedload(models.PersonProject.person_role).joinedload(models.PersonRole.person),
-        joinedload(models.PersonProject.person_role).joinedload(models.PersonRole.role),
-        joinedload(models.PersonProject.project).joinedload(models.Project.call_type)
-    )
+    """
+    Membership links of project leaders matching the filters. With
+    `aggregate=True`, returns one (PersonRole, is_pi, is_contact) tuple per
+    leader instead, the flags OR-ed over all matching links.
+    """
+    # 1. Base Query
+    q = db.query(models.PersonProject)
 
     # 2. Aliases Setup
     # We alias the joined tables so we can filter on them safely
@@ -2521,13 +2780,7 @@ def report_project_leaders(
 
     # --- Person Level Filters ---
     if search:
-        term = f"%{search}%"
-        q = q.filter(
-            or_(
-                MemberPerson.first_name.ilike(term),
-                MemberPerson.last_name.ilike(term),
-            )
-        )
+        q = q.filter(contains_filter(MemberPerson, "people_fts", search, ("first_name_key", "last_name_key")))
 
     # Filter by Generic Role (Researcher / Postdoc / PhD Student)
     if person_role_id is not None:
@@ -2590,15 +2843,32 @@ def report_project_leaders(
                 )
             )
 
-    # 6. Ordering
-    # Order by Person Name to facilitate aggregation on the frontend/export
-    q = q.order_by(
-        MemberPerson.first_name,
-        MemberPerson.last_name,
-        models.PersonProject.project_id
+    # 6. Aggregated mode: GROUP BY person role, OR the flags with MAX()
+    if aggregate:
+        leaders = (
+            q.with_entities(
+                models.PersonProject.person_role_id.label("person_role_id"),
+                func.max(models.PersonProject.is_principal_investigator).label("is_pi"),
+                func.max(models.PersonProject.is_contact_person).label("is_contact"),
+            )
+            .group_by(models.PersonProject.person_role_id)
+            .subquery()
         )
+        return unique_person_roles(db, leaders)  # type: ignore
 
-    return q.all()  # type: ignore
+    # 7. Eager Loading and Ordering
+    # We load everything needed for the report columns to avoid N+1 queries
+    q = q.options(
+        *person_role_full_plan(models.PersonProject.person_role),
+        joinedload(models.PersonProject.project).joinedload(models.Project.call_type)
+    )
+    # Order by Person Name to facilitate aggregation on the frontend/export
+    return paginate(q, [
+        SortKey(MemberPerson.first_name),
+        SortKey(MemberPerson.last_name),
+        SortKey(models.PersonProject.project_id),
+        SortKey(models.PersonProject.id),
+    ], page)  # type: ignore
 
 
 def add_person_role_to_project(db: Session, project_id: int,
@@ -2767,7 +3037,12 @@ def get_person_role_fields(db: Session, person_role_id: int) -> list[models.Acad
     person_role = get_person_role(db, person_role_id)
     if not person_role:
         raise EntityNotFoundError(f"Person role #{person_role_id} not found")
-    joins = db.query(models.PersonField).filter_by(person_role_id=person_role_id).all()
+    joins = (
+        db.query(models.PersonField)
+        .options(joinedload(models.PersonField.field))
+        .filter_by(person_role_id=person_role_id)
+        .all()
+    )
     return [j.field for j in joins]
 
 
@@ -2816,8 +3091,8 @@ def get_person_role_projects(db: Session, person_role_id: int) -> List[models.Pe
         db.query(models.PersonProject)
           # --- NEW: Eager load relationships for the schema ---
           .options(
-              # Load PersonRole -> Person
-              joinedload(models.PersonProject.person_role).joinedload(models.PersonRole.person),
+              # Load PersonRole -> Person (and the roles PersonRoleReadFull lists)
+              *person_role_full_plan(models.PersonProject.person_role),
               # Load Project -> CallType (since ProjectRead includes call_type)
               joinedload(models.PersonProject.project).joinedload(models.Project.call_type)
           )
@@ -2859,8 +3134,8 @@ def list_supervisions(
 ) -> List[models.SupervisorPhDStudent]:
     # We add options(joinedload(...)) to optimize the query
     q = db.query(models.SupervisorPhDStudent).options(
-        joinedload(models.SupervisorPhDStudent.supervisor),
-        joinedload(models.SupervisorPhDStudent.student)
+        *person_role_full_plan(models.SupervisorPhDStudent.supervisor),
+        *person_role_full_plan(models.SupervisorPhDStudent.student),
     )
 
     if student_role_id is not None:
@@ -2884,13 +3159,18 @@ def report_supervisions(
         # Cohort
         cohort_number: Optional[int] = None,
         # Search
-        search_supervisor: Optional[str] = None
+        search_supervisor: Optional[str] = None,
+        page: Optional[PageParams] = None,
+        # One row per supervisor instead of per supervision link
+        aggregate: bool = False
 ) -> List[models.SupervisorPhDStudent]:
-    # 1. Base Query with Eager Loading
-    q = db.query(models.SupervisorPhDStudent).options(
-        joinedload(models.SupervisorPhDStudent.supervisor).joinedload(models.PersonRole.person),
-        joinedload(models.SupervisorPhDStudent.student).joinedload(models.PersonRole.person)
-    )
+    """
+    Supervision links matching the filters. With `aggregate=True`, returns one
+    (PersonRole, is_main) tuple per supervisor instead, `is_main` OR-ed over
+    all matching links.
+    """
+    # 1. Base Query
+    q = db.query(models.SupervisorPhDStudent)
 
     # 2. Aliases setup
     SupervisorPersonRole = aliased(models.PersonRole)
@@ -2907,13 +3187,9 @@ def report_supervisions(
 
     # --- Search Filter (Supervisor Name) ---
     if search_supervisor:
-        term = f"%{search_supervisor}%"
-        q = q.filter(
-            or_(
-                SupervisorPersonDetails.first_name.ilike(term),  # type: ignore
-                SupervisorPersonDetails.last_name.ilike(term),  # type: ignore
-            )
-        )
+        q = q.filter(contains_filter(
+            SupervisorPersonDetails, "people_fts", search_supervisor, ("first_name_key", "last_name_key")
+        ))
 
     if is_main is not None:
         q = q.filter(models.SupervisorPhDStudent.is_main == is_main)
@@ -2951,15 +3227,30 @@ def report_supervisions(
             )
         )
 
-    # 5. Ordering
-    # Sort by: Supervisor First Name -> Supervisor Last Name -> Student Role ID
-    q = q.order_by(
-        SupervisorPersonDetails.first_name,
-        SupervisorPersonDetails.last_name,
-        models.SupervisorPhDStudent.student_role_id
+    # 5. Aggregated mode: GROUP BY supervisor, OR is_main with MAX()
+    if aggregate:
+        supervisors = (
+            q.with_entities(
+                models.SupervisorPhDStudent.supervisor_role_id.label("person_role_id"),
+                func.max(models.SupervisorPhDStudent.is_main).label("is_main"),
+            )
+            .group_by(models.SupervisorPhDStudent.supervisor_role_id)
+            .subquery()
         )
+        return unique_person_roles(db, supervisors)  # type: ignore
 
-    return q.all()  # type: ignore
+    # 6. Eager Loading and Ordering
+    q = q.options(
+        *person_role_full_plan(models.SupervisorPhDStudent.supervisor),
+        *person_role_full_plan(models.SupervisorPhDStudent.student),
+    )
+    # Sort by: Supervisor First Name -> Supervisor Last Name -> Student Role ID
+    return paginate(q, [
+        SortKey(SupervisorPersonDetails.first_name),
+        SortKey(SupervisorPersonDetails.last_name),
+        SortKey(models.SupervisorPhDStudent.student_role_id),
+        SortKey(models.SupervisorPhDStudent.id),
+    ], page)  # type: ignore
 
 
 def create_supervision(
@@ -3066,3 +3357,128 @@ def get_student_courses(db: Session, phd_student_id: int) -> List[models.PhDStud
 
 
 # </editor-fold>
+
+# <editor-fold desc="Search-related functions">
+# ---------- Search ----------
+
+def search_registry(db: Session, term: str, limit: int = 10) -> dict:
+    """Ranked quick search over people, projects and courses, backed by the FTS5 indexes."""
+    people = ranked_matches(
+        db.query(models.Person).options(
+            selectinload(models.Person.roles).joinedload(models.PersonRole.role)
+        ),
+        models.Person, "people_fts", FTS_INDEXES["people_fts"][1], term
+    ).limit(limit).all()
+
+    projects = ranked_matches(
+        db.query(models.Project).options(joinedload(models.Project.call_type)),
+        models.Project, "projects_fts", FTS_INDEXES["projects_fts"][1], term
+    ).limit(limit).all()
+
+    courses = ranked_matches(
+        db.query(models.Course).options(
+            joinedload(models.Course.course_term),
+            joinedload(models.Course.grad_school_activity).joinedload(models.GradSchoolActivity.activity_type)
+        ),
+        models.Course, "courses_fts", FTS_INDEXES["courses_fts"][1], term
+    ).limit(limit).all()
+
+    return {"people": people, "projects": projects, "courses": courses}
+
+
+# </editor-fold>
+
+# <editor-fold desc="Registry export functions">
+# ---------- Registry export ----------
+# The registry workbook has a sheet per entity plus link sheets. Every person
+# row is looked up in registry_people() (one pass over people_roles/people)
+# instead of joining the person graph again for each sheet.
+
+def registry_people(db: Session) -> dict:
+    """
+    person_role_id -> (name, email, role, start_date, end_date) of every
+    person role, in the name order of the people lists.
+    """
+    rows = (
+        db.query(
+            models.PersonRole.id, models.Person.first_name, models.Person.last_name, models.Person.email,
+            models.Role.role, models.PersonRole.start_date, models.PersonRole.end_date
+        )
+        .join(models.PersonRole.person)
+        .join(models.PersonRole.role)
+        .order_by(models.Person.first_name, models.Person.last_name, models.PersonRole.id)
+    )
+    return {
+        pr_id: (f"{first_name} {last_name}", email, role, start_date, end_date)
+        for pr_id, first_name, last_name, email, role, start_date, end_date in rows
+    }
+
+
+def registry_researchers(db: Session) -> dict:
+    """person_role_id -> researcher title."""
+    rows = (
+        db.query(models.Researcher.person_role_id, models.ResearcherTitle.title)
+        .outerjoin(models.Researcher.title)
+    )
+    return dict(rows.all())
+
+
+def registry_phd_students(db: Session) -> dict:
+    """person_role_id -> (phd_student id, cohort, is_affiliated, is_graduated)."""
+    rows = db.query(
+        models.PhDStudent.person_role_id, models.PhDStudent.id, models.PhDStudent.cohort_number,
+        models.PhDStudent.is_affiliated, models.PhDStudent.is_graduated
+    )
+    return {pr_id: rest for pr_id, *rest in rows}
+
+
+def registry_postdocs(db: Session) -> dict:
+    """person_role_id -> (cohort, is_incoming, is_graduated)."""
+    rows = db.query(
+        models.Postdoc.person_role_id, models.Postdoc.cohort_number,
+        models.Postdoc.is_incoming, models.Postdoc.is_graduated
+    )
+    return {pr_id: rest for pr_id, *rest in rows}
+
+
+def registry_supervisions(db: Session, yield_per: Optional[int] = None):
+    """(supervisor_role_id, student_role_id, is_main) of every supervision."""
+    q = (
+        db.query(
+            models.SupervisorPhDStudent.supervisor_role_id, models.SupervisorPhDStudent.student_role_id,
+            models.SupervisorPhDStudent.is_main
+        )
+        .order_by(models.SupervisorPhDStudent.id)
+    )
+    return q.yield_per(yield_per) if yield_per else q.all()
+
+
+def registry_course_enrolments(db: Session, yield_per: Optional[int] = None):
+    """(student_role_id, course title, is_completed, grade) of every enrolment, by course."""
+    q = (
+        db.query(
+            models.PhDStudent.person_role_id, models.Course.title,
+            models.PhDStudentCourse.is_completed, models.PhDStudentCourse.grade
+        )
+        .join(models.PhDStudentCourse.student)
+        .join(models.PhDStudentCourse.course)
+        .order_by(models.Course.title, models.Course.id, models.PhDStudentCourse.id)
+    )
+    return q.yield_per(yield_per) if yield_per else q.all()
+
+
+def registry_project_memberships(db: Session, yield_per: Optional[int] = None):
+    """(person_role_id, project number, title, is_pi, is_contact, is_active) of every membership, by project."""
+    q = (
+        db.query(
+            models.PersonProject.person_role_id, models.Project.project_number, models.Project.title,
+            models.PersonProject.is_principal_investigator, models.PersonProject.is_contact_person,
+            models.PersonProject.is_active
+        )
+        .join(models.PersonProject.project)
+        .order_by(models.Project.project_number, models.Project.id, models.PersonProject.id)
+    )
+    return q.yield_per(yield_per) if yield_per else q.all()
+
+
+# </editor-fold>
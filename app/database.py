@@ -1,21 +1,54 @@
+from typing import Dict
+
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
-from .config import settings
+from .config import Settings, settings
+from .query_stats import track_queries
+
+
+def sqlite_pragmas(config: Settings = settings) -> Dict[str, object]:
+    """The PRAGMAs set on every new connection, in order."""
+    return {
+        # enabling FK enforcement in SQLite
+        "foreign_keys": "ON",
+        "journal_mode": config.sqlite_journal_mode,
+        "synchronous": config.sqlite_synchronous,
+        "cache_size": config.sqlite_cache_size,
+        "mmap_size": config.sqlite_mmap_size,
+        "temp_store": config.sqlite_temp_store,
+        "busy_timeout": config.sqlite_busy_timeout,
+    }
+
+
+def make_engine(url: str, config: Settings = settings, read_only: bool = False, **kwargs) -> Engine:
+    """
+    An engine for `url` whose connections get the tuning profile from `config`.
+    With `read_only`, SQLite refuses any statement that would write.
+    """
+    new_engine = create_engine(url, connect_args={"check_same_thread": False}, **kwargs)
+    pragmas = sqlite_pragmas(config)
+    if read_only:
+        pragmas["query_only"] = "ON"
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False}
-)
+    # this listener will fire on every new DBAPI connection
+    @event.listens_for(new_engine, "connect")
+    def _configure_sqlite(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
 
+    # per-request statement counts and timings (see query_stats)
+    track_queries(new_engine)
+    return new_engine
 
-# this listener will fire on every new DBAPI connection,
-# enabling FK enforcement in SQLite
-@event.listens_for(engine, "connect")
-def _enable_sqlite_foreign_keys(dbapi_conn, connection_record):
-    cursor = dbapi_conn.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
 
+engine = make_engine(settings.database_url)
+# Long reads (lists, reports, exports) get their own connections: under WAL
+# they neither wait for nor hold up the writes on `engine`.
+read_engine = make_engine(settings.database_url, read_only=True, pool_size=settings.read_pool_size)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
@@ -1,8 +1,11 @@
-from fastapi import Depends, Header, HTTPException
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, Query
 from sqlalchemy.orm import Session
-from .database import SessionLocal
+from .database import SessionLocal, ReadSessionLocal
 from .config import settings
+from .pagination import PageParams, decode_cursor
 from . import crud, schemas
+from .logger import bind_request
 
 
 def get_db():
@@ -13,6 +16,23 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """A session on the read-only engine, for routes that never write."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_page_params(
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (omit to get the full list)"),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+) -> PageParams:
+    # a malformed cursor raises InvalidCursorError, answered with a 400 by main.py
+    return PageParams(limit=limit, after=decode_cursor(after) if after else None)
+
+
 def get_current_user(
     x_remote_user: str = Header(None),
     auth:          str = Header(None, alias="Auth"),
@@ -33,6 +53,7 @@ def get_current_user(
                     is_admin=True
                 )
             )
+        bind_request(user=user.username)
         return user
 
     # -- Production path: require static header, then remote-user --
@@ -45,4 +66,5 @@ def get_current_user(
     user = crud.get_user(db, x_remote_user)
     if not user:
         raise HTTPException(403, "User not provisioned")
+    bind_request(user=user.username)
     return user
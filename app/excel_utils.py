@@ -1,19 +1,48 @@
 import io
-from typing import Any, List, Dict, Optional
-from openpyxl import Workbook
+import multiprocessing
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Dict, Iterable, Iterator, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+# Bytes buffered before a chunk is handed to the response
+CHUNK_SIZE = 64 * 1024
+
+# Rows serialized per process-pool task (see start_process_pool)
+POOL_BATCH_ROWS = 2000
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 0
+
+
+@dataclass
+class ExcelSheet:
+    """One worksheet of a streamed workbook; `rows` may be a lazy iterable."""
+    title: str
+    headers: List[str]
+    rows: Iterable[Dict[str, Any]]
+    filter_info: Optional[List[str]] = None
 
 
 def generate_excel_response(
-    data: List[Dict[str, Any]],
+    data: Iterable[Dict[str, Any]],
     headers: List[str],
     sheet_title: str = "Sheet1",
     filter_info: Optional[List[str]] = None
-) -> io.BytesIO:
+) -> Iterator[bytes]:
     """
-    Generates an in-memory Excel file from a list of dictionaries.
+    Streams an Excel file built from an iterable of dictionaries.
 
     Args:
-        data: A list of dictionaries, where each dictionary represents a row.
+        data: An iterable (typically a generator) of dictionaries, where each
+              dictionary represents a row. It is consumed lazily, one row at
+              a time, while the file is being sent.
         headers: A list of strings for the header row. The keys in the data
                  dictionaries should match these headers.
         sheet_title: The title of the worksheet.
@@ -21,28 +50,264 @@ def generate_excel_response(
                      lines before the main data, documenting the filters used.
 
     Returns:
-        An in-memory BytesIO buffer containing the Excel file.
+        An iterator of byte chunks of the .xlsx file, suitable for a
+        StreamingResponse.
     """
-    workbook = Workbook()
-    sheet = workbook.active
-    sheet.title = sheet_title
+    return generate_excel_workbook([ExcelSheet(sheet_title, headers, data, filter_info)])
+
+
+def generate_excel_workbook(sheets: List[ExcelSheet]) -> Iterator[bytes]:
+    """
+    Streams a multi-sheet .xlsx file.
+
+    The workbook is written straight into a zip stream as rows arrive: cells
+    are inline strings/numbers (no shared-strings table), so nothing but the
+    current chunk is held in memory, however many rows there are. Dates are
+    date serials with a date format, as openpyxl writes them.
+    """
+    sink = ChunkBuffer()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        titles = _unique_sheet_titles([sheet.title for sheet in sheets])
+        zf.writestr("[Content_Types].xml", _content_types(len(sheets)))
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _workbook(titles))
+        zf.writestr("xl/_rels/workbook.xml.rels", _workbook_rels(len(sheets)))
+        zf.writestr("xl/styles.xml", _STYLES)
+        yield sink.drain()
+
+        for number, sheet in enumerate(sheets, start=1):
+            with zf.open(f"xl/worksheets/sheet{number}.xml", "w") as part:
+                part.write(_SHEET_START)
+                for row_xml in _sheet_rows(sheet):
+                    part.write(row_xml)
+                    if sink.size >= CHUNK_SIZE:
+                        yield sink.drain()
+                part.write(_SHEET_END)
+            yield sink.drain()
+    yield sink.drain()  # the zip central directory
+
+
+# ---------- Process pool ----------
+
+def start_process_pool(workers: int):
+    """
+    Serialize worksheet rows in `workers` separate processes from now on, so
+    large exports use other cores instead of holding the GIL of the process
+    serving requests. Without a pool, rows are serialized in the calling thread.
+    """
+    global _process_pool, _process_pool_workers
+    shutdown_process_pool()
+    # spawn: forking a process that runs threads and holds database connections is unsafe
+    _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    _process_pool_workers = workers
+
+
+def shutdown_process_pool():
+    global _process_pool, _process_pool_workers
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+    _process_pool, _process_pool_workers = None, 0
+
+
+# ---------- Streaming helpers ----------
+
+class ChunkBuffer(io.RawIOBase):
+    """Write-only, unseekable buffer a file format is written into and drained from."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self.size = 0  # bytes waiting to be drained
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self.size += len(b)
+        self._position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+# characters XML 1.0 does not allow, even escaped
+_ILLEGAL_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+_ILLEGAL_SHEET_TITLE_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+# day 0 of the 1900 date system, counting Excel's phantom 29 Feb 1900
+_EXCEL_EPOCH = date(1899, 12, 30)
+# indexes into the cellXfs of _STYLES
+_DATE_STYLE, _DATETIME_STYLE = 1, 2
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _date_serial(value: date) -> float:
+    """Days since Excel's epoch (1900 date system), with the time as the fraction."""
+    if isinstance(value, datetime):
+        delta = value.replace(tzinfo=None) - datetime.combine(_EXCEL_EPOCH, datetime.min.time())
+        return delta.days + delta.seconds / 86400 + delta.microseconds / 86400e6
+    return (value - _EXCEL_EPOCH).days
+
+
+def _cell(ref: str, value: Any) -> str:
+    if value is None or value == "":
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, datetime):
+        return f'<c r="{ref}" s="{_DATETIME_STYLE}"><v>{_date_serial(value)}</v></c>'
+    if isinstance(value, date):
+        return f'<c r="{ref}" s="{_DATE_STYLE}"><v>{_date_serial(value)}</v></c>'
+    text = escape(_ILLEGAL_XML_CHARS.sub("", str(value)))
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f'<c r="{ref}" t="inlineStr"><is><t{space}>{text}</t></is></c>'
+
+
+def _row(number: int, values: List[Any]) -> bytes:
+    cells = "".join(_cell(f"{_column_letter(i)}{number}", v) for i, v in enumerate(values))
+    return f'<row r="{number}">{cells}</row>'.encode("utf-8")
+
+
+def _rows(first_number: int, rows: List[tuple]) -> bytes:
+    """The XML of consecutive data rows; runs in the process pool."""
+    return b"".join(_row(number, values) for number, values in enumerate(rows, start=first_number))
+
+
+def _sheet_rows(sheet: ExcelSheet) -> Iterator[bytes]:
+    number = 0
 
     # If filter information is provided, write it to the top rows
-    if filter_info:
-        for info_line in filter_info:
-            sheet.append([info_line])  # Append as a single-cell row
-        sheet.append([])  # Add a blank row for spacing
-
-    # Write the header row
-    sheet.append(headers)
-
-    # Write data rows
-    for item in data:
-        row = [item.get(header, "") for header in headers]
-        sheet.append(row)
-
-    # Save the workbook to an in-memory buffer
-    buffer = io.BytesIO()
-    workbook.save(buffer)
-    buffer.seek(0)
-    return buffer
+    if sheet.filter_info:
+        for info_line in sheet.filter_info:
+            number += 1
+            yield _row(number, [info_line])  # a single-cell row
+        number += 1  # a blank row for spacing
+
+    # The header row, then the data rows
+    number += 1
+    yield _row(number, sheet.headers)
+    values = ([item.get(header, "") for header in sheet.headers] for item in sheet.rows)
+    if _process_pool is None:
+        for number, row_values in enumerate(values, start=number + 1):
+            yield _row(number, row_values)
+        return
+
+    # Serialize batches of plain tuples in the pool, a few batches ahead of
+    # the one being written, while this thread keeps reading rows.
+    pending = deque()
+    values = (tuple(v) for v in values)
+    while batch := list(islice(values, POOL_BATCH_ROWS)):
+        pending.append(_process_pool.submit(_rows, number + 1, batch))
+        number += len(batch)
+        if len(pending) > _process_pool_workers:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _unique_sheet_titles(titles: List[str]) -> List[str]:
+    # Excel sheet names: max 31 characters, no []:*?/\, unique ignoring case
+    result, seen = [], set()
+    for title in titles:
+        base = _ILLEGAL_SHEET_TITLE_CHARS.sub("", title)[:31] or "Sheet"
+        candidate, n = base, 1
+        while candidate.lower() in seen:
+            n += 1
+            candidate = f"{base[:31 - len(str(n)) - 1]} {n}"
+        seen.add(candidate.lower())
+        result.append(candidate)
+    return result
+
+
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+_ROOT_RELS = (
+    _XML_DECLARATION +
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+# Only what date cells need: the default style, and two with the date formats openpyxl uses
+_STYLES = (
+    _XML_DECLARATION +
+    f'<styleSheet xmlns="{_MAIN_NS}">'
+    '<numFmts count="2">'
+    '<numFmt numFmtId="164" formatCode="yyyy-mm-dd"/>'
+    '<numFmt numFmtId="165" formatCode="yyyy-mm-dd h:mm:ss"/>'
+    '</numFmts>'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_SHEET_START = (_XML_DECLARATION + f'<worksheet xmlns="{_MAIN_NS}"><sheetData>').encode("utf-8")
+_SHEET_END = b"</sheetData></worksheet>"
+
+
+def _content_types(n_sheets: int) -> str:
+    sheets = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for n in range(1, n_sheets + 1)
+    )
+    return (
+        _XML_DECLARATION +
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        f'{sheets}</Types>'
+    )
+
+
+def _workbook(titles: List[str]) -> str:
+    sheets = "".join(
+        f'<sheet name={quoteattr(title)} sheetId="{n}" r:id="rId{n}"/>'
+        for n, title in enumerate(titles, start=1)
+    )
+    return _XML_DECLARATION + f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>{sheets}</sheets></workbook>'
+
+
+def _workbook_rels(n_sheets: int) -> str:
+    rels = "".join(
+        f'<Relationship Id="rId{n}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{n}.xml"/>'
+        for n in range(1, n_sheets + 1)
+    ) + f'<Relationship Id="rId{n_sheets + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+    return (
+        _XML_DECLARATION +
+        f'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{rels}</Relationships>'
+    )
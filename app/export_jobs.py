@@ -0,0 +1,152 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from . import crud, metrics, schemas
+from .config import settings
+from .export_utils import EXPORT_MEDIA_TYPES, ExportFormat, ExportResponse
+
+# Background export jobs.
+#
+# A job runs one of the `/export/` endpoints with the filters it was posted
+# with, in a worker thread with its own database session, and writes the
+# streamed file to the cache directory. Artifacts are named
+# "<filter hash>-<data version>--<download filename>": a later job with the
+# same filters finds the file and is done at once, until a write to the
+# database bumps the data version (see crud) and makes it stale.
+
+logger = logging.getLogger(__name__)
+
+# How long finished jobs can still be polled and downloaded by id
+JOB_RETENTION = timedelta(hours=1)
+
+
+class ExportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class ExportJob:
+    id: str
+    export: str
+    username: str
+    media_type: str
+    status: ExportJobStatus = ExportJobStatus.QUEUED
+    rows_written: int = 0
+    bytes_written: int = 0
+    cached: bool = False
+    error: Optional[str] = None
+    filename: Optional[str] = None
+    path: Optional[Path] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+
+class ExportJobManager:
+    def __init__(self, cache_dir: str, max_workers: int):
+        self.cache_dir = Path(cache_dir)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export-job")
+        self._jobs: Dict[str, ExportJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, export: str, endpoint: Callable[..., ExportResponse], params: Dict[str, Any],
+               db: Session, current_user) -> ExportJob:
+        """
+        Queue `endpoint(**params)` for `current_user`, or answer from the cache.
+        `db` is the request's session; the job opens its own on the same engine.
+        """
+        export_format = params.get("export_format", ExportFormat.XLSX)
+        key = f"{filter_hash(export, params)}-{crud.get_data_version(db)}"
+        job = ExportJob(
+            id=uuid.uuid4().hex,
+            export=export,
+            username=current_user.username,
+            media_type=EXPORT_MEDIA_TYPES[export_format][1],
+        )
+
+        cached = next(self.cache_dir.glob(f"{key}--*"), None)
+        if cached:
+            job.status, job.cached, job.path = ExportJobStatus.DONE, True, cached
+            job.filename = cached.name.split("--", 1)[1]
+            job.bytes_written = cached.stat().st_size
+            job.finished_at = job.created_at
+            metrics.EXPORT_JOB_CACHE.labels("hit").inc()
+        else:
+            metrics.EXPORT_JOB_CACHE.labels("miss").inc()
+            # a detached copy: the request's session is closed before the job runs
+            user = schemas.UserRead.model_validate(current_user)
+            job.future = self._executor.submit(self._run, job, key, endpoint, params, db.get_bind(), user)
+
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: ExportJob, key: str, endpoint, params, bind, user):
+        job.status = ExportJobStatus.RUNNING
+        db = Session(bind=bind, autoflush=False)
+        tmp = None
+        try:
+            response = endpoint(**params, db=db, current_user=user)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.cache_dir / f"{key}--{response.filename}"
+            tmp = path.with_name(f".{job.id}.tmp")
+            with open(tmp, "wb") as f:
+                for chunk in response.chunks:
+                    f.write(chunk)
+                    job.rows_written = response.rows_written
+                    job.bytes_written += len(chunk)
+            os.replace(tmp, path)
+            self._remove_stale(key, path)
+            job.path, job.filename = path, response.filename
+            job.status = ExportJobStatus.DONE
+        except Exception as e:
+            logger.exception(f"Export job {job.id} ({job.export}) failed")
+            job.status, job.error = ExportJobStatus.FAILED, str(e)
+            if tmp is not None:
+                tmp.unlink(missing_ok=True)
+        finally:
+            db.close()
+            job.finished_at = datetime.now(timezone.utc)
+
+    def _remove_stale(self, key: str, keep: Path):
+        # artifacts of the same filters at older data versions
+        for path in self.cache_dir.glob(f"{key.rsplit('-', 1)[0]}-*--*"):
+            if path != keep:
+                path.unlink(missing_ok=True)
+
+    def _prune(self):
+        cutoff = datetime.now(timezone.utc) - JOB_RETENTION
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+
+def filter_hash(export: str, params: Dict[str, Any]) -> str:
+    """Stable hash of an export name and its filter values."""
+    payload = json.dumps({"export": export, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+manager = ExportJobManager(settings.export_cache_dir, settings.export_workers)
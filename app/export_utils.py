@@ -0,0 +1,232 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type
+
+from fastapi.responses import StreamingResponse
+
+from . import metrics
+from .excel_utils import CHUNK_SIZE, ChunkBuffer, ExcelSheet, generate_excel_response, generate_excel_workbook
+
+# Rows per CSV/NDJSON chunk and per Arrow record batch / Parquet row group
+ROWS_PER_BATCH = 1000
+
+
+class ExportFormat(str, Enum):
+    XLSX = "xlsx"
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+# format: (file extension, media type)
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.XLSX: ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    ExportFormat.CSV: ("csv", "text/csv; charset=utf-8"),
+    ExportFormat.NDJSON: ("ndjson", "application/x-ndjson"),
+    ExportFormat.PARQUET: ("parquet", "application/vnd.apache.parquet"),
+    ExportFormat.ARROW: ("arrows", "application/vnd.apache.arrow.stream"),
+}
+
+
+class ExportFormatUnavailableError(Exception):
+    pass
+
+
+class RowCounter:
+    """Passes rows through while counting them."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for item in rows:
+            yield item
+            self.count += 1
+
+
+class ExportResponse(StreamingResponse):
+    """
+    The streamed download of one export. Besides being a response, it keeps
+    the byte chunks (`chunks`), the download `filename` and a running count of
+    the rows written so far, so export jobs can write it to a file instead.
+    """
+
+    def __init__(self, chunks: Iterator[bytes], filename: str, media_type: str, counter: RowCounter):
+        self.chunks = _metered(chunks, filename.rsplit(".", 1)[-1], counter)
+        self.filename = filename
+        self._counter = counter
+        super().__init__(
+            self.chunks,
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
+    @property
+    def rows_written(self) -> int:
+        return self._counter.count
+
+
+def _metered(chunks: Iterator[bytes], extension: str, counter: RowCounter) -> Iterator[bytes]:
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        yield chunk
+    # only exports streamed to the end are recorded
+    metrics.EXPORT_BYTES.labels(extension).observe(size)
+    metrics.EXPORT_ROWS.labels(extension).inc(counter.count)
+
+
+def export_response(
+    data: Iterable[Dict[str, Any]],
+    headers: List[str],
+    sheet_title: str,
+    filename: str,
+    export_format: ExportFormat = ExportFormat.XLSX,
+    filter_info: Optional[List[str]] = None,
+    column_types: Optional[Dict[str, Type]] = None
+) -> ExportResponse:
+    """
+    Streams `data` (rows keyed by `headers`) as a download in `export_format`.
+
+    Only the xlsx output carries the `filter_info` lines and the sheet title;
+    the other formats are plain tables meant for further processing.
+    `filename` is given without extension. `column_types` gives the Python
+    type (int, float, bool, date, datetime) of the columns that are not text;
+    only the Arrow and Parquet schemas use it.
+    """
+    counter = RowCounter()
+    data = counter(data)
+    if export_format == ExportFormat.XLSX:
+        chunks = generate_excel_response(data, headers, sheet_title, filter_info=filter_info)
+    elif export_format == ExportFormat.CSV:
+        chunks = generate_csv(data, headers)
+    elif export_format == ExportFormat.NDJSON:
+        chunks = generate_ndjson(data, headers)
+    else:
+        chunks = generate_arrow(data, headers, parquet=export_format == ExportFormat.PARQUET,
+                                column_types=column_types)
+
+    extension, media_type = EXPORT_MEDIA_TYPES[export_format]
+    return ExportResponse(chunks, f"{filename}.{extension}", media_type, counter)
+
+
+def workbook_response(sheets: List[ExcelSheet], filename: str) -> ExportResponse:
+    """Streams several tables as the sheets of one .xlsx download."""
+    counter = RowCounter()
+    for sheet in sheets:
+        sheet.rows = counter(sheet.rows)
+    extension, media_type = EXPORT_MEDIA_TYPES[ExportFormat.XLSX]
+    return ExportResponse(generate_excel_workbook(sheets), f"{filename}.{extension}", media_type, counter)
+
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int = ROWS_PER_BATCH) -> Iterator[List[Dict[str, Any]]]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+# ---------- CSV / NDJSON ----------
+
+def generate_csv(data: Iterable[Dict[str, Any]], headers: List[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for batch in _batches(data):
+        writer.writerows([item.get(header, "") for header in headers] for item in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")  # the header row of an empty export
+
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def generate_ndjson(data: Iterable[Dict[str, Any]], headers: List[str]) -> Iterator[bytes]:
+    for batch in _batches(data):
+        lines = (
+            json.dumps({header: item.get(header) for header in headers}, default=_json_value, ensure_ascii=False)
+            for item in batch
+        )
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# ---------- Arrow / Parquet (optional pyarrow) ----------
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ExportFormatUnavailableError(
+            "Arrow and Parquet exports need the optional 'pyarrow' package"
+        ) from e
+    return pyarrow
+
+
+def generate_arrow(data: Iterable[Dict[str, Any]], headers: List[str], parquet: bool = False,
+                   column_types: Optional[Dict[str, Type]] = None) -> Iterator[bytes]:
+    """
+    Streams the rows as an Arrow IPC stream, or as Parquet with one row group
+    per batch. The schema is fixed before the first row: the columns named in
+    `column_types` get that type (with "" and None as nulls), all others are
+    strings. Nothing is guessed from the data: a first batch that happens to
+    have no values in a column cannot fix its type for the rest of the file.
+
+    Raises ExportFormatUnavailableError right away when pyarrow is missing.
+    """
+    pa = _import_pyarrow()
+    return _generate_arrow(pa, data, headers, parquet, column_types or {})
+
+
+def _arrow_types(pa) -> Dict[Type, Any]:
+    return {
+        int: pa.int64(),
+        float: pa.float64(),
+        bool: pa.bool_(),
+        date: pa.date32(),
+        datetime: pa.timestamp("us"),
+    }
+
+
+def _arrow_values(values: List[Any], python_type: Optional[Type]) -> List[Any]:
+    if python_type is None:
+        return [value if value is None or isinstance(value, str) else str(value) for value in values]
+    # int(), float() also take the Decimals of Numeric columns
+    convert = python_type if python_type in (int, float) else (lambda value: value)
+    return [None if value is None or value == "" else convert(value) for value in values]
+
+
+def _generate_arrow(pa, data, headers, parquet, column_types):
+    arrow_types = _arrow_types(pa)
+    schema = pa.schema([
+        (header, arrow_types[column_types[header]] if header in column_types else pa.string())
+        for header in headers
+    ])
+    sink = ChunkBuffer()
+    writer = pa.parquet.ParquetWriter(sink, schema) if parquet else pa.ipc.new_stream(sink, schema)
+    for batch in _batches(data):
+        record_batch = pa.record_batch([
+            pa.array(_arrow_values([item.get(header) for item in batch], column_types.get(header)), type=field.type)
+            for header, field in zip(headers, schema)
+        ], schema=schema)
+        if parquet:
+            writer.write_table(pa.Table.from_batches([record_batch]))
+        else:
+            writer.write_batch(record_batch)
+        if sink.size >= CHUNK_SIZE:
+            yield sink.drain()
+    writer.close()
+    yield sink.drain()
@@ -0,0 +1,212 @@
+import csv
+import io
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import openpyxl
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from . import models, schemas
+from .search import search_key
+
+# Bulk import of PhD students from an uploaded CSV or .xlsx file.
+#
+# Every row becomes a person, a phd_student person role, the PhD student
+# record and its institution/field links. All rows are validated against the
+# *Create schemas and name lookups first; only a file without errors is
+# written, in one transaction, flushing a batch of rows at a time.
+
+IMPORT_BATCH_SIZE = 500
+
+# column header -> (model, attribute); headers match case-insensitively
+PHD_STUDENT_COLUMNS = {
+    "First Name": ("person", "first_name"),
+    "Last Name": ("person", "last_name"),
+    "Email": ("person", "email"),
+    "Start Date": ("person_role", "start_date"),
+    "End Date": ("person_role", "end_date"),
+    "Cohort": ("phd_student", "cohort_number"),
+    "Affiliated": ("phd_student", "is_affiliated"),
+    "Department": ("phd_student", "department"),
+    "Discipline": ("phd_student", "discipline"),
+    "PhD Project Title": ("phd_student", "phd_project_title"),
+    "Institutions": (None, "institutions"),  # names separated by ";"
+    "Fields": (None, "fields"),  # names separated by ";"
+}
+REQUIRED_COLUMNS = ["First Name", "Last Name", "Email"]
+
+_YES = {"yes", "y", "true", "1", "x"}
+_NO = {"no", "n", "false", "0", ""}
+
+
+class ImportFileError(Exception):
+    """The file cannot be read as a table of import rows at all."""
+    pass
+
+
+def read_rows(content: bytes) -> List[Dict[str, Any]]:
+    """
+    The data rows of a CSV (UTF-8) or .xlsx file, keyed by the known column
+    headers of its first row. Empty cells are None; unknown columns are ignored.
+    """
+    if content.startswith(b"PK\x03\x04"):  # a zip container: .xlsx
+        try:
+            workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+        except Exception as e:
+            raise ImportFileError(f"Cannot read the workbook: {e}") from e
+        try:
+            table = [list(row) for row in workbook.worksheets[0].iter_rows(values_only=True)]
+        finally:
+            workbook.close()
+    else:
+        try:
+            text = content.decode("utf-8-sig")
+        except UnicodeDecodeError as e:
+            raise ImportFileError("CSV files must be UTF-8 encoded") from e
+        table = list(csv.reader(io.StringIO(text)))
+
+    if not table:
+        raise ImportFileError("The file is empty")
+    known = {header.lower(): header for header in PHD_STUDENT_COLUMNS}
+    headers = [known.get(str(h).strip().lower()) if h is not None else None for h in table[0]]
+    missing = [h for h in REQUIRED_COLUMNS if h not in headers]
+    if missing:
+        raise ImportFileError(f"Missing columns: {', '.join(missing)}")
+
+    rows = []
+    for values in table[1:]:
+        row = {}
+        for header, value in zip(headers, values):
+            if header is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip() or None
+            row[header] = value
+        if any(v is not None for v in row.values()):  # skip blank lines
+            rows.append(row)
+    return rows
+
+
+def _names(value) -> List[str]:
+    return [name.strip() for name in str(value).split(";") if name.strip()] if value is not None else []
+
+
+def _yes_no(value) -> Optional[bool]:
+    if value is None or isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _YES:
+        return True
+    if text in _NO:
+        return False
+    return value  # left for the schema to reject
+
+
+def _validation_errors(e: ValidationError, columns: Dict[str, str]) -> List[str]:
+    messages = []
+    for error in e.errors():
+        attr = error["loc"][0] if error["loc"] else ""
+        messages.append(f"{columns.get(attr, attr)}: {error['msg']}")
+    return messages
+
+
+def import_phd_students(db: Session, rows: List[Dict[str, Any]], dry_run: bool = False) -> schemas.ImportReport:
+    """
+    Validate `rows` (see read_rows) and, unless `dry_run` or any row has
+    errors, create the PhD students they describe in one transaction.
+    """
+    # --- name/id lookups, each loaded with one query ---
+    role_id = db.query(models.Role.id).filter_by(role=models.RoleType.PHD_STUDENT).scalar()
+    institutions = {key: i for i, key in db.query(models.Institution.id, models.Institution.institution_key)}
+    fields = {search_key(name): i for i, name in db.query(models.AcademicField.id, models.AcademicField.field)}
+    emails = {str(row.get("Email") or "").lower() for row in rows}
+    taken = {
+        email.lower() for (email,) in
+        db.query(models.Person.email).filter(models.Person.email_key.in_([search_key(e) for e in emails]))
+    }
+
+    columns_by_attr = {attr: header for header, (_, attr) in PHD_STUDENT_COLUMNS.items()}
+    errors, planned, seen_emails = [], [], set()
+
+    for number, row in enumerate(rows, start=2):  # row 1 holds the headers
+        values = {attr: row.get(header) for header, (_, attr) in PHD_STUDENT_COLUMNS.items()}
+        values["is_affiliated"] = _yes_no(values["is_affiliated"])
+        row_errors = []
+
+        # ids of rows not created yet are validated as placeholders
+        try:
+            person = schemas.PersonCreate(first_name=values["first_name"], last_name=values["last_name"],
+                                          email=values["email"])
+        except ValidationError as e:
+            person = None
+            row_errors += _validation_errors(e, columns_by_attr)
+        try:
+            person_role = schemas.PersonRoleCreate(person_id=0, role_id=role_id, start_date=values["start_date"],
+                                                   end_date=values["end_date"])
+            if person_role.start_date and person_role.end_date and person_role.end_date < person_role.start_date:
+                row_errors.append("End Date: must not be before Start Date")
+        except ValidationError as e:
+            person_role = None
+            row_errors += _validation_errors(e, columns_by_attr)
+        try:
+            phd_student = schemas.PhDStudentCreate(
+                person_role_id=0,
+                **{attr: values[attr] for header, (model, attr) in PHD_STUDENT_COLUMNS.items()
+                   if model == "phd_student"}
+            )
+        except ValidationError as e:
+            phd_student = None
+            row_errors += _validation_errors(e, columns_by_attr)
+
+        if person:
+            email = person.email.lower()
+            if email in taken:
+                row_errors.append(f"Email: a person with email {person.email} already exists")
+            elif email in seen_emails:
+                row_errors.append(f"Email: {person.email} appears more than once in the file")
+            seen_emails.add(email)
+
+        institution_ids, field_ids = [], []
+        for name in _names(values["institutions"]):
+            if search_key(name) in institutions:
+                institution_ids.append(institutions[search_key(name)])
+            else:
+                row_errors.append(f"Institutions: unknown institution {name!r}")
+        for name in _names(values["fields"]):
+            if search_key(name) in fields:
+                field_ids.append(fields[search_key(name)])
+            else:
+                row_errors.append(f"Fields: unknown field {name!r}")
+
+        if row_errors:
+            errors.append(schemas.ImportRowError(row=number, errors=row_errors))
+        else:
+            planned.append((person, person_role, phd_student,
+                            list(dict.fromkeys(institution_ids)), list(dict.fromkeys(field_ids))))
+
+    report = schemas.ImportReport(dry_run=dry_run, rows=len(rows), created=0, errors=errors)
+    if errors or dry_run:
+        return report
+
+    # --- write: one transaction, flushed in batches ---
+    now = datetime.now(timezone.utc)
+    for start in range(0, len(planned), IMPORT_BATCH_SIZE):
+        for person, person_role, phd_student, institution_ids, field_ids in planned[start:start + IMPORT_BATCH_SIZE]:
+            pr = models.PersonRole(
+                person=models.Person(**person.model_dump()),
+                role_id=role_id,
+                start_date=person_role.start_date or now,
+                end_date=person_role.end_date,
+            )
+            db.add_all([
+                pr,
+                models.PhDStudent(person_role=pr, **phd_student.model_dump(exclude={"person_role_id"}, exclude_none=True)),
+                *(models.PersonInstitution(person_role=pr, institution_id=i) for i in institution_ids),
+                *(models.PersonField(person_role=pr, field_id=f) for f in field_ids),
+            ])
+        db.flush()
+    db.commit()
+
+    report.created = len(planned)
+    return report
@@ -1,18 +1,110 @@
-import os
+import atexit
+import copy
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Iterator, Optional
+
+from .metrics import route_template
+
 # ensure the logs directory exists
 os.makedirs("logs", exist_ok=True)
 
+# Records are handed to a queue where they are emitted; a listener thread
+# formats them as JSON lines and writes the file, off the request path.
+# Inside request_context() every record also carries the request's id,
+# method, route and user.
+
+# Fields copied from `extra={...}` into the JSON record
+EXTRA_FIELDS = ("status", "duration_ms", "db_queries", "db_ms")
+
+_request: ContextVar[Optional[Dict[str, Any]]] = ContextVar("log_request", default=None)
+
+
+@contextmanager
+def request_context(request, request_id: str) -> Iterator[Dict[str, Any]]:
+    """Tag the records logged while handling `request` (in this context and its threads)."""
+    context = {"request": request, "request_id": request_id}
+    token = _request.set(context)
+    try:
+        yield context
+    finally:
+        _request.reset(token)
+
+
+def bind_request(**fields):
+    """Add fields (e.g. the user) to the records of the current request."""
+    context = _request.get()
+    if context is not None:
+        context.update(fields)
+
+
+class RequestQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Runs in the thread that logs the record, the only place the request
+        # context can be read: resolve it, the message and the exception now.
+        # Only formatting and file I/O happen on the listener thread.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+
+        context = _request.get()
+        if context is not None:
+            request = context["request"]
+            record.request_id = context["request_id"]
+            record.method = request.method
+            record.route = route_template(request)
+            record.user = context.get("user")
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in ("request_id", "method", "route", "user", *EXTRA_FIELDS):
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
 # Create a logger for the whole app
 logger = logging.getLogger("app")
 logger.setLevel(logging.INFO)
 
+SLOW_QUERY_LOGGER = "app.slow_queries"  # see query_stats
+
 # Rotate after 5 MB, keep 3 backups
 handler = RotatingFileHandler(
-    "logs/wasp-hs-admin.log", maxBytes=5_000_000, backupCount=3, encoding="utf-8"
+    "logs/wasp-hs-admin.log", maxBytes=5_000_000, backupCount=3, encoding="utf-8", delay=True
 )
-handler.setFormatter(
-    logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+handler.setFormatter(JsonFormatter())
+handler.addFilter(lambda record: record.name != SLOW_QUERY_LOGGER)
+
+# Slow statements go to a log of their own
+slow_query_handler = RotatingFileHandler(
+    "logs/slow-queries.log", maxBytes=5_000_000, backupCount=3, encoding="utf-8", delay=True
 )
-logger.addHandler(handler)
+slow_query_handler.setFormatter(JsonFormatter())
+slow_query_handler.addFilter(lambda record: record.name == SLOW_QUERY_LOGGER)
+
+log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+listener = QueueListener(log_queue, handler, slow_query_handler, respect_handler_level=True)
+listener.start()
+atexit.register(listener.stop)  # flushes the records still queued
+
+logger.addHandler(RequestQueueHandler(log_queue))
@@ -1,7 +1,9 @@
+import time
+import uuid
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi import Request, Depends, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.exception_handlers import http_exception_handler
@@ -10,9 +12,13 @@ from .database import engine, Base, SessionLocal
 from .config import settings
 from .dependencies import get_current_user
 from .routers import (user, institution, domain, grad_school_activity, course, project,
-                      person, researcher, phd_student, postdoc, report)
+                      person, researcher, phd_student, postdoc, report, search, registry,
+                      export_job, data_import, monitoring)
 from .models import Role, RoleType
-from .logger import logger
+from .pagination import InvalidCursorError
+from .export_utils import ExportFormatUnavailableError
+from . import excel_utils, export_jobs, metrics, query_stats
+from .logger import logger, request_context
 
 # Create tables when in DEBUG mode
 if settings.debug:
@@ -41,11 +47,14 @@ async def lifespan(fastapi_app: FastAPI):
         seed_roles(db)
     finally:
         db.close()
+    if settings.export_processes:
+        excel_utils.start_process_pool(settings.export_processes)
 
     yield  # Application runs here
 
-    # 2. Shutdown Logic (Optional - currently empty)
-    pass
+    # 2. Shutdown Logic: drop export jobs that have not started yet, stop the pool
+    export_jobs.manager.shutdown()
+    excel_utils.shutdown_process_pool()
 
 
 # --- APP INITIALIZATION ---
@@ -66,16 +75,49 @@ templates = Jinja2Templates(directory="app/templates")
 #         db.close()
 
 
-# Log every request and unhandled exception
+# Log every request and unhandled exception, and record request metrics
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    logger.info(f"→ {request.method} {request.url}")
-    try:
-        response = await call_next(request)
-    except Exception:
-        logger.exception(f"Error while handling {request.method} {request.url}")
-        raise
-    logger.info(f"← {request.method} {request.url} — {response.status_code}")
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    with request_context(request, request_id):
+        logger.info(f"→ {request.method} {request.url}")
+        in_progress = metrics.HTTP_REQUESTS_IN_PROGRESS.labels(request.method)
+        in_progress.inc()
+        started = time.perf_counter()
+        status = 500
+        try:
+            with query_stats.collect() as stats:
+                try:
+                    response = await call_next(request)
+                except Exception:
+                    logger.exception(f"Error while handling {request.method} {request.url}")
+                    raise
+            status = response.status_code
+        finally:
+            # streamed bodies are sent afterwards: not part of these numbers
+            duration = time.perf_counter() - started
+            in_progress.dec()
+            route = metrics.route_template(request)
+            metrics.HTTP_REQUESTS.labels(request.method, route, status).inc()
+            metrics.HTTP_REQUEST_DURATION.labels(request.method, route).observe(duration)
+            metrics.DB_QUERIES.labels(request.method, route).inc(stats.count)
+            metrics.DB_REQUEST_DURATION.labels(request.method, route).observe(stats.duration)
+
+        db_ms = stats.duration * 1000
+        logger.info(
+            f"← {request.method} {request.url} — {response.status_code} ({stats.count} queries, {db_ms:.1f} ms DB)",
+            extra={"status": response.status_code, "duration_ms": round(duration * 1000, 1),
+                   "db_queries": stats.count, "db_ms": round(db_ms, 1)}
+        )
+        repeated = stats.repeated()
+        for shape, times in repeated:
+            logger.warning(f"Possible N+1 in {request.method} {request.url.path}: {times}× {shape[:200]}")
+
+    response.headers["X-Request-ID"] = request_id
+    if settings.debug:
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers["X-DB-Time-ms"] = f"{db_ms:.1f}"
+        response.headers["X-DB-Repeated-Statements"] = str(len(repeated))
     return response
 
 
@@ -91,6 +133,16 @@ async def auth_exception_handler(request: Request, exc: HTTPException):
     return await http_exception_handler(request, exc)
 
 
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(ExportFormatUnavailableError)
+async def export_format_unavailable_handler(request: Request, exc: ExportFormatUnavailableError):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
 # Test endpoint to confirm the server boots
 @app.get("/ping")
 def ping():
@@ -387,3 +439,8 @@ app.include_router(researcher.router)
 app.include_router(phd_student.router)
 app.include_router(postdoc.router)
 app.include_router(report.router)
+app.include_router(search.router)
+app.include_router(registry.router)
+app.include_router(export_job.router)
+app.include_router(data_import.router)
+app.include_router(monitoring.router)
@@ -0,0 +1,162 @@
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from starlette.requests import Request
+
+# In-process metrics in the Prometheus text exposition format.
+#
+# A small registry of counters, gauges and histograms with labels, kept in
+# memory and rendered by GET /metrics; nothing is pushed anywhere. Label
+# values must come from a bounded set (route templates, not raw paths).
+
+Sample = Tuple[str, Dict[str, str], float]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (10_000, 100_000, 1_000_000, 10_000_000, 100_000_000, 1_000_000_000)
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.inc(-amount)
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.sum += value
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def labels(self, *values):
+        """The series with these label values (in `labelnames` order), created at first use."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}")
+        key = tuple(str(v) for v in values)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self):
+        return _Value()
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            children = list(self._children.items())
+        for values, child in children:
+            yield self.name, dict(zip(self.labelnames, values)), child.value
+
+
+class Counter(Metric):
+    type = "counter"
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            children = list(self._children.items())
+        for values, child in children:
+            labels = dict(zip(self.labelnames, values))
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _number(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+REGISTRY: List[Metric] = []
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render() -> str:
+    """All registered metrics in the text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for name, labels, value in metric.samples():
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label_text}}} {_number(value)}" if label_text else f"{name} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def route_template(request: Request) -> str:
+    """The path template of the route that handled `request`, e.g. "/courses/{course_id}"."""
+    route = request.scope.get("route")  # set by the router once it has matched
+    return getattr(route, "path", None) or "unmatched"
+
+
+# <editor-fold desc="Application metrics">
+
+HTTP_REQUESTS = Counter(
+    "wasp_http_requests_total", "HTTP requests handled", ["method", "route", "status"])
+HTTP_REQUEST_DURATION = Histogram(
+    "wasp_http_request_duration_seconds", "Time until the response starts", ["method", "route"])
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "wasp_http_requests_in_progress", "HTTP requests being handled", ["method"])
+DB_QUERIES = Counter(
+    "wasp_db_queries_total", "SQL statements executed while handling requests", ["method", "route"])
+DB_REQUEST_DURATION = Histogram(
+    "wasp_db_request_duration_seconds", "Database time per request", ["method", "route"])
+EXPORT_BYTES = Histogram(
+    "wasp_export_bytes", "Size of completed exports", ["format"], buckets=SIZE_BUCKETS)
+EXPORT_ROWS = Counter(
+    "wasp_export_rows_total", "Rows written by completed exports", ["format"])
+EXPORT_JOB_CACHE = Counter(
+    "wasp_export_job_cache_total", "Export jobs answered from the artifact cache (hit) or run (miss)", ["result"])
+
+# </editor-fold>
@@ -3,12 +3,13 @@ from enum import Enum as PyEnum
 from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime,
     ForeignKey, UniqueConstraint, CheckConstraint,
-    Numeric
+    Numeric, Index
 )
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy.orm import relationship, foreign
+from sqlalchemy.orm import relationship, foreign, validates
 from sqlalchemy import and_
 from .database import Base
+from .search import search_key
 
 
 # ---------- Enums ----------
@@ -52,6 +53,13 @@ class User(Base):
     is_admin = Column(Boolean, default=False)
 
 
+class DataVersion(Base):
+    """Single-row counter bumped by every flush that changes data (see crud)."""
+    __tablename__ = "data_version"
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
 # Lookup tables
 class ResearcherTitle(Base):
     __tablename__ = "researcher_titles"
@@ -69,6 +77,7 @@ class Institution(Base):
     __tablename__ = "institutions"
     id = Column(Integer, primary_key=True)
     institution = Column(String, nullable=False)
+    institution_key = Column(String, nullable=False, index=True)  # search_key(institution)
     person_institutions = relationship("PersonInstitution", back_populates="institution",
                                        cascade="all, delete-orphan")
     course_institutions = relationship("CourseInstitution", back_populates="institution",
@@ -76,6 +85,11 @@ class Institution(Base):
     postdocs_as_current = relationship("Postdoc", back_populates="current_institution",
                                        foreign_keys="Postdoc.current_institution_id")
 
+    @validates("institution")
+    def _set_search_key(self, key, value):
+        self.institution_key = search_key(value)
+        return value
+
 
 class AcademicBranch(Base):
     __tablename__ = "academic_branches"
@@ -88,7 +102,7 @@ class AcademicField(Base):
     __tablename__ = "academic_fields"
     id = Column(Integer, primary_key=True)
     field = Column(String, nullable=False)
-    branch_id = Column(Integer, ForeignKey("academic_branches.id"), nullable=False)
+    branch_id = Column(Integer, ForeignKey("academic_branches.id"), nullable=False, index=True)
     branch = relationship("AcademicBranch", back_populates="fields")
     person_fields = relationship("PersonField", back_populates="field", cascade="all, delete-orphan")
     project_fields = relationship("ProjectField", back_populates="field", cascade="all, delete-orphan")
@@ -112,12 +126,13 @@ class Course(Base):
     __tablename__ = "courses"
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
+    title_key = Column(String, nullable=False, index=True)  # search_key(title)
     # terms_offered = Column(String, nullable=True)
 
     # ← either a generic CourseTerm …
-    course_term_id = Column(Integer, ForeignKey("course_terms.id"), nullable=True)
+    course_term_id = Column(Integer, ForeignKey("course_terms.id"), nullable=True, index=True)
     # ← … or linked to a GradSchoolActivity
-    grad_school_activity_id = Column(Integer, ForeignKey("grad_school_activities.id"), nullable=True)
+    grad_school_activity_id = Column(Integer, ForeignKey("grad_school_activities.id"), nullable=True, index=True)
 
     # contact_teachers = Column(String, nullable=True)
     credit_points = Column(Numeric(precision=4, scale=1), nullable=True)
@@ -151,12 +166,17 @@ class Course(Base):
         viewonly=True
     )
 
+    @validates("title")
+    def _set_search_key(self, key, value):
+        self.title_key = search_key(value)
+        return value
+
 
 class GradSchoolActivity(Base):
     __tablename__ = "grad_school_activities"
     id = Column(Integer, primary_key=True)
     # type = Column(String, nullable=False)
-    activity_type_id = Column(Integer, ForeignKey("grad_school_activity_types.id"), nullable=False)
+    activity_type_id = Column(Integer, ForeignKey("grad_school_activity_types.id"), nullable=False, index=True)
     description = Column(String, nullable=True)
     year = Column(Integer, nullable=True)
 
@@ -181,17 +201,32 @@ class GradSchoolActivity(Base):
 # Core domain entities
 class Person(Base):
     __tablename__ = "people"
+    __table_args__ = (
+        Index("ix_people_first_name_last_name", "first_name", "last_name"),
+    )
     id = Column(Integer, primary_key=True)
     first_name = Column(String, nullable=False)
     last_name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
+    # search_key() of the columns above, kept up to date on assignment
+    first_name_key = Column(String, nullable=False, index=True)
+    last_name_key = Column(String, nullable=False, index=True)
+    email_key = Column(String, nullable=False, index=True)
     roles = relationship("PersonRole", back_populates="person", cascade="all, delete-orphan")
 
+    @validates("first_name", "last_name", "email")
+    def _set_search_key(self, key, value):
+        setattr(self, f"{key}_key", search_key(value))
+        return value
+
 
 class PersonRole(Base):
     __tablename__ = "people_roles"
+    __table_args__ = (
+        Index("ix_people_roles_role_id_end_date", "role_id", "end_date"),
+    )
     id = Column(Integer, primary_key=True)
-    person_id = Column(Integer, ForeignKey("people.id"), nullable=False)
+    person_id = Column(Integer, ForeignKey("people.id"), nullable=False, index=True)
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
     start_date = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     end_date = Column(DateTime, nullable=True)
@@ -259,9 +294,9 @@ class PersonRole(Base):
 class Researcher(Base):
     __tablename__ = "researchers"
     id = Column(Integer, primary_key=True)
-    person_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False)
-    title_id = Column(Integer, ForeignKey("researcher_titles.id"), nullable=True)
-    original_title_id = Column(Integer, ForeignKey("researcher_titles.id"), nullable=True)
+    person_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False, index=True)
+    title_id = Column(Integer, ForeignKey("researcher_titles.id"), nullable=True, index=True)
+    original_title_id = Column(Integer, ForeignKey("researcher_titles.id"), nullable=True, index=True)
     link = Column(String, nullable=True)
     notes = Column(String, nullable=True)
 
@@ -275,7 +310,7 @@ class Researcher(Base):
 class PhDStudent(Base):
     __tablename__ = "phd_students"
     id = Column(Integer, primary_key=True)
-    person_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False)
+    person_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False, index=True)
     cohort_number = Column(Integer, nullable=True)
     is_affiliated = Column(Boolean, default=False)
     department = Column(String, nullable=True)
@@ -300,7 +335,7 @@ class PhDStudent(Base):
 class Postdoc(Base):
     __tablename__ = "postdocs"
     id = Column(Integer, primary_key=True)
-    person_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False)
+    person_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False, index=True)
     cohort_number = Column(Integer, nullable=True)
     department = Column(String, nullable=True)
     discipline = Column(String, nullable=True)
@@ -310,11 +345,11 @@ class Postdoc(Base):
     is_graduated = Column(Boolean, default=False)
 
     # Either point to a known title, or fill in free-text if the title is “Other”
-    current_title_id = Column(Integer, ForeignKey("researcher_titles.id"), nullable=True)
+    current_title_id = Column(Integer, ForeignKey("researcher_titles.id"), nullable=True, index=True)
     current_title_other = Column(String, nullable=True)
 
     # Same pattern for institution
-    current_institution_id = Column(Integer, ForeignKey("institutions.id"), nullable=True)
+    current_institution_id = Column(Integer, ForeignKey("institutions.id"), nullable=True, index=True)
     current_institution_other = Column(String, nullable=True)
 
     # current_department = Column(String, nullable=True)
@@ -331,13 +366,14 @@ class Postdoc(Base):
 class Project(Base):
     __tablename__ = "projects"
     id = Column(Integer, primary_key=True)
-    call_type_id = Column(Integer, ForeignKey("project_call_types.id"), nullable=False)
+    call_type_id = Column(Integer, ForeignKey("project_call_types.id"), nullable=False, index=True)
     title = Column(String, nullable=False)
+    title_key = Column(String, nullable=False, index=True)  # search_key(title)
     project_number = Column(String, nullable=False)
     # is_affiliated = Column(Boolean, default=False)
     final_report_submitted = Column(Boolean, default=False)
     is_extended = Column(Boolean, default=False)
-    start_date = Column(DateTime, nullable=True)
+    start_date = Column(DateTime, nullable=True, index=True)
     end_date = Column(DateTime, nullable=True)
     notes = Column(String, nullable=True)
 
@@ -355,12 +391,21 @@ class Project(Base):
         viewonly=True
     )
 
+    @validates("title")
+    def _set_search_key(self, key, value):
+        self.title_key = search_key(value)
+        return value
+
 
 class SupervisorPhDStudent(Base):
     __tablename__ = "supervisors_phd_students"
+    __table_args__ = (
+        Index("ix_supervisors_phd_students_supervisor_role_id_student_role_id",
+              "supervisor_role_id", "student_role_id"),
+    )
     id = Column(Integer, primary_key=True)
     supervisor_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False)
-    student_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False)
+    student_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False, index=True)
     is_main = Column(Boolean, default=False)
 
     supervisor = relationship(
@@ -386,6 +431,10 @@ class PersonInstitution(Base):
     __table_args__ = (
         CheckConstraint("end_date IS NULL OR end_date >= start_date",
                         name="ck_person_institution_dates"),
+        Index("ix_person_institutions_person_role_id_institution_id_end_date",
+              "person_role_id", "institution_id", "end_date"),
+        Index("ix_person_institutions_institution_id_end_date_person_role_id",
+              "institution_id", "end_date", "person_role_id"),
     )
 
     person_role = relationship("PersonRole", back_populates="institutions")
@@ -394,9 +443,12 @@ class PersonInstitution(Base):
 
 class PersonField(Base):
     __tablename__ = "person_fields"
+    __table_args__ = (
+        Index("ix_person_fields_person_role_id_field_id", "person_role_id", "field_id"),
+    )
     id = Column(Integer, primary_key=True)
     person_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False)
-    field_id = Column(Integer, ForeignKey("academic_fields.id"), nullable=False)
+    field_id = Column(Integer, ForeignKey("academic_fields.id"), nullable=False, index=True)
 
     person_role = relationship("PersonRole", back_populates="fields")
     field = relationship("AcademicField", back_populates="person_fields")
@@ -404,6 +456,10 @@ class PersonField(Base):
 
 class PersonProject(Base):
     __tablename__ = "person_projects"
+    __table_args__ = (
+        Index("ix_person_projects_project_id_person_role_id", "project_id", "person_role_id"),
+        Index("ix_person_projects_person_role_id_project_id", "person_role_id", "project_id"),
+    )
     id = Column(Integer, primary_key=True)
     person_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
@@ -423,7 +479,7 @@ class PhDStudentCourse(Base):
     )
     id = Column(Integer, primary_key=True)
     phd_student_id = Column(Integer, ForeignKey("phd_students.id"), nullable=False)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False, index=True)
     is_completed = Column(Boolean, default=False)
     grade = Column(SQLEnum(GradeType, name="grade_type_enum"), nullable=True)
 
@@ -439,7 +495,7 @@ class CourseTeacher(Base):
 
     id = Column(Integer, primary_key=True)
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
-    person_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False)
+    person_role_id = Column(Integer, ForeignKey("people_roles.id"), nullable=False, index=True)
 
     course = relationship("Course", back_populates="teachers")
     person_role = relationship("PersonRole", back_populates="courses_teaching")
@@ -460,6 +516,7 @@ class StudentActivity(Base):
     __tablename__ = "student_activities"
     __table_args__ = (
         UniqueConstraint("phd_student_id", "activity_type", "activity_id", name="uq_student_activity"),
+        Index("ix_student_activities_activity_type_activity_id", "activity_type", "activity_id"),
     )
     id = Column(Integer, primary_key=True)
     phd_student_id = Column(Integer, ForeignKey("phd_students.id"), nullable=False)
@@ -514,9 +571,12 @@ class GradSchoolActivityType(Base):
 
 class ProjectField(Base):
     __tablename__ = "project_fields"
+    __table_args__ = (
+        Index("ix_project_fields_project_id_field_id", "project_id", "field_id"),
+    )
     id = Column(Integer, primary_key=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
-    field_id = Column(Integer, ForeignKey("academic_fields.id"), nullable=False)
+    field_id = Column(Integer, ForeignKey("academic_fields.id"), nullable=False, index=True)
 
     project = relationship("Project", back_populates="fields")
     field = relationship("AcademicField", back_populates="project_fields")
@@ -525,7 +585,7 @@ class ProjectField(Base):
 class ResearchOutputReport(Base):
     __tablename__ = "research_output_reports"
     id = Column(Integer, primary_key=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
     link = Column(String, nullable=True)
 
     project = relationship("Project", back_populates="research_output_reports")
@@ -533,9 +593,12 @@ class ResearchOutputReport(Base):
 
 class CourseInstitution(Base):
     __tablename__ = "courses_institutions"
+    __table_args__ = (
+        Index("ix_courses_institutions_course_id_institution_id", "course_id", "institution_id"),
+    )
     id = Column(Integer, primary_key=True)
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
-    institution_id = Column(Integer, ForeignKey("institutions.id"), nullable=False)
+    institution_id = Column(Integer, ForeignKey("institutions.id"), nullable=False, index=True)
 
     course = relationship("Course", back_populates="course_institutions")
     institution = relationship("Institution", back_populates="course_institutions")
@@ -543,6 +606,9 @@ class CourseInstitution(Base):
 
 class DecisionLetter(Base):
     __tablename__ = "decision_letters"
+    __table_args__ = (
+        Index("ix_decision_letters_entity_type_entity_id", "entity_type", "entity_id"),
+    )
     id = Column(Integer, primary_key=True)
     entity_type = Column(SQLEnum(EntityType, name="entity_type_enum"), nullable=False)
     entity_id = Column(Integer, nullable=False)
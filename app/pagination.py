@@ -0,0 +1,146 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import and_, or_, desc, false
+from sqlalchemy.orm import Query
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """One ORDER BY column of a list query, in the order it is applied."""
+    column: Any
+    descending: bool = False
+
+
+@dataclass
+class PageParams:
+    """Opt-in keyset pagination: `limit` rows after the decoded `after` cursor."""
+    limit: Optional[int] = None
+    after: Optional[List[Any]] = field(default=None)
+
+
+class Page(list):
+    """A list of results that also remembers the cursor of the next page."""
+
+    def __init__(self, items=(), next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+# ---------- Cursor encoding ----------
+# A cursor is the sort-key values of the last row of a page, JSON-encoded
+# (datetimes/dates/decimals tagged so they round-trip) and base64url'd.
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+        raise ValueError("unknown cursor value")
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> List[Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list):
+            raise ValueError("cursor is not a list")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError, binascii.Error, UnicodeError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {token!r}") from e
+
+
+# ---------- Keyset filtering ----------
+
+def _equals(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _comes_after(key: SortKey, value):
+    # SQLite sorts NULLs first, so they come first ascending and last descending
+    if key.descending:
+        if value is None:
+            return false()
+        return or_(key.column < value, key.column.is_(None))
+    if value is None:
+        return key.column.isnot(None)
+    return key.column > value
+
+
+def after_clause(keys: Sequence[SortKey], values: Sequence[Any]):
+    """Rows strictly after `values` in the ordering described by `keys`."""
+    if len(values) != len(keys):
+        raise InvalidCursorError("Pagination cursor does not match this list")
+    branches = []
+    for i, key in enumerate(keys):
+        prefix = [_equals(k.column, v) for k, v in zip(keys[:i], values[:i])]
+        branches.append(and_(*prefix, _comes_after(key, values[i])))
+    return or_(*branches)
+
+
+def paginate(q: Query, keys: Sequence[SortKey], page: Optional[PageParams] = None,
+             yield_per: Optional[int] = None) -> Page:
+    """
+    Order `q` by `keys` and, when `page` asks for it, return only the rows
+    after the cursor plus the cursor of the following page.
+
+    The last key should be unique (usually the primary key) so every row has
+    a distinct position. Without a `limit` the whole result is returned.
+
+    With `yield_per` (exports), an iterator over the ordered rows is returned
+    instead, fetching them from the cursor in batches of that size.
+    """
+    q = q.order_by(*(desc(k.column) if k.descending else k.column for k in keys))
+    if yield_per is not None:
+        return iter(q.yield_per(yield_per))  # type: ignore
+    if page is not None and page.after is not None:
+        q = q.filter(after_clause(keys, page.after))
+    if page is None or page.limit is None:
+        return Page(q.all())
+
+    # select the key values alongside each row so the last one can become the cursor
+    n_keys = len(keys)
+    rows = q.add_columns(*(k.column for k in keys)).limit(page.limit + 1).all()
+    has_more = len(rows) > page.limit
+    rows = rows[:page.limit]
+
+    items = [row[0] if len(row) == n_keys + 1 else tuple(row[:-n_keys]) for row in rows]
+    next_cursor = encode_cursor(list(rows[-1][-n_keys:])) if has_more else None
+    return Page(items, next_cursor)
+
+
+def set_next_cursor_header(response, results) -> None:
+    next_cursor = getattr(results, "next_cursor", None)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
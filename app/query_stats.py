@@ -0,0 +1,182 @@
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+# Per-request SQL statistics.
+#
+# track_queries() hooks an engine's cursor events; statements executed while
+# a collect() block is active (main.py opens one per request) are counted and
+# timed into its QueryStats. A statement "shape" (the SQL text; parameters are
+# bound separately, and IN lists are collapsed) seen REPEAT_THRESHOLD times or
+# more in one request is the signature of lazy loads in a loop: a likely N+1.
+#
+# Statements slower than settings.slow_query_ms, in or outside a request, are
+# also logged to the slow-query log with their parameters, the app function
+# that ran them and SQLite's EXPLAIN QUERY PLAN, and kept in `slow_queries`.
+
+REPEAT_THRESHOLD = 3
+
+# Distinct slow statement shapes kept for GET /slow-queries
+SLOW_QUERY_ENTRIES = 200
+
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("(?)", statement)).strip()
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0  # seconds spent in the database driver
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int = REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """(shape, times) of the statements run `threshold` times or more, most repeated first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def collect() -> Iterator[QueryStats]:
+    """Collect the statements run in this context (and threads started from it)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    parameters: Optional[str] = None  # of the slowest call
+    origin: Optional[str] = None
+    plan: List[str] = field(default_factory=list)
+    last_seen: Optional[datetime] = None
+
+
+class SlowQueryLog:
+    """The slow statements seen since startup, aggregated by shape."""
+
+    def __init__(self, max_entries: int = SLOW_QUERY_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: Dict[str, SlowQuery] = {}
+        self._lock = threading.Lock()
+
+    def record(self, shape: str, elapsed_ms: float, parameters, origin: Optional[str],
+               explain) -> SlowQuery:
+        """Add one slow call; `explain()` is only run when it is the slowest of its shape."""
+        with self._lock:
+            entry = self._entries.get(shape)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    # make room by forgetting the least bad offender
+                    del self._entries[min(self._entries.values(), key=lambda e: e.max_ms).statement]
+                entry = self._entries[shape] = SlowQuery(statement=shape)
+            entry.calls += 1
+            entry.total_ms += elapsed_ms
+            entry.last_seen = datetime.now(timezone.utc)
+            slowest = elapsed_ms > entry.max_ms
+            if slowest:
+                entry.max_ms, entry.parameters, entry.origin = elapsed_ms, repr(parameters), origin
+        if slowest:
+            entry.plan = explain()
+        return entry
+
+    def worst(self, limit: int, by: str = "max_ms") -> List[SlowQuery]:
+        with self._lock:
+            return sorted(self._entries.values(), key=lambda e: getattr(e, by), reverse=True)[:limit]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_queries = SlowQueryLog()
+
+
+def _origin() -> Optional[str]:
+    # the crud function on the stack, e.g. "app.crud:list_researchers" (else the
+    # innermost app function)
+    frame, innermost = sys._getframe(2), None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module == "app.crud":
+            return f"{module}:{frame.f_code.co_name}"
+        if innermost is None and module.startswith("app.") and module != __name__:
+            innermost = f"{module}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return innermost
+
+
+def _explain(cursor, statement: str, parameters) -> List[str]:
+    """The EXPLAIN QUERY PLAN of a SQLite statement, one indented line per step."""
+    try:
+        rows = cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    except Exception as e:  # e.g. a statement that cannot be explained
+        return [f"(no plan: {e})"]
+    depth, lines = {0: -1}, []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+# The start time lives on the statement's execution context: a statement that
+# raises never reaches _after_cursor_execute, and whatever was kept on the
+# (pooled, long-lived) connection would pile up.
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_stats_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.query_stats_start
+    shape = statement_shape(statement)
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+        stats.shapes[shape] += 1
+
+    if settings.slow_query_ms and elapsed * 1000 >= settings.slow_query_ms:
+        origin = _origin()
+        can_explain = conn.dialect.name == "sqlite" and not executemany
+        entry = slow_queries.record(
+            shape, elapsed * 1000, parameters, origin,
+            lambda: _explain(cursor, statement, parameters) if can_explain else []
+        )
+        slow_query_logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms) from {origin or 'unknown'}: {statement}\n"
+            f"parameters: {parameters!r}" + "".join(f"\n  {line}" for line in entry.plan)
+        )
+
+
+def track_queries(engine: Engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
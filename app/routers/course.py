@@ -3,15 +3,15 @@ from fastapi import (
     APIRouter, Depends, HTTPException,
     Response, Query
 )
-from fastapi.responses import StreamingResponse
 from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas, dependencies
+from ..pagination import PageParams, set_next_cursor_header
 from ..crud import EntityNotFoundError
 from ..models import EntityType
-from ..excel_utils import generate_excel_response
+from ..export_utils import ExportFormat, export_response
 
 router = APIRouter(tags=["courses"])
 logger = logging.getLogger(__name__)
@@ -39,7 +39,7 @@ def read_term(
 @router.get("/course-terms/", response_model=List[schemas.CourseTermRead])
 def list_terms(
     active: Optional[bool] = Query(None),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listed course terms (active={active})")
@@ -113,24 +113,29 @@ def read_course(
 
 @router.get("/courses/", response_model=List[schemas.CourseRead])
 def list_courses(
+    response: Response,
     title:     Optional[str] = Query(None),
     term_id:   Optional[int] = Query(None, ge=1),
     activity_id: Optional[int] = Query(None, ge=1),
     is_active_term: Optional[bool] = Query(None),
     search:    Optional[str] = Query(None),
-    db:         Session = Depends(dependencies.get_db),
+    page: PageParams = Depends(dependencies.get_page_params),
+    db:         Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listed courses (title={title}, term_id={term_id}, "
                 f"activity_id={activity_id}, is_active_term={is_active_term}, search={search!r})")
-    return crud.list_courses(
+    results = crud.list_courses(
         db,
         title=title,
         term_id=term_id,
         activity_id=activity_id,
         is_active_term=is_active_term,
-        search=search
+        search=search,
+        page=page,
     )
+    set_next_cursor_header(response, results)
+    return results
 
 
 @router.post("/courses/", response_model=schemas.CourseRead)
@@ -190,7 +195,7 @@ def delete_course(
 @router.get("/courses/{course_id}/institutions/", response_model=List[schemas.InstitutionRead])
 def list_course_institutions(
     course_id: int,
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listing institutions for course {course_id}")
@@ -241,7 +246,7 @@ def remove_course_institution(
 @router.get("/courses/{course_id}/teachers/", response_model=List[schemas.PersonRoleReadFull])
 def list_course_teachers(
     course_id: int,
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listing teachers for course {course_id}")
@@ -287,7 +292,7 @@ def remove_course_teacher(
 @router.get("/courses/{course_id}/teachers/export/emails")
 def export_course_teacher_emails(
     course_id: int,
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     """
@@ -327,7 +332,7 @@ def export_course_teacher_emails(
 def list_course_students(
     course_id: int,
     search: Optional[str] = Query(None),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listing phd students for course {course_id}")
@@ -353,6 +358,29 @@ def add_course_student(
         raise HTTPException(400, str(e))
 
 
+@router.post("/courses/{course_id}/students/bulk", response_model=List[schemas.CourseStudentRead])
+def bulk_update_course_students(
+    course_id: int,
+    changes: schemas.CourseStudentBulk,
+    db: Session = Depends(dependencies.get_db),
+    current_user=Depends(dependencies.get_current_user)
+):
+    """
+    Add, update and remove many students of a course at once; all changes are
+    applied together or not at all. Returns the course's students afterwards.
+    """
+    logger.info(f"{current_user.username} bulk-updating students of course {course_id}: "
+                f"{len(changes.add)} added, {len(changes.update)} updated, {len(changes.remove)} removed")
+    try:
+        return crud.bulk_update_course_students(db, course_id, changes)
+    except EntityNotFoundError as e:
+        logger.warning(str(e))
+        raise HTTPException(404, str(e))
+    except Exception as e:
+        logger.warning(str(e))
+        raise HTTPException(400, str(e))
+
+
 @router.put("/courses/{course_id}/students/{phd_student_id}", response_model=schemas.CourseStudentRead)
 def update_course_student(
     course_id: int,
@@ -394,7 +422,7 @@ def remove_course_student(
 def export_course_student_emails(
     course_id: int,
     search: Optional[str] = Query(None),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     """
@@ -404,7 +432,9 @@ def export_course_student_emails(
 
     # 1. Retrieve data
     # Returns a list of CourseStudent association objects
-    course_students = crud.get_course_students(db, course_id=course_id, search=search)
+    course_students = crud.get_course_students(
+        db, course_id=course_id, search=search, load_plan=crud.COURSE_STUDENT_EXPORT_PLAN
+    )
 
     # 2. Build filter summary
     filter_info = []
@@ -435,7 +465,7 @@ def export_course_student_emails(
 # — Decision Letters —
 
 @router.get("/courses/{cid}/decision-letters/", response_model=List[schemas.DecisionLetterRead])
-def course_decision_letters(cid: int, db: Session = Depends(dependencies.get_db),
+def course_decision_letters(cid: int, db: Session = Depends(dependencies.get_read_db),
                             current_user=Depends(dependencies.get_current_user)):
     logger.info(f"{current_user.username} listed decision letters for course {cid}")
     return crud.list_decision_letters(db, EntityType.COURSE, cid)
@@ -481,6 +511,27 @@ def del_course_decision_letter(cid: int, dlid: int,
 
 # <editor-fold desc="Course Export endpoints">
 
+# Columns of the course export, also a sheet of the registry workbook
+EXPORT_HEADERS = ["Title", "Term", "Students", "Credits"]
+EXPORT_COLUMN_TYPES = {"Students": int, "Credits": float}
+
+
+def export_row(course) -> dict:
+    """An export row of a course returned by crud.list_courses."""
+    term_label = ""
+    if course.course_term:
+        term_label = f"{course.course_term.season.value} {course.course_term.year}"
+    elif course.grad_school_activity:
+        term_label = f"{course.grad_school_activity.activity_type.type} {course.grad_school_activity.year}"
+
+    return {
+        "Title": course.title,
+        "Term": term_label,
+        "Students": getattr(course, "student_count", 0),
+        "Credits": course.credit_points
+    }
+
+
 @router.get("/courses/export/courses.xlsx")
 def export_courses_to_excel(
     title: Optional[str] = Query(None),
@@ -488,7 +539,8 @@ def export_courses_to_excel(
     activity_id: Optional[int] = Query(None, ge=1),
     is_active_term: Optional[bool] = Query(None),
     search: Optional[str] = Query(None),
-    db: Session = Depends(dependencies.get_db),
+    export_format: ExportFormat = Query(ExportFormat.XLSX, alias="format"),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     """
@@ -504,7 +556,8 @@ def export_courses_to_excel(
         term_id=term_id,
         activity_id=activity_id,
         is_active_term=is_active_term,
-        search=search
+        search=search,
+        yield_per=crud.EXPORT_BATCH_SIZE
     )
 
     # --- 2. BUILD THE FILTER INFO LIST ---
@@ -523,39 +576,19 @@ def export_courses_to_excel(
         if activity:
             filter_info.append(f"Activity: {activity.activity_type.type} {activity.year}")
 
-    # 3. Prepare the data in the desired format
-    data_to_export = []
-    for course in courses:
-        term_label = ""
-        if course.course_term:
-            term_label = f"{course.course_term.season.value} {course.course_term.year}"
-        elif course.grad_school_activity:
-            term_label = f"{course.grad_school_activity.activity_type.type} {course.grad_school_activity.year}"
-
-        data_to_export.append({
-            "Title": course.title,
-            "Term": term_label,
-            "Students": getattr(course, "student_count", 0),
-            "Credits": course.credit_points
-        })
-
-    headers = ["Title", "Term", "Students", "Credits"]
+    # 3. Prepare the data in the desired format (rows are built as the file streams)
+    data_to_export = (export_row(course) for course in courses)
+    headers = EXPORT_HEADERS
 
     # --- 4. PASS THE FILTERS TO THE GENERATOR ---
-    excel_buffer = generate_excel_response(
+    return export_response(
         data_to_export,
         headers,
         "Courses",
-        filter_info=filter_info  # Pass the list here
-    )
-
-    # 5. Return the file as a downloadable response
-    return StreamingResponse(
-        excel_buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": "attachment; filename=courses.xlsx"
-        }
+        "courses",
+        export_format,
+        filter_info=filter_info,
+        column_types=EXPORT_COLUMN_TYPES
     )
 
 
@@ -0,0 +1,41 @@
+import logging
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from .. import schemas, dependencies, importer
+from ..importer import ImportFileError
+
+router = APIRouter(tags=["import"])
+logger = logging.getLogger(__name__)
+
+
+# <editor-fold desc="Import endpoints">
+
+@router.post("/import/phd-students", response_model=schemas.ImportReport)
+def import_phd_students(
+    content: bytes = Body(..., media_type="text/csv",
+                          description="The CSV (UTF-8) or .xlsx file, sent as the raw request body"),
+    dry_run: bool = Query(False, description="Only validate the file and report the errors"),
+    db: Session = Depends(dependencies.get_db),
+    current_user=Depends(dependencies.get_current_user)
+):
+    """
+    Create PhD students (person, role, student record, institutions and
+    fields) from a file with the columns of importer.PHD_STUDENT_COLUMNS.
+    Nothing is written unless every row is valid.
+    """
+    try:
+        rows = importer.read_rows(content)
+    except ImportFileError as e:
+        logger.warning(str(e))
+        raise HTTPException(400, str(e))
+
+    report = importer.import_phd_students(db, rows, dry_run=dry_run)
+    logger.info(f"{current_user.username} imported PhD students (dry_run={dry_run}): "
+                f"{report.rows} rows, {report.created} created, {len(report.errors)} with errors")
+    if report.errors and not dry_run:
+        raise HTTPException(400, report.model_dump())
+    return report
+
+
+# </editor-fold>
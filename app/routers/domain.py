@@ -36,7 +36,7 @@ def read_branch(
 @router.get("/branches/", response_model=List[schemas.BranchRead])
 def list_branches(
     search: Optional[str] = Query(None, description="Substring search"),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user),
 ):
     logger.info(f"{current_user.username} listed branches (search={search!r})")
@@ -118,7 +118,7 @@ def read_field(
 def list_fields(
     branch_id: Optional[int] = Query(None, ge=1, description="Filter by branch ID"),
     search:    Optional[str] = Query(None, description="Substring search"),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user),
 ):
     logger.info(f"{current_user.username} listed fields (search={search!r}) in branch {branch_id}")
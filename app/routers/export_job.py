@@ -0,0 +1,85 @@
+import inspect
+import logging
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from .. import schemas, dependencies
+from ..export_jobs import ExportJob, ExportJobStatus, manager
+from . import (institution, grad_school_activity, course, project, researcher,
+               phd_student, postdoc, report, registry)
+
+router = APIRouter(prefix="/export-jobs", tags=["export_jobs"])
+logger = logging.getLogger(__name__)
+
+# Exports that can run as background jobs: POST /export-jobs/<name> accepts
+# the same query parameters (filters and `format=`) as the endpoint itself.
+EXPORTS = {
+    "institutions": institution.export_institutions_to_excel,
+    "grad-school-activities": grad_school_activity.export_grad_school_activities_to_excel,
+    "courses": course.export_courses_to_excel,
+    "projects": project.export_projects_to_excel,
+    "researchers": researcher.export_researchers_to_excel,
+    "phd-students": phd_student.export_phd_students_to_excel,
+    "postdocs": postdoc.export_postdocs_to_excel,
+    "supervisions-report": report.export_supervisors_to_excel,
+    "project-leaders-report": report.export_project_leaders_to_excel,
+    "semester-abroad-report": report.export_semester_abroad_to_excel,
+    "registry": registry.export_registry_to_excel,
+}
+
+
+def _get_job(job_id: str, current_user) -> ExportJob:
+    job = manager.get(job_id)
+    if not job or (job.username != current_user.username and not current_user.is_admin):
+        raise HTTPException(404, "Export job not found")
+    return job
+
+
+# <editor-fold desc="Export Job endpoints">
+
+def _submit_endpoint(name, endpoint):
+    def submit_export_job(db, current_user, **params):
+        logger.info(f"{current_user.username} queued a {name} export job")
+        return manager.submit(name, endpoint, params, db, current_user)
+
+    # same filters and dependencies as the export endpoint, validated by FastAPI
+    submit_export_job.__signature__ = inspect.signature(endpoint)
+    submit_export_job.__doc__ = f"Queue the {name} export as a background job; poll it by id."
+    return submit_export_job
+
+
+for _name, _endpoint in EXPORTS.items():
+    router.add_api_route(
+        f"/{_name}",
+        _submit_endpoint(_name, _endpoint),
+        methods=["POST"],
+        status_code=202,
+        response_model=schemas.ExportJobRead,
+        name=f"submit_{_name.replace('-', '_')}_export_job",
+    )
+
+
+@router.get("/{job_id}", response_model=schemas.ExportJobRead)
+def get_export_job(
+    job_id: str,
+    current_user=Depends(dependencies.get_current_user),
+):
+    return _get_job(job_id, current_user)
+
+
+@router.get("/{job_id}/download")
+def download_export_job(
+    job_id: str,
+    current_user=Depends(dependencies.get_current_user),
+):
+    job = _get_job(job_id, current_user)
+    if job.status != ExportJobStatus.DONE:
+        raise HTTPException(409, f"Export job is {job.status.value}")
+    if not job.path.exists():
+        raise HTTPException(410, "The export file is no longer cached; submit the job again")
+
+    logger.info(f"{current_user.username} downloading export job {job_id} ({job.export})")
+    return FileResponse(job.path, media_type=job.media_type, filename=job.filename)
+
+
+# </editor-fold>
@@ -3,14 +3,14 @@ from fastapi import (
     APIRouter, Depends, HTTPException,
     Response, Query
 )
-from fastapi.responses import StreamingResponse
 from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas, dependencies
+from ..pagination import PageParams, set_next_cursor_header
 from ..crud import EntityNotFoundError
-from ..excel_utils import generate_excel_response
+from ..export_utils import ExportFormat, export_response
 
 router = APIRouter(tags=["grad_school_activities"])
 logger = logging.getLogger(__name__)
@@ -37,7 +37,7 @@ def read_grad_school_activity_type(
 
 @router.get("/grad-school-activity-types/", response_model=List[schemas.GradSchoolActivityTypeRead])
 def list_grad_school_activity_types(
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user),
 ):
     logger.info(f"{current_user.username} listed grad school activity types")
@@ -110,22 +110,27 @@ def read_grad_school_activity(
 
 @router.get("/grad-school-activities/", response_model=List[schemas.GradSchoolActivityRead])
 def list_grad_school_activities(
+    response: Response,
     activity_type_id:   Optional[int] = Query(None, ge=1),
     description:        Optional[str] = Query(None),
     year:               Optional[int] = Query(None),
     search:             Optional[str] = Query(None),
-    db: Session = Depends(dependencies.get_db),
+    page: PageParams = Depends(dependencies.get_page_params),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listed grad school activities (activity_type_id={activity_type_id},"
                 f"description={description}, year={year}, search={search!r})")
-    return crud.list_grad_school_activities(
+    results = crud.list_grad_school_activities(
         db,
         activity_type_id=activity_type_id,
         description=description,
         year=year,
-        search=search
+        search=search,
+        page=page,
     )
+    set_next_cursor_header(response, results)
+    return results
 
 
 @router.post("/grad-school-activities/", response_model=schemas.GradSchoolActivityRead)
@@ -191,7 +196,7 @@ def list_student_activities_for_grad_school_activity(
     search: Optional[str] = Query(
         None, description="Substring search on student first or last name"
     ),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     # Verify the grad school activity exists
@@ -213,7 +218,7 @@ def list_student_activities_for_grad_school_activity(
 def export_gsa_student_emails(
     gsa_id: int,
     search: Optional[str] = Query(None),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     """
@@ -224,7 +229,7 @@ def export_gsa_student_emails(
     # 1. Retrieve data
     # Note: We reuse the existing CRUD logic which handles the search filter
     activities = crud.list_student_activities_for_grad_school(
-        db, grad_school_activity_id=gsa_id, search=search
+        db, grad_school_activity_id=gsa_id, search=search, load_plan=crud.STUDENT_ACTIVITY_EXPORT_PLAN
     )
 
     # 2. Build filter summary
@@ -259,7 +264,7 @@ def export_gsa_student_emails(
             response_model=List[schemas.CourseRead])
 def list_courses_for_grad_school_activity(
         gsa_id: int,
-        db: Session = Depends(dependencies.get_db),
+        db: Session = Depends(dependencies.get_read_db),
         current_user=Depends(dependencies.get_current_user)):
     # Verify the grad school activity exists (reuse get_grad_school_activity)
     from ..crud import get_grad_school_activity
@@ -282,7 +287,8 @@ def export_grad_school_activities_to_excel(
     description:        Optional[str] = Query(None),
     year:               Optional[int] = Query(None),
     search:             Optional[str] = Query(None),
-    db: Session = Depends(dependencies.get_db),
+    export_format: ExportFormat = Query(ExportFormat.XLSX, alias="format"),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     """
@@ -297,7 +303,8 @@ def export_grad_school_activities_to_excel(
         activity_type_id=activity_type_id,
         description=description,
         year=year,
-        search=search
+        search=search,
+        yield_per=crud.EXPORT_BATCH_SIZE
     )
 
     # --- 1. BUILD THE FILTER INFO LIST ---
@@ -312,31 +319,25 @@ def export_grad_school_activities_to_excel(
         if activity_type:
             filter_info.append(f"Activity Type: {activity_type.type}")
 
-    # Prepare the data in the desired format
-    data_to_export = [
+    # Prepare the data in the desired format (rows are built as the file streams)
+    data_to_export = (
         {
             "Activity Type": act.activity_type.type,
             "Year": act.year,
             "Description": act.description
         } for act in activities
-    ]
+    )
     headers = ["Activity Type", "Year", "Description"]
 
     # --- 2. PASS THE FILTERS TO THE GENERATOR ---
-    excel_buffer = generate_excel_response(
+    return export_response(
         data_to_export,
         headers,
         "Grad School Activities",
-        filter_info=filter_info  # Pass the list here
-    )
-
-    # Return the file as a downloadable response
-    return StreamingResponse(
-        excel_buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": "attachment; filename=grad_school_activities.xlsx"
-        }
+        "grad_school_activities",
+        export_format,
+        filter_info=filter_info,
+        column_types={"Year": int}
     )
 
 
@@ -1,12 +1,11 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException, Response, Query
-from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas, dependencies
 from ..crud import EntityNotFoundError
-from ..excel_utils import generate_excel_response
+from ..export_utils import ExportFormat, export_response
 
 router = APIRouter(prefix="/institutions", tags=["institutions"])
 
@@ -34,7 +33,7 @@ def read_institution(
 @router.get("/", response_model=List[schemas.InstitutionRead])
 def list_institutions(
     search: Optional[str] = Query(None, description="Substring search on name"),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user),
 ):
     logger.info(f"{current_user.username} listed institutions (search={search!r})")
@@ -94,10 +93,40 @@ def delete_institution(
 
 # <editor-fold desc="Institution Export endpoints">
 
+# Columns of the institution export, also a sheet of the registry workbook
+EXPORT_HEADERS = [
+    "Institution Name",
+    "Researchers (Active)", "Researchers (Total)",
+    "PhD Students (Active)", "PhD Students (Total)",
+    "Postdocs (Active)", "Postdocs (Total)"
+]
+EXPORT_COLUMN_TYPES = {header: int for header in EXPORT_HEADERS[1:]}
+
+
+def export_row(inst) -> dict:
+    """An export row of an institution returned by crud.get_institutions."""
+    return {
+        "Institution Name": inst.institution,
+
+        # Researchers
+        "Researchers (Active)": getattr(inst, "researchers_active", 0),
+        "Researchers (Total)": getattr(inst, "researchers_total", 0),
+
+        # PhD Students
+        "PhD Students (Active)": getattr(inst, "phd_students_active", 0),
+        "PhD Students (Total)": getattr(inst, "phd_students_total", 0),
+
+        # Postdocs
+        "Postdocs (Active)": getattr(inst, "postdocs_active", 0),
+        "Postdocs (Total)": getattr(inst, "postdocs_total", 0),
+    }
+
+
 @router.get("/export/institutions.xlsx")
 def export_institutions_to_excel(
         search: Optional[str] = Query(None, description="Substring search on name"),
-        db: Session = Depends(dependencies.get_db),
+        export_format: ExportFormat = Query(ExportFormat.XLSX, alias="format"),
+        db: Session = Depends(dependencies.get_read_db),
         current_user=Depends(dependencies.get_current_user),
 ):
     """
@@ -116,46 +145,18 @@ def export_institutions_to_excel(
         filter_info.append(f"Search: {search}")
 
     # --- 2. PREPARE DATA WITH SEPARATE COLUMNS ---
-    data_to_export = []
-    for inst in institutions:
-        data_to_export.append({
-            "Institution Name": inst.institution,
-
-            # Researchers
-            "Researchers (Active)": getattr(inst, "researchers_active", 0),
-            "Researchers (Total)": getattr(inst, "researchers_total", 0),
-
-            # PhD Students
-            "PhD Students (Active)": getattr(inst, "phd_students_active", 0),
-            "PhD Students (Total)": getattr(inst, "phd_students_total", 0),
-
-            # Postdocs
-            "Postdocs (Active)": getattr(inst, "postdocs_active", 0),
-            "Postdocs (Total)": getattr(inst, "postdocs_total", 0),
-        })
-
-    headers = [
-        "Institution Name",
-        "Researchers (Active)", "Researchers (Total)",
-        "PhD Students (Active)", "PhD Students (Total)",
-        "Postdocs (Active)", "Postdocs (Total)"
-    ]
+    data_to_export = [export_row(inst) for inst in institutions]
+    headers = EXPORT_HEADERS
 
     # --- 3. PASS THE FILTERS TO THE GENERATOR ---
-    excel_buffer = generate_excel_response(
+    return export_response(
         data_to_export,
         headers,
         "Institutions",
-        filter_info=filter_info
-    )
-
-    # Return the file as a downloadable response
-    return StreamingResponse(
-        excel_buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": "attachment; filename=institutions.xlsx"
-        }
+        "institutions",
+        export_format,
+        filter_info=filter_info,
+        column_types=EXPORT_COLUMN_TYPES
     )
 
 
@@ -0,0 +1,55 @@
+import logging
+from enum import Enum
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from .. import dependencies, metrics, schemas
+from ..query_stats import slow_queries
+
+router = APIRouter(tags=["monitoring"])
+logger = logging.getLogger(__name__)
+
+
+class SlowQueryOrder(str, Enum):
+    MAX = "max"
+    TOTAL = "total"
+    CALLS = "calls"
+
+
+def _require_admin(current_user, action: str):
+    if not current_user.is_admin:
+        logger.warning(f"Unauthorized {action} access by {current_user.username}")
+        raise HTTPException(403, f"Only admins can read {action}")
+
+
+# <editor-fold desc="Monitoring endpoints">
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def read_metrics(
+    current_user=Depends(dependencies.get_current_user),
+):
+    """
+    Request, database and export metrics in the Prometheus text format.
+    Admins only: scrape with the Auth header and an admin's X-Remote-User.
+    """
+    _require_admin(current_user, "metrics")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.get("/slow-queries", response_model=List[schemas.SlowQueryRead])
+def list_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    order: SlowQueryOrder = Query(SlowQueryOrder.MAX, description="Rank by slowest call, total time or calls"),
+    current_user=Depends(dependencies.get_current_user),
+):
+    """
+    The statements that exceeded the slow-query threshold since startup,
+    worst first, with the parameters, origin and query plan of their slowest call.
+    """
+    _require_admin(current_user, "slow queries")
+    by = {SlowQueryOrder.MAX: "max_ms", SlowQueryOrder.TOTAL: "total_ms", SlowQueryOrder.CALLS: "calls"}[order]
+    return slow_queries.worst(limit, by=by)
+
+
+# </editor-fold>
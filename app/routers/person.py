@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Response, Query
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas, dependencies
+from ..pagination import PageParams, set_next_cursor_header
 from ..crud import EntityNotFoundError
 from ..models import EntityType
 
@@ -32,7 +33,7 @@ def read_role(
 @router.get("/roles/", response_model=List[schemas.RoleRead])
 def list_roles(
     current_user=Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
 ):
     logger.info(f"{current_user.username} listed roles")
     return crud.list_roles(db)
@@ -59,12 +60,16 @@ def read_person(
 
 @router.get("/people/", response_model=List[schemas.PersonRead])
 def list_people(
+    response: Response,
     search: Optional[str] = Query(None, description="Substring search on first/last name or email"),
+    page: PageParams = Depends(dependencies.get_page_params),
     current_user=Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
 ):
     logger.info(f"{current_user.username} listed people (search={search!r})")
-    return crud.list_persons(db, search=search)
+    results = crud.list_persons(db, search=search, page=page)
+    set_next_cursor_header(response, results)
+    return results
 
 
 @router.post("/people/", response_model=schemas.PersonRead)
@@ -135,14 +140,18 @@ def read_person_role(
 
 @router.get("/person-roles/", response_model=List[schemas.PersonRoleReadFull])
 def list_person_roles(
+    response: Response,
     person_id: Optional[int] = Query(None, ge=1),
     role_id:   Optional[int] = Query(None, ge=1),
     active:    Optional[bool] = Query(None),
+    page: PageParams = Depends(dependencies.get_page_params),
     current_user=Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
 ):
     logger.info(f"{current_user.username} listed person_roles (person_id={person_id}, role_id={role_id}, active={active})")
-    return crud.list_person_roles(db, person_id=person_id, role_id=role_id, active=active)
+    results = crud.list_person_roles(db, person_id=person_id, role_id=role_id, active=active, page=page)
+    set_next_cursor_header(response, results)
+    return results
 
 
 @router.post("/person-roles/", response_model=schemas.PersonRoleReadFull)
@@ -201,7 +210,7 @@ def delete_person_role(
             response_model=List[schemas.PersonRoleInstitutionRead])
 def list_person_role_institutions(
     person_role_id: int,
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listing institutions for person role {person_role_id}")
@@ -273,7 +282,7 @@ def remove_person_role_institution(
 @router.get("/person-roles/{person_role_id}/fields/", response_model=List[schemas.FieldRead])
 def list_person_role_fields(
     person_role_id: int,
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listing academic fields for person role {person_role_id}")
@@ -324,7 +333,7 @@ def remove_person_role_field(
 @router.get("/person-roles/{person_role_id}/projects/", response_model=List[schemas.ProjectPersonRoleRead])
 def list_person_role_projects(
     person_role_id: int,
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listing projects for person role {person_role_id}")
@@ -341,7 +350,7 @@ def list_person_role_courses_teaching(
         person_role_id: int,
         is_active_term: Optional[bool] = Query(None),
         search: Optional[str] = Query(None, description="Substring search on title"),
-        db: Session = Depends(dependencies.get_db),
+        db: Session = Depends(dependencies.get_read_db),
         current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(
@@ -366,7 +375,7 @@ def list_person_role_courses_teaching(
 )
 def list_student_supervisors(
     student_role_id: int,
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user),
 ):
     logger.info(f"{current_user.username} listing supervisors for student role {student_role_id}")
@@ -451,7 +460,7 @@ def remove_student_supervisor(
 )
 def list_supervisor_students(
     supervisor_role_id: int,
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user),
 ):
     logger.info(f"{current_user.username} listing students for supervisor role {supervisor_role_id}")
@@ -532,7 +541,7 @@ def remove_student_for_supervisor(
 # — Decision Letters —
 
 @router.get("/person-roles/{person_role_id}/decision-letters/", response_model=List[schemas.DecisionLetterRead])
-def person_role_decision_letters(person_role_id: int, db: Session = Depends(dependencies.get_db),
+def person_role_decision_letters(person_role_id: int, db: Session = Depends(dependencies.get_read_db),
                                  current_user=Depends(dependencies.get_current_user)):
     logger.info(f"{current_user.username} listed decision letters for person role {person_role_id}")
     return crud.list_decision_letters(db, EntityType.PERSON_ROLE, person_role_id)
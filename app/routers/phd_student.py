@@ -2,13 +2,13 @@ import logging
 from typing import List, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Response, Query
-from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas, dependencies
+from ..pagination import PageParams, set_next_cursor_header
 from ..crud import EntityNotFoundError, StudentActivityNotFound
 from ..models import ActivityType
-from ..excel_utils import generate_excel_response
+from ..export_utils import ExportFormat, export_response
 
 router = APIRouter(tags=["phd_students"])
 logger = logging.getLogger(__name__)
@@ -33,6 +33,7 @@ def read_phd_student(
 
 @router.get("/phd-students/", response_model=List[schemas.PhDStudentRead])
 def list_phd_students(
+    response: Response,
     person_role_id:   Optional[int] = Query(None, ge=1, description="Filter by person_role_id"),
     is_active:        Optional[bool] = Query(None, description="Only active/inactive roles"),
     cohort_number:    Optional[int] = Query(None, ge=0, description="Filter by cohort number"),
@@ -42,8 +43,9 @@ def list_phd_students(
     field_id:         Optional[int] = Query(None, ge=1, description="Filter by academic field"),
     branch_id:        Optional[int] = Query(None, ge=1, description="Filter by academic branch"),
     search:           Optional[str] = Query(None, description="Substring search on person name"),
+    page: PageParams = Depends(dependencies.get_page_params),
     current_user=Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
 ):
     logger.info(
         f"{current_user.username} listed PhD students "
@@ -51,7 +53,7 @@ def list_phd_students(
         f"is_affiliated={is_affiliated}, is_graduated={is_graduated}, "
         f"institution_id={institution_id}, field_id={field_id}, branch_id={branch_id}, search={search!r})"
     )
-    return crud.list_phd_students(
+    results = crud.list_phd_students(
         db,
         person_role_id=person_role_id,
         is_active=is_active,
@@ -62,7 +64,10 @@ def list_phd_students(
         field_id=field_id,
         branch_id=branch_id,
         search=search,
+        page=page,
     )
+    set_next_cursor_header(response, results)
+    return results
 
 
 @router.post("/phd-students/", response_model=schemas.PhDStudentRead)
@@ -122,7 +127,7 @@ def list_student_activities(
         description="Filter by activity type (GRAD_SCHOOL or ABROAD)"
     ),
     current_user=Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
 ):
     # Verify the student exists
     from ..crud import get_phd_student
@@ -274,7 +279,7 @@ def delete_student_activity(
 @router.get("/phd-students/{stu_id}/courses/", response_model=List[schemas.CourseStudentRead])
 def list_student_courses(
     stu_id: int,
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listing courses for phd student {stu_id}")
@@ -297,8 +302,9 @@ def export_phd_students_to_excel(
         field_id: Optional[int] = Query(None, ge=1),
         branch_id: Optional[int] = Query(None, ge=1),
         search: Optional[str] = Query(None),
+        export_format: ExportFormat = Query(ExportFormat.XLSX, alias="format"),
         current_user=Depends(dependencies.get_current_user),
-        db: Session = Depends(dependencies.get_db),
+        db: Session = Depends(dependencies.get_read_db),
 ):
     """
     Export a list of PhD students to an Excel file, applying the same
@@ -311,6 +317,8 @@ def export_phd_students_to_excel(
         db, person_role_id=person_role_id, is_active=is_active, cohort_number=cohort_number,
         is_affiliated=is_affiliated, is_graduated=is_graduated, institution_id=institution_id,
         field_id=field_id, branch_id=branch_id, search=search,
+        load_plan=crud.PHD_STUDENT_EXPORT_PLAN,
+        yield_per=crud.EXPORT_BATCH_SIZE,
     )
 
     # --- 2. BUILD THE FILTER INFO LIST ---
@@ -344,25 +352,25 @@ def export_phd_students_to_excel(
         if field:
             filter_info.append(f"Field: {field.field}")
 
-    # 3. Prepare headers and data based on the view mode
+    # 3. Prepare headers and data based on the view mode (rows are built as the file streams)
     headers = []
-    data_to_export = []
 
     if view_mode == 'activity':
         headers = ["Name", "Cohort", "Affiliated", "Graduated", "Current Title", "Current Organization"]
-        for s in students:
-            data_to_export.append({
+        data_to_export = (
+            {
                 "Name": f"{s.person_role.person.first_name} {s.person_role.person.last_name}",
                 "Cohort": s.cohort_number,
                 "Affiliated": "Yes" if s.is_affiliated else "No",
                 "Graduated": "Yes" if s.is_graduated else "No",
                 "Current Title": s.current_title,
                 "Current Organization": s.current_organization
-            })
+            } for s in students
+        )
     else:  # Default view
         headers = ["Name", "Email", "Cohort", "Affiliated", "Graduated", "Start Date", "End Date"]
-        for s in students:
-            data_to_export.append({
+        data_to_export = (
+            {
                 "Name": f"{s.person_role.person.first_name} {s.person_role.person.last_name}",
                 "Email": s.person_role.person.email,
                 "Cohort": s.cohort_number,
@@ -370,21 +378,18 @@ def export_phd_students_to_excel(
                 "Graduated": "Yes" if s.is_graduated else "No",
                 "Start Date": s.person_role.start_date.strftime("%Y-%m-%d") if s.person_role.start_date else "",
                 "End Date": s.person_role.end_date.strftime("%Y-%m-%d") if s.person_role.end_date else ""
-            })
+            } for s in students
+        )
 
     # --- 4. PASS THE FILTERS TO THE GENERATOR ---
-    excel_buffer = generate_excel_response(
+    return export_response(
         data_to_export,
         headers,
         "PhD Students",
-        filter_info=filter_info # Pass the list here
-    )
-
-    # 5. Return the file as a downloadable response
-    return StreamingResponse(
-        excel_buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=phd_students.xlsx"}
+        "phd_students",
+        export_format,
+        filter_info=filter_info,
+        column_types={"Cohort": int}
     )
 
 
@@ -400,7 +405,7 @@ def export_phd_student_emails(
         branch_id: Optional[int] = Query(None, ge=1),
         search: Optional[str] = Query(None),
         current_user=Depends(dependencies.get_current_user),
-        db: Session = Depends(dependencies.get_db),
+        db: Session = Depends(dependencies.get_read_db),
 ):
     """
     Generate a JSON list of emails and filter metadata for PhD students
@@ -413,6 +418,7 @@ def export_phd_student_emails(
         db, person_role_id=person_role_id, is_active=is_active, cohort_number=cohort_number,
         is_affiliated=is_affiliated, is_graduated=is_graduated, institution_id=institution_id,
         field_id=field_id, branch_id=branch_id, search=search,
+        load_plan=crud.PHD_STUDENT_EXPORT_PLAN,
     )
 
     # 2. Build the filter summary
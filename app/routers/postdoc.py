@@ -2,12 +2,12 @@ import logging
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Response, Query
-from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas, dependencies
+from ..pagination import PageParams, set_next_cursor_header
 from ..crud import EntityNotFoundError
-from ..excel_utils import generate_excel_response
+from ..export_utils import ExportFormat, export_response
 
 router = APIRouter(tags=["postdocs"])
 logger = logging.getLogger(__name__)
@@ -32,6 +32,7 @@ def read_postdoc(
 
 @router.get("/postdocs/", response_model=List[schemas.PostdocRead])
 def list_postdocs(
+    response: Response,
     person_role_id: Optional[int] = Query(None, ge=1, description="Filter by person_role_id"),
     is_active:      Optional[bool] = Query(None, description="Only active/inactive roles"),
     cohort_number:  Optional[int] = Query(None, ge=0, description="Filter by cohort number"),
@@ -41,8 +42,9 @@ def list_postdocs(
     field_id:       Optional[int] = Query(None, ge=1, description="Filter by academic field"),
     branch_id:      Optional[int] = Query(None, ge=1, description="Filter by academic branch"),
     search:         Optional[str] = Query(None, description="Substring search on person name"),
+    page: PageParams = Depends(dependencies.get_page_params),
     current_user=Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
 ):
     logger.info(
         f"{current_user.username} listed postdocs "
@@ -50,7 +52,7 @@ def list_postdocs(
         f"is_incoming={is_incoming}, is_graduated={is_graduated}, "
         f"institution_id={institution_id}, field_id={field_id}, branch_id={branch_id}, search={search!r})"
     )
-    return crud.list_postdocs(
+    results = crud.list_postdocs(
         db,
         person_role_id=person_role_id,
         is_active=is_active,
@@ -61,7 +63,10 @@ def list_postdocs(
         field_id=field_id,
         branch_id=branch_id,
         search=search,
+        page=page,
     )
+    set_next_cursor_header(response, results)
+    return results
 
 
 @router.post("/postdocs/", response_model=schemas.PostdocRead)
@@ -124,8 +129,9 @@ def export_postdocs_to_excel(
     field_id:       Optional[int] = Query(None, ge=1),
     branch_id:      Optional[int] = Query(None, ge=1),
     search:         Optional[str] = Query(None),
+    export_format: ExportFormat = Query(ExportFormat.XLSX, alias="format"),
     current_user=Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
 ):
     """
     Export a list of postdocs to an Excel file, applying the same
@@ -138,6 +144,8 @@ def export_postdocs_to_excel(
         db, person_role_id=person_role_id, is_active=is_active, cohort_number=cohort_number,
         is_incoming=is_incoming, is_graduated=is_graduated, institution_id=institution_id,
         field_id=field_id, branch_id=branch_id, search=search,
+        load_plan=crud.POSTDOC_EXPORT_PLAN,
+        yield_per=crud.EXPORT_BATCH_SIZE,
     )
 
     # --- 2. BUILD THE FILTER INFO LIST ---
@@ -172,26 +180,25 @@ def export_postdocs_to_excel(
         if field:
             filter_info.append(f"Field: {field.field}")
 
-    # 3. Prepare headers and data based on the view mode
+    # 3. Prepare headers and data based on the view mode (rows are built as the file streams)
     headers = []
-    data_to_export = []
 
     if view_mode == 'activity':
         headers = ["Name", "Cohort", "Graduated", "Current Title", "Current Institution"]
-        for p in postdocs:
-            title = p.current_title.title if p.current_title else p.current_title_other
-            institution = p.current_institution.institution if p.current_institution else p.current_institution_other
-            data_to_export.append({
+        data_to_export = (
+            {
                 "Name": f"{p.person_role.person.first_name} {p.person_role.person.last_name}",
                 "Cohort": p.cohort_number,
                 "Graduated": "Yes" if p.is_graduated else "No",
-                "Current Title": title,
-                "Current Institution": institution
-            })
+                "Current Title": p.current_title.title if p.current_title else p.current_title_other,
+                "Current Institution": (p.current_institution.institution if p.current_institution
+                                        else p.current_institution_other)
+            } for p in postdocs
+        )
     else:  # Default view
         headers = ["Name", "Email", "Cohort", "Mobility Status", "Graduated", "Start Date", "End Date"]
-        for p in postdocs:
-            data_to_export.append({
+        data_to_export = (
+            {
                 "Name": f"{p.person_role.person.first_name} {p.person_role.person.last_name}",
                 "Email": p.person_role.person.email,
                 "Cohort": p.cohort_number,
@@ -199,21 +206,18 @@ def export_postdocs_to_excel(
                 "Graduated": "Yes" if p.is_graduated else "No",
                 "Start Date": p.person_role.start_date.strftime("%Y-%m-%d") if p.person_role.start_date else "",
                 "End Date": p.person_role.end_date.strftime("%Y-%m-%d") if p.person_role.end_date else ""
-            })
+            } for p in postdocs
+        )
 
     # --- 4. PASS THE FILTERS TO THE GENERATOR ---
-    excel_buffer = generate_excel_response(
+    return export_response(
         data_to_export,
         headers,
         "Postdocs",
-        filter_info=filter_info  # Pass the list here
-    )
-
-    # 5. Return the file as a downloadable response
-    return StreamingResponse(
-        excel_buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=postdocs.xlsx"}
+        "postdocs",
+        export_format,
+        filter_info=filter_info,
+        column_types={"Cohort": int}
     )
 
 
@@ -229,7 +233,7 @@ def export_postdoc_emails(
     branch_id:      Optional[int] = Query(None, ge=1),
     search:         Optional[str] = Query(None),
     current_user=Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
 ):
     """
     Generate a JSON list of emails and filter metadata for Postdocs.
@@ -241,6 +245,7 @@ def export_postdoc_emails(
         db, person_role_id=person_role_id, is_active=is_active, cohort_number=cohort_number,
         is_incoming=is_incoming, is_graduated=is_graduated, institution_id=institution_id,
         field_id=field_id, branch_id=branch_id, search=search,
+        load_plan=crud.POSTDOC_EXPORT_PLAN,
     )
 
     # 2. Build filter summary
@@ -3,15 +3,15 @@ from fastapi import (
     APIRouter, Depends, HTTPException,
     Response, Query
 )
-from fastapi.responses import StreamingResponse
 from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas, dependencies
+from ..pagination import PageParams, set_next_cursor_header
 from ..crud import EntityNotFoundError
 from ..models import EntityType
-from ..excel_utils import generate_excel_response
+from ..export_utils import ExportFormat, export_response
 
 router = APIRouter(tags=["projects"])
 logger = logging.getLogger(__name__)
@@ -39,7 +39,7 @@ def read_project_call_type(
 @router.get("/project-call-types/", response_model=List[schemas.ProjectCallTypeRead])
 def list_project_call_types(
     search: Optional[str] = Query(None, description="Substring search on type"),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user),
 ):
     logger.info(f"{current_user.username} listed project call types")
@@ -112,6 +112,7 @@ def read_project(
 
 @router.get("/projects/", response_model=List[schemas.ProjectRead])
 def list_projects(
+    response: Response,
     call_type_id:   Optional[int] = Query(None, ge=1),
     title:          Optional[str] = Query(None),
     project_number: Optional[str] = Query(None),
@@ -123,14 +124,15 @@ def list_projects(
     field_id:       Optional[int] = Query(None, ge=1),
     branch_id:      Optional[int] = Query(None, ge=1),
     search:         Optional[str] = Query(None),
-    db: Session = Depends(dependencies.get_db),
+    page: PageParams = Depends(dependencies.get_page_params),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listed projects (call_type_id={call_type_id}), (title={title}, "
                 f"project_number={project_number}, final_report_submitted={final_report_submitted}, "
                 f"is_extended={is_extended}, project_status={project_status}, "
                 f"field_id={field_id}, branch_id={branch_id}, search={search!r})")
-    return crud.list_projects(
+    results = crud.list_projects(
         db,
         call_type_id=call_type_id,
         title=title,
@@ -142,8 +144,11 @@ def list_projects(
         project_status=project_status,
         field_id=field_id,
         branch_id=branch_id,
-        search=search
+        search=search,
+        page=page,
     )
+    set_next_cursor_header(response, results)
+    return results
 
 
 @router.post("/projects/", response_model=schemas.ProjectRead)
@@ -201,7 +206,7 @@ def delete_project(
 # — Research Output Reports —
 
 @router.get("/projects/{pid}/research-output-reports/", response_model=List[schemas.ResearchOutputReportRead])
-def project_research_output_reports(pid: int, db: Session = Depends(dependencies.get_db),
+def project_research_output_reports(pid: int, db: Session = Depends(dependencies.get_read_db),
                                     current_user=Depends(dependencies.get_current_user)):
     logger.info(f"{current_user.username} listed research output reports for project {pid}")
     return crud.list_research_output_reports(db, pid)
@@ -251,7 +256,7 @@ def del_project_research_output_report(pid: int, rorid: int,
 @router.get("/projects/{project_id}/fields/", response_model=List[schemas.FieldRead])
 def list_project_fields(
     project_id: int,
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listing academic fields for project {project_id}")
@@ -306,7 +311,7 @@ def list_project_people_roles(
         is_principal_investigator: Optional[bool] = Query(None, description="Filter by PI status"),
         is_contact_person: Optional[bool] = Query(None, description="Filter by contact person status"),
 
-        db: Session = Depends(dependencies.get_db),
+        db: Session = Depends(dependencies.get_read_db),
         current_user=Depends(dependencies.get_current_user)
 ):
     logger.info(f"{current_user.username} listing people roles for project {project_id} "
@@ -384,7 +389,7 @@ def export_project_member_emails(
     is_active: Optional[bool] = Query(None),
     is_principal_investigator: Optional[bool] = Query(None),
     is_contact_person: Optional[bool] = Query(None),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     """
@@ -433,7 +438,7 @@ def export_project_member_emails(
 # — Decision Letters —
 
 @router.get("/projects/{pid}/decision-letters/", response_model=List[schemas.DecisionLetterRead])
-def project_decision_letters(pid: int, db: Session = Depends(dependencies.get_db),
+def project_decision_letters(pid: int, db: Session = Depends(dependencies.get_read_db),
                              current_user=Depends(dependencies.get_current_user)):
     logger.info(f"{current_user.username} listed decision letters for project {pid}")
     return crud.list_decision_letters(db, EntityType.PROJECT, pid)
@@ -479,6 +484,29 @@ def del_project_decision_letter(pid: int, dlid: int,
 
 # <editor-fold desc="Project Export endpoints">
 
+# Columns of the project export, also a sheet of the registry workbook
+EXPORT_HEADERS = ["Project #", "Call Type", "Title", "Fields", "Start Date", "End Date", "Final Report Submitted",
+                  "Extended"]
+EXPORT_COLUMN_TYPES = {"Fields": int}
+
+
+def export_row(p) -> dict:
+    """An export row of a project returned by crud.list_projects."""
+    return {
+        "Project #": p.project_number,
+        "Call Type": p.call_type.type,
+        "Title": p.title,
+
+        # Safe access using getattr, defaulting to 0
+        "Fields": getattr(p, "field_count", 0),
+
+        "Start Date": p.start_date.strftime("%Y-%m-%d") if p.start_date else "",
+        "End Date": p.end_date.strftime("%Y-%m-%d") if p.end_date else "",
+        "Final Report Submitted": "Yes" if p.final_report_submitted else "No",
+        "Extended": "Yes" if p.is_extended else "No"
+    }
+
+
 @router.get("/projects/export/projects.xlsx")
 def export_projects_to_excel(
     call_type_id:   Optional[int] = Query(None, ge=1),
@@ -490,7 +518,8 @@ def export_projects_to_excel(
     field_id:       Optional[int] = Query(None, ge=1),
     branch_id:      Optional[int] = Query(None, ge=1),
     search:         Optional[str] = Query(None),
-    db: Session = Depends(dependencies.get_db),
+    export_format: ExportFormat = Query(ExportFormat.XLSX, alias="format"),
+    db: Session = Depends(dependencies.get_read_db),
     current_user=Depends(dependencies.get_current_user)
 ):
     """
@@ -510,7 +539,8 @@ def export_projects_to_excel(
         project_status=project_status,
         field_id=field_id,
         branch_id=branch_id,
-        search=search
+        search=search,
+        yield_per=crud.EXPORT_BATCH_SIZE
     )
 
     # --- 2. BUILD THE FILTER INFO LIST ---
@@ -533,39 +563,19 @@ def export_projects_to_excel(
         if field:
             filter_info.append(f"Field: {field.field}")
 
-    # 3. Prepare the data in the desired format
-    data_to_export = [
-        {
-            "Project #": p.project_number,
-            "Call Type": p.call_type.type,
-            "Title": p.title,
-
-            # Safe access using getattr, defaulting to 0
-            "Fields": getattr(p, "field_count", 0),
-
-            "Start Date": p.start_date.strftime("%Y-%m-%d") if p.start_date else "",
-            "End Date": p.end_date.strftime("%Y-%m-%d") if p.end_date else "",
-            "Final Report Submitted": "Yes" if p.final_report_submitted else "No",
-            "Extended": "Yes" if p.is_extended else "No"
-        } for p in projects
-    ]
-    headers = ["Project #", "Call Type", "Title", "Fields", "Start Date", "End Date", "Final Report Submitted", "Extended"]
+    # 3. Prepare the data in the desired format (rows are built as the file streams)
+    data_to_export = (export_row(p) for p in projects)
+    headers = EXPORT_HEADERS
 
     # --- 4. PASS THE FILTERS TO THE GENERATOR ---
-    excel_buffer = generate_excel_response(
+    return export_response(
         data_to_export,
         headers,
         "Projects",
-        filter_info=filter_info  # Pass the list here
-    )
-
-    # 5. Return the file as a downloadable response
-    return StreamingResponse(
-        excel_buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": "attachment; filename=projects.xlsx"
-        }
+        "projects",
+        export_format,
+        filter_info=filter_info,
+        column_types=EXPORT_COLUMN_TYPES
     )
 
 
@@ -0,0 +1,130 @@
+import logging
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from .. import crud, dependencies
+from ..excel_utils import ExcelSheet
+from ..export_utils import workbook_response
+from . import institution, course, project
+
+router = APIRouter(tags=["registry"])
+logger = logging.getLogger(__name__)
+
+
+def _date(value) -> str:
+    return value.strftime("%Y-%m-%d") if value else ""
+
+
+def _yes_no(value) -> str:
+    return "Yes" if value else "No"
+
+
+# <editor-fold desc="Registry Export endpoints">
+
+@router.get("/export/registry.xlsx")
+def export_registry_to_excel(
+        db: Session = Depends(dependencies.get_read_db),
+        current_user=Depends(dependencies.get_current_user),
+):
+    """
+    Export the whole registry as one workbook: a sheet per entity (same
+    columns as the separate exports) plus supervision, course enrolment and
+    project membership sheets.
+    """
+    logger.info(f"{current_user.username} exporting the registry")
+
+    # The person graph is read once; the sheets below only look people up
+    people = crud.registry_people(db)
+
+    def researchers():
+        titles = crud.registry_researchers(db)
+        for pr_id, (name, email, _, start_date, end_date) in people.items():
+            if pr_id in titles:
+                yield {
+                    "Title": titles[pr_id] or "", "Name": name, "Email": email,
+                    "Start Date": _date(start_date), "End Date": _date(end_date)
+                }
+
+    def phd_students():
+        students = crud.registry_phd_students(db)
+        for pr_id, (name, email, _, start_date, end_date) in people.items():
+            if pr_id in students:
+                _, cohort, is_affiliated, is_graduated = students[pr_id]
+                yield {
+                    "Name": name, "Email": email, "Cohort": cohort,
+                    "Affiliated": _yes_no(is_affiliated), "Graduated": _yes_no(is_graduated),
+                    "Start Date": _date(start_date), "End Date": _date(end_date)
+                }
+
+    def postdocs():
+        postdoc_rows = crud.registry_postdocs(db)
+        for pr_id, (name, email, _, start_date, end_date) in people.items():
+            if pr_id in postdoc_rows:
+                cohort, is_incoming, is_graduated = postdoc_rows[pr_id]
+                yield {
+                    "Name": name, "Email": email, "Cohort": cohort,
+                    "Mobility Status": "Incoming" if is_incoming else "Outgoing",
+                    "Graduated": _yes_no(is_graduated),
+                    "Start Date": _date(start_date), "End Date": _date(end_date)
+                }
+
+    # Each sheet's query only runs once the previous sheet has been written
+    def projects():
+        for p in crud.list_projects(db, yield_per=crud.EXPORT_BATCH_SIZE):
+            yield project.export_row(p)
+
+    def courses():
+        for c in crud.list_courses(db, yield_per=crud.EXPORT_BATCH_SIZE):
+            yield course.export_row(c)
+
+    def institutions():
+        for inst in crud.get_institutions(db):
+            yield institution.export_row(inst)
+
+    def supervisions():
+        for supervisor_id, student_id, is_main in crud.registry_supervisions(db, yield_per=crud.EXPORT_BATCH_SIZE):
+            supervisor, student = people[supervisor_id], people[student_id]
+            yield {
+                "Supervisor": supervisor[0], "Supervisor Email": supervisor[1],
+                "Supervisor Role": supervisor[2].value.replace("_", " ").title(),
+                "Student": student[0], "Student Email": student[1], "Main?": _yes_no(is_main)
+            }
+
+    def enrolments():
+        for pr_id, title, is_completed, grade in crud.registry_course_enrolments(
+                db, yield_per=crud.EXPORT_BATCH_SIZE):
+            student = people[pr_id]
+            yield {
+                "Course": title, "Student": student[0], "Email": student[1],
+                "Completed": _yes_no(is_completed), "Grade": grade.value.title() if grade else ""
+            }
+
+    def memberships():
+        for pr_id, number, title, is_pi, is_contact, is_active in crud.registry_project_memberships(
+                db, yield_per=crud.EXPORT_BATCH_SIZE):
+            member = people[pr_id]
+            yield {
+                "Project #": number, "Project": title, "Name": member[0], "Email": member[1],
+                "Role": member[2].value.replace("_", " ").title(),
+                "PI?": _yes_no(is_pi), "Contact Person?": _yes_no(is_contact), "Active": _yes_no(is_active)
+            }
+
+    sheets = [
+        ExcelSheet("PhD Students", ["Name", "Email", "Cohort", "Affiliated", "Graduated", "Start Date", "End Date"],
+                   phd_students()),
+        ExcelSheet("Postdocs", ["Name", "Email", "Cohort", "Mobility Status", "Graduated", "Start Date", "End Date"],
+                   postdocs()),
+        ExcelSheet("Researchers", ["Title", "Name", "Email", "Start Date", "End Date"], researchers()),
+        ExcelSheet("Projects", project.EXPORT_HEADERS, projects()),
+        ExcelSheet("Courses", course.EXPORT_HEADERS, courses()),
+        ExcelSheet("Institutions", institution.EXPORT_HEADERS, institutions()),
+        ExcelSheet("Supervisions", ["Supervisor", "Supervisor Email", "Supervisor Role", "Student", "Student Email",
+                                    "Main?"], supervisions()),
+        ExcelSheet("Course Enrolments", ["Course", "Student", "Email", "Completed", "Grade"], enrolments()),
+        ExcelSheet("Project Memberships", ["Project #", "Project", "Name", "Email", "Role", "PI?", "Contact Person?",
+                                           "Active"], memberships()),
+    ]
+    return workbook_response(sheets, "registry")
+
+
+# </editor-fold>
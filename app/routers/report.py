@@ -3,13 +3,13 @@ from typing import List, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Response, Query
-from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas, dependencies, models
+from ..pagination import PageParams, set_next_cursor_header
 from ..crud import EntityNotFoundError
 from ..models import EntityType
-from ..excel_utils import generate_excel_response
+from ..export_utils import ExportFormat, export_response
 
 router = APIRouter(tags=["reports"])
 logger = logging.getLogger(__name__)
@@ -24,6 +24,7 @@ logger = logging.getLogger(__name__)
     summary="Search and Filter Supervisions for Reports"
 )
 def get_supervisions_report(
+        response: Response,
         # Filters
         is_main: Optional[bool] = Query(None, description="Filter by main supervision status"),
         is_active_supervisor: Optional[bool] = Query(None, description="Filter active/inactive supervisors"),
@@ -34,7 +35,8 @@ def get_supervisions_report(
         search_supervisor: Optional[str] = Query(None, description="Search by supervisor's first or last name"),
 
         # Dependencies
-        db: Session = Depends(dependencies.get_db),
+        page: PageParams = Depends(dependencies.get_page_params),
+        db: Session = Depends(dependencies.get_read_db),
         current_user=Depends(dependencies.get_current_user),  # Assuming you need auth
 ):
     """
@@ -44,7 +46,7 @@ def get_supervisions_report(
     """
     logger.info(f"{current_user.username} accessing supervision report")
 
-    return crud.report_supervisions(
+    results = crud.report_supervisions(
         db,
         is_main=is_main,
         is_active_supervisor=is_active_supervisor,
@@ -52,8 +54,11 @@ def get_supervisions_report(
         supervisor_role_id=supervisor_role_id,
         supervisee_role_id=supervisee_role_id,
         cohort_number=cohort_number,
-        search_supervisor=search_supervisor
+        search_supervisor=search_supervisor,
+        page=page,
     )
+    set_next_cursor_header(response, results)
+    return results
 
 
 @router.get("/reports/supervisions/export/excel")
@@ -65,8 +70,9 @@ def export_supervisors_to_excel(
         supervisee_role_id: Optional[int] = Query(None),
         cohort_number: Optional[int] = Query(None),
         search_supervisor: Optional[str] = Query(None),
+        export_format: ExportFormat = Query(ExportFormat.XLSX, alias="format"),
 
-        db: Session = Depends(dependencies.get_db),
+        db: Session = Depends(dependencies.get_read_db),
         current_user=Depends(dependencies.get_current_user),
 ):
     """
@@ -75,8 +81,9 @@ def export_supervisors_to_excel(
     """
     logger.info(f"{current_user.username} exporting supervisors report to Excel")
 
-    # 1. Fetch Raw Data (Links)
-    links = crud.report_supervisions(
+    # 1. Fetch Unique Supervisors (aggregated and sorted by name in SQL)
+    # Each row: (supervisor PersonRole, is_main in ANY matching link)
+    supervisors = crud.report_supervisions(
         db,
         is_main=is_main,
         is_active_supervisor=is_active_supervisor,
@@ -84,30 +91,11 @@ def export_supervisors_to_excel(
         supervisor_role_id=supervisor_role_id,
         supervisee_role_id=supervisee_role_id,
         cohort_number=cohort_number,
-        search_supervisor=search_supervisor
+        search_supervisor=search_supervisor,
+        aggregate=True
     )
 
-    # 2. Aggregate Logic (Links -> Unique Supervisors)
-    # Map: supervisor_role_id -> { 'person_role': obj, 'is_main': bool }
-    unique_map = {}
-    for link in links:
-        sup_id = link.supervisor_role_id
-        if sup_id not in unique_map:
-            unique_map[sup_id] = {
-                "person_role": link.supervisor,
-                "is_main": link.is_main
-            }
-        else:
-            # Apply OR logic: if they are main in ANY link, they are main in the report
-            unique_map[sup_id]["is_main"] = unique_map[sup_id]["is_main"] or link.is_main
-
-    # Sort aggregated list by name (optional, but good for UX)
-    aggregated_list = sorted(
-        unique_map.values(),
-        key=lambda x: (x['person_role'].person.first_name, x['person_role'].person.last_name)
-    )
-
-    # 3. Build Filter Summary for Header
+    # 2. Build Filter Summary for Header
     filter_info = []
     if search_supervisor:
         filter_info.append(f"Search: {search_supervisor}")
@@ -135,10 +123,9 @@ def export_supervisors_to_excel(
         if role:
             filter_info.append(f"Supervisee Role: {role.role}")
 
-    # 4. Format Data for Excel
+    # 3. Format Data for Excel
     data_to_export = []
-    for item in aggregated_list:
-        pr = item['person_role']
+    for pr, sup_is_main in supervisors:
         person = pr.person
 
         raw_role = pr.role.role
@@ -146,7 +133,7 @@ def export_supervisors_to_excel(
         role_display = role_str.title()
 
         data_to_export.append({
-            "Main?": "Yes" if item['is_main'] else "No",
+            "Main?": "Yes" if sup_is_main else "No",
             "Role": role_display,
             "Name": f"{person.first_name} {person.last_name}",
             "Email": person.email,
@@ -156,25 +143,16 @@ def export_supervisors_to_excel(
 
     headers = ["Main?", "Role", "Name", "Email", "Start Date", "End Date"]
 
-    # 5. Generate and Return
-    excel_buffer = generate_excel_response(
+    # 4. Generate and Return
+    return export_response(
         data_to_export,
         headers,
         "Supervisors Report",
+        "supervisors_report",
+        export_format,
         filter_info=filter_info
     )
 
-    # filename = f"supervisors_report_{datetime.now().strftime('%Y%m%d')}.xlsx"
-    filename = f"supervisors_report.xlsx"
-
-    return StreamingResponse(
-        excel_buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
-    )
-
 
 @router.get("/reports/supervisions/export/emails")
 def export_supervisors_emails(
@@ -186,7 +164,7 @@ def export_supervisors_emails(
         cohort_number: Optional[int] = Query(None),
         search_supervisor: Optional[str] = Query(None),
 
-        db: Session = Depends(dependencies.get_db),
+        db: Session = Depends(dependencies.get_read_db),
         current_user=Depends(dependencies.get_current_user),
 ):
     """
@@ -194,8 +172,8 @@ def export_supervisors_emails(
     """
     logger.info(f"{current_user.username} fetching supervisors emails")
 
-    # 1. Fetch Raw Data
-    links = crud.report_supervisions(
+    # 1. Fetch Unique Supervisors (aggregated in SQL)
+    supervisors = crud.report_supervisions(
         db,
         is_main=is_main,
         is_active_supervisor=is_active_supervisor,
@@ -203,16 +181,11 @@ def export_supervisors_emails(
         supervisor_role_id=supervisor_role_id,
         supervisee_role_id=supervisee_role_id,
         cohort_number=cohort_number,
-        search_supervisor=search_supervisor
+        search_supervisor=search_supervisor,
+        aggregate=True
     )
 
-    # 2. Aggregate Unique Supervisors
-    unique_supervisors = {}
-    for link in links:
-        # We only need the ID to ensure uniqueness here
-        unique_supervisors[link.supervisor_role_id] = link.supervisor
-
-    # 3. Build Filter Summary (Same logic as above)
+    # 2. Build Filter Summary (Same logic as above)
     filter_info = []
     if search_supervisor: filter_info.append(f"Search: {search_supervisor}")
     if is_active_supervisor is not None: filter_info.append(
@@ -230,14 +203,14 @@ def export_supervisors_emails(
         role = db.query(models.Role).filter_by(id=supervisee_role_id).first()
         if role: filter_info.append(f"Supervisee Role: {role.role}")
 
-    # 4. Extract Emails
+    # 3. Extract Emails
     emails = [
         sup.person.email
-        for sup in unique_supervisors.values()
+        for sup, _ in supervisors
         if sup.person.email
     ]
 
-    # 5. Return JSON
+    # 4. Return JSON
     return {
         "count": len(emails),
         "filter_summary": filter_info,
@@ -256,6 +229,7 @@ def export_supervisors_emails(
     summary="Search and Filter Project Leaders for Reports"
 )
 def get_project_leaders_report(
+        response: Response,
         # Person Filters
         search: Optional[str] = Query(None, description="Search by person's first or last name"),
         is_active_person_role: Optional[bool] = Query(None, description="Filter by active status of the PersonRole"),
@@ -271,7 +245,8 @@ def get_project_leaders_report(
                                               description="Filter by Project Status (ongoing, awaiting_report, completed)"),
 
         # Dependencies
-        db: Session = Depends(dependencies.get_db),
+        page: PageParams = Depends(dependencies.get_page_params),
+        db: Session = Depends(dependencies.get_read_db),
         current_user=Depends(dependencies.get_current_user),
 ):
     """
@@ -281,7 +256,7 @@ def get_project_leaders_report(
     """
     logger.info(f"{current_user.username} accessing project leaders report")
 
-    return crud.report_project_leaders(
+    results = crud.report_project_leaders(
         db,
         search=search,
         is_active_person_role=is_active_person_role,
@@ -289,8 +264,11 @@ def get_project_leaders_report(
         is_pi_only=is_pi_only,
         is_contact_only=is_contact_only,
         call_type_id=call_type_id,
-        project_status=project_status
+        project_status=project_status,
+        page=page,
     )
+    set_next_cursor_header(response, results)
+    return results
 
 
 @router.get("/reports/project-leaders/export/excel")
@@ -302,8 +280,9 @@ def export_project_leaders_to_excel(
         is_contact_only: Optional[bool] = Query(None),
         call_type_id: Optional[int] = Query(None),
         project_status: Optional[str] = Query(None),
+        export_format: ExportFormat = Query(ExportFormat.XLSX, alias="format"),
 
-        db: Session = Depends(dependencies.get_db),
+        db: Session = Depends(dependencies.get_read_db),
         current_user=Depends(dependencies.get_current_user),
 ):
     """
@@ -312,8 +291,9 @@ def export_project_leaders_to_excel(
     """
     logger.info(f"{current_user.username} exporting project leaders report to Excel")
 
-    # 1. Fetch Raw Data
-    links = crud.report_project_leaders(
+    # 1. Fetch Unique People (aggregated and sorted by name in SQL)
+    # Each row: (PersonRole, PI in ANY matching project, Contact in ANY matching project)
+    leaders = crud.report_project_leaders(
         db,
         search=search,
         is_active_person_role=is_active_person_role,
@@ -321,32 +301,11 @@ def export_project_leaders_to_excel(
         is_pi_only=is_pi_only,
         is_contact_only=is_contact_only,
         call_type_id=call_type_id,
-        project_status=project_status
-    )
-
-    # 2. Aggregation Logic (Links -> Unique People)
-    # Map: person_role_id -> { 'person_role': obj, 'is_pi': bool, 'is_contact': bool }
-    unique_map = {}
-    for link in links:
-        pr_id = link.person_role_id
-        if pr_id not in unique_map:
-            unique_map[pr_id] = {
-                "person_role": link.person_role,
-                "is_pi": link.is_principal_investigator,
-                "is_contact": link.is_contact_person
-            }
-        else:
-            # Apply OR logic: if they are PI/Contact in ANY of the filtered projects, mark as Yes
-            unique_map[pr_id]["is_pi"] = unique_map[pr_id]["is_pi"] or link.is_principal_investigator
-            unique_map[pr_id]["is_contact"] = unique_map[pr_id]["is_contact"] or link.is_contact_person
-
-    # Sort aggregated list by name
-    aggregated_list = sorted(
-        unique_map.values(),
-        key=lambda x: (x['person_role'].person.first_name, x['person_role'].person.last_name)
+        project_status=project_status,
+        aggregate=True
     )
 
-    # 3. Build Filter Summary for Header
+    # 2. Build Filter Summary for Header
     filter_info = []
     if search: filter_info.append(f"Search: {search}")
 
@@ -371,10 +330,9 @@ def export_project_leaders_to_excel(
         status_display = project_status.replace('_', ' ').title()
         filter_info.append(f"Project Status: {status_display}")
 
-    # 4. Format Data for Excel
+    # 3. Format Data for Excel
     data_to_export = []
-    for item in aggregated_list:
-        pr = item['person_role']
+    for pr, is_pi, is_contact in leaders:
         person = pr.person
 
         # Handle Enum to String conversion
@@ -383,8 +341,8 @@ def export_project_leaders_to_excel(
         role_display = role_str.title()
 
         data_to_export.append({
-            "PI?": "Yes" if item['is_pi'] else "No",
-            "Contact Person?": "Yes" if item['is_contact'] else "No",
+            "PI?": "Yes" if is_pi else "No",
+            "Contact Person?": "Yes" if is_contact else "No",
             "Role": role_display,
             "Name": f"{person.first_name} {person.last_name}",
             "Email": person.email,
@@ -394,25 +352,16 @@ def export_project_leaders_to_excel(
 
     headers = ["PI?", "Contact Person?", "Role", "Name", "Email", "Start Date", "End Date"]
 
-    # 5. Generate and Return
-    excel_buffer = generate_excel_response(
+    # 4. Generate and Return
+    return export_response(
         data_to_export,
         headers,
         "Project Leaders Report",
+        "project_leaders_report",
+        export_format,
         filter_info=filter_info
     )
 
-    # filename = f"project_leaders_report_{datetime.now().strftime('%Y%m%d')}.xlsx"
-    filename = f"project_leaders_report.xlsx"
-
-    return StreamingResponse(
-        excel_buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
-    )
-
 
 @router.get("/reports/project-leaders/export/emails")
 def export_project_leaders_emails(
@@ -424,7 +373,7 @@ def export_project_leaders_emails(
         call_type_id: Optional[int] = Query(None),
         project_status: Optional[str] = Query(None),
 
-        db: Session = Depends(dependencies.get_db),
+        db: Session = Depends(dependencies.get_read_db),
         current_user=Depends(dependencies.get_current_user),
 ):
     """
@@ -432,8 +381,8 @@ def export_project_leaders_emails(
     """
     logger.info(f"{current_user.username} fetching project leaders emails")
 
-    # 1. Fetch Raw Data
-    links = crud.report_project_leaders(
+    # 1. Fetch Unique People (aggregated in SQL)
+    leaders = crud.report_project_leaders(
         db,
         search=search,
         is_active_person_role=is_active_person_role,
@@ -441,15 +390,11 @@ def export_project_leaders_emails(
         is_pi_only=is_pi_only,
         is_contact_only=is_contact_only,
         call_type_id=call_type_id,
-        project_status=project_status
+        project_status=project_status,
+        aggregate=True
     )
 
-    # 2. Aggregate Unique People (using ID as key to prevent duplicates)
-    unique_people = {}
-    for link in links:
-        unique_people[link.person_role_id] = link.person_role.person
-
-    # 3. Build Filter Summary (Reusing the same logic blocks as above for headers)
+    # 2. Build Filter Summary (Reusing the same logic blocks as above for headers)
     filter_info = []
     if search: filter_info.append(f"Search: {search}")
     if is_active_person_role is not None: filter_info.append(
@@ -466,12 +411,12 @@ def export_project_leaders_emails(
         status_display = project_status.replace('_', ' ').title()
         filter_info.append(f"Project Status: {status_display}")
 
-    # 4. Extract Emails
+    # 3. Extract Emails
     emails = [
-        p.email for p in unique_people.values() if p.email
+        pr.person.email for pr, _, _ in leaders if pr.person.email
     ]
 
-    # 5. Return JSON
+    # 4. Return JSON
     return {
         "count": len(emails),
         "filter_summary": filter_info,
@@ -490,10 +435,12 @@ def export_project_leaders_emails(
     summary="Search and Filter Semester Abroad Activities"
 )
 def get_semester_abroad_report(
+        response: Response,
         is_active_student: Optional[bool] = Query(None, description="Filter by active status of the PhD Student"),
         activity_status: Optional[str] = Query(None, description="Filter by Activity Status (ongoing, completed)"),
 
-        db: Session = Depends(dependencies.get_db),
+        page: PageParams = Depends(dependencies.get_page_params),
+        db: Session = Depends(dependencies.get_read_db),
         current_user=Depends(dependencies.get_current_user),
 ):
     """
@@ -502,19 +449,23 @@ def get_semester_abroad_report(
     """
     logger.info(f"{current_user.username} accessing semester abroad report")
 
-    return crud.report_semester_abroad(
+    results = crud.report_semester_abroad(
         db,
         is_active_student=is_active_student,
-        activity_status=activity_status
+        activity_status=activity_status,
+        page=page,
     )
+    set_next_cursor_header(response, results)
+    return results
 
 
 @router.get("/reports/semester-abroad-data/export/excel")
 def export_semester_abroad_to_excel(
         is_active_student: Optional[bool] = Query(None),
         activity_status: Optional[str] = Query(None),
+        export_format: ExportFormat = Query(ExportFormat.XLSX, alias="format"),
 
-        db: Session = Depends(dependencies.get_db),
+        db: Session = Depends(dependencies.get_read_db),
         current_user=Depends(dependencies.get_current_user),
 ):
     """
@@ -526,7 +477,9 @@ def export_semester_abroad_to_excel(
     activities = crud.report_semester_abroad(
         db,
         is_active_student=is_active_student,
-        activity_status=activity_status
+        activity_status=activity_status,
+        load_plan=crud.SEMESTER_ABROAD_EXPORT_PLAN,
+        yield_per=crud.EXPORT_BATCH_SIZE
     )
 
     # 2. Build Filter Summary
@@ -538,44 +491,37 @@ def export_semester_abroad_to_excel(
         # Prettify string (e.g. 'ongoing' -> 'Ongoing')
         filter_info.append(f"Activity Status: {activity_status.title()}")
 
-    # 3. Format Data
-    data_to_export = []
-    for act in activities:
-        # Navigate relationships: Activity -> Student -> PersonRole -> Person
-        student = act.student
-        person = student.person_role.person
+    # 3. Format Data (rows are built as the file streams)
+    def rows():
+        for act in activities:
+            # Navigate relationships: Activity -> Student -> PersonRole -> Person
+            student = act.student
+            person = student.person_role.person
+
+            yield {
+                "Host Institution": act.host_institution or "",
+                "City": act.city or "",
+                "Country": act.country or "",
+                "Description": act.description or "",
+                "PhD Student": f"{person.first_name} {person.last_name}",
+                "Email": person.email,
+                "Start Date": act.start_date.strftime("%Y-%m-%d") if act.start_date else "",
+                "End Date": act.end_date.strftime("%Y-%m-%d") if act.end_date else ""
+            }
 
-        data_to_export.append({
-            "Host Institution": act.host_institution or "",
-            "City": act.city or "",
-            "Country": act.country or "",
-            "Description": act.description or "",
-            "PhD Student": f"{person.first_name} {person.last_name}",
-            "Email": person.email,
-            "Start Date": act.start_date.strftime("%Y-%m-%d") if act.start_date else "",
-            "End Date": act.end_date.strftime("%Y-%m-%d") if act.end_date else ""
-        })
+    data_to_export = rows()
 
     headers = ["Host Institution", "City", "Country", "Description", "PhD Student", "Email", "Start Date", "End Date"]
 
     # 4. Generate and Return
-    excel_buffer = generate_excel_response(
+    return export_response(
         data_to_export,
         headers,
         "Semester Abroad Report",
+        "semester_abroad_report",
+        export_format,
         filter_info=filter_info
     )
 
-    # filename = f"semester_abroad_report_{datetime.now().strftime('%Y%m%d')}.xlsx"
-    filename = f"semester_abroad_report.xlsx"
-
-    return StreamingResponse(
-        excel_buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
-    )
-
 
 # </editor-fold>
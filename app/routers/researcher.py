@@ -2,12 +2,12 @@ import logging
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Response, Query
-from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas, dependencies
+from ..pagination import PageParams, set_next_cursor_header
 from ..crud import EntityNotFoundError
-from ..excel_utils import generate_excel_response
+from ..export_utils import ExportFormat, export_response
 
 router = APIRouter(tags=["researchers"])
 logger = logging.getLogger(__name__)
@@ -34,7 +34,7 @@ def read_researcher_title(
 def list_researcher_titles(
     search: Optional[str] = Query(None, description="Substring search on title"),
     current_user=Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
 ):
     logger.info(f"{current_user.username} listed researcher titles")
     return crud.list_researcher_titles(db, search=search)
@@ -108,6 +108,7 @@ def read_researcher(
 
 @router.get("/researchers/", response_model=List[schemas.ResearcherRead])
 def list_researchers(
+    response: Response,
     person_role_id:   Optional[int] = Query(None, ge=1, description="Filter by person_role_id"),
     is_active:        Optional[bool] = Query(None, description="Only active/inactive roles"),
     title_id:         Optional[int] = Query(None, ge=1, description="Filter by researcher title"),
@@ -115,15 +116,16 @@ def list_researchers(
     field_id:         Optional[int] = Query(None, ge=1, description="Filter by academic field"),
     branch_id:        Optional[int] = Query(None, ge=1, description="Filter by academic branch"),
     search:           Optional[str] = Query(None, description="Substring search on person name"),
+    page: PageParams = Depends(dependencies.get_page_params),
     current_user=Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
 ):
     logger.info(
         f"{current_user.username} listed researchers "
         f"(person_role_id={person_role_id}, is_active={is_active}, title_id={title_id}, "
         f"institution_id={institution_id}, field_id={field_id}, branch_id={branch_id}, search={search!r})"
     )
-    return crud.list_researchers(
+    results = crud.list_researchers(
         db,
         person_role_id=person_role_id,
         is_active=is_active,
@@ -132,7 +134,10 @@ def list_researchers(
         field_id=field_id,
         branch_id=branch_id,
         search=search,
+        page=page,
     )
+    set_next_cursor_header(response, results)
+    return results
 
 
 @router.post("/researchers/", response_model=schemas.ResearcherRead)
@@ -192,8 +197,9 @@ def export_researchers_to_excel(
     field_id:         Optional[int] = Query(None, ge=1),
     branch_id:        Optional[int] = Query(None, ge=1),
     search:           Optional[str] = Query(None),
+    export_format: ExportFormat = Query(ExportFormat.XLSX, alias="format"),
     current_user=Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
 ):
     """
     Export a list of researchers to an Excel file, applying the same
@@ -211,6 +217,8 @@ def export_researchers_to_excel(
         field_id=field_id,
         branch_id=branch_id,
         search=search,
+        load_plan=crud.RESEARCHER_EXPORT_PLAN,
+        yield_per=crud.EXPORT_BATCH_SIZE,
     )
 
     # --- 2. BUILD THE FILTER INFO LIST ---
@@ -237,8 +245,8 @@ def export_researchers_to_excel(
         if field:
             filter_info.append(f"Field: {field.field}")
 
-    # 3. Prepare the data in the desired format
-    data_to_export = [
+    # 3. Prepare the data in the desired format (rows are built as the file streams)
+    data_to_export = (
         {
             "Title": r.title.title if r.title else "",
             "Name": f"{r.person_role.person.first_name} {r.person_role.person.last_name}",
@@ -246,24 +254,17 @@ def export_researchers_to_excel(
             "Start Date": r.person_role.start_date.strftime("%Y-%m-%d") if r.person_role.start_date else "",
             "End Date": r.person_role.end_date.strftime("%Y-%m-%d") if r.person_role.end_date else ""
         } for r in researchers
-    ]
+    )
     headers = ["Title", "Name", "Email", "Start Date", "End Date"]
 
     # --- 4. PASS THE FILTERS TO THE GENERATOR ---
-    excel_buffer = generate_excel_response(
+    return export_response(
         data_to_export,
         headers,
         "Researchers",
-        filter_info=filter_info  # Pass the list here
-    )
-
-    # 5. Return the file as a downloadable response
-    return StreamingResponse(
-        excel_buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": "attachment; filename=researchers.xlsx"
-        }
+        "researchers",
+        export_format,
+        filter_info=filter_info
     )
 
 
@@ -277,7 +278,7 @@ def export_researcher_emails(
     branch_id:        Optional[int] = Query(None, ge=1),
     search:           Optional[str] = Query(None),
     current_user=Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
 ):
     """
     Generate a JSON list of emails and filter metadata for Researchers.
@@ -294,6 +295,7 @@ def export_researcher_emails(
         field_id=field_id,
         branch_id=branch_id,
         search=search,
+        load_plan=crud.RESEARCHER_EXPORT_PLAN,
     )
 
     # 2. Build filter summary
@@ -0,0 +1,24 @@
+import logging
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from .. import crud, schemas, dependencies
+
+router = APIRouter(tags=["search"])
+logger = logging.getLogger(__name__)
+
+
+# <editor-fold desc="Search endpoints">
+
+@router.get("/search/", response_model=schemas.SearchResultsRead)
+def search_registry(
+    q:     str = Query(..., min_length=1, description="Substring to look for in names, emails and titles"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum hits per entity type"),
+    current_user=Depends(dependencies.get_current_user),
+    db: Session = Depends(dependencies.get_read_db),
+):
+    logger.info(f"{current_user.username} searched the registry (q={q!r}, limit={limit})")
+    return crud.search_registry(db, q, limit=limit)
+
+
+# </editor-fold>
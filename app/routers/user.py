@@ -51,7 +51,7 @@ async def list_users(
     is_admin: Optional[bool] = Query(None, description="Filter by admin status"),
     search:   Optional[str] = Query(None, description="Substring search on username, name, or email"),
     current_user: schemas.UserRead = Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db)
+    db: Session = Depends(dependencies.get_read_db)
 ):
     if not current_user.is_admin:
         logger.warning(f"Unauthorized list_users attempt by {current_user.username}")
@@ -227,6 +227,10 @@ class CourseRead(CourseBase):
     grad_school_activity: Optional[GradSchoolActivityRead] = None
 
     student_count: int = 0
+    teacher_count: int = 0
+    institution_count: int = 0
+    # filled in by the list views (None when not computed)
+    has_decision_letter: Optional[bool] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -307,6 +311,11 @@ class ProjectRead(ProjectBase):
 
     # Represents the number of linked Academic Fields
     field_count: int = 0
+    # Number of linked people (distinct person roles), and how many are PIs
+    member_count: int = 0
+    pi_count: int = 0
+    # filled in by the list views (None when not computed)
+    has_decision_letter: Optional[bool] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -460,6 +469,9 @@ class ResearcherRead(ResearcherBase):
     title:          Optional[ResearcherTitleRead]
     original_title: Optional[ResearcherTitleRead]
 
+    # filled in by the list views (None when not computed)
+    has_decision_letter: Optional[bool] = None
+
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -499,6 +511,9 @@ class PhDStudentRead(PhDStudentBase):
     id:          int
     person_role: PersonRoleReadFull
 
+    # filled in by the list views (None when not computed)
+    has_decision_letter: Optional[bool] = None
+
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -550,6 +565,9 @@ class PostdocRead(PostdocBase):
     current_title: Optional[ResearcherTitleRead]
     current_institution: Optional[InstitutionRead]
 
+    # filled in by the list views (None when not computed)
+    has_decision_letter: Optional[bool] = None
+
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -679,6 +697,13 @@ class CourseStudentRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CourseStudentBulk(BaseModel):
+    add:    List[CourseStudentLink] = []
+    # only the fields sent for each student are changed
+    update: List[CourseStudentLink] = []
+    remove: List[int] = []  # phd_student_ids
+
+
 # </editor-fold>
 
 # <editor-fold desc="Project relationships entities">
@@ -768,3 +793,69 @@ class SupervisionUpdate(BaseModel):
 
 
 # </editor-fold>
+
+# <editor-fold desc="Search-related entities">
+# ---------- Search ----------
+
+class SearchResultsRead(BaseModel):
+    people:   List[PersonRead]
+    projects: List[ProjectRead]
+    courses:  List[CourseRead]
+
+
+# </editor-fold>
+
+# <editor-fold desc="Import-related entities">
+# ---------- Import ----------
+
+class ImportRowError(BaseModel):
+    row:    int  # line in the file, the header being line 1
+    errors: List[str]
+
+
+class ImportReport(BaseModel):
+    dry_run: bool
+    rows:    int
+    created: int
+    errors:  List[ImportRowError]
+
+
+# </editor-fold>
+
+# <editor-fold desc="Export job-related entities">
+# ---------- Export Job ----------
+
+class ExportJobRead(BaseModel):
+    id:            str
+    export:        str
+    status:        str
+    rows_written:  int
+    bytes_written: int
+    cached:        bool
+    error:         Optional[str] = None
+    filename:      Optional[str] = None
+    created_at:    datetime
+    finished_at:   Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# </editor-fold>
+
+# <editor-fold desc="Monitoring-related entities">
+# ---------- Slow Query ----------
+
+class SlowQueryRead(BaseModel):
+    statement:  str
+    calls:      int
+    total_ms:   float
+    max_ms:     float
+    parameters: Optional[str] = None
+    origin:     Optional[str] = None
+    plan:       List[str]
+    last_seen:  Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# </editor-fold>
@@ -0,0 +1,125 @@
+import unicodedata
+
+from sqlalchemy import DDL, event, select, table, column, literal_column, case, or_
+
+from .database import Base
+
+# SQLite FTS5 indexes behind the `search=` filters.
+#
+# Searched text is stored a second time as a normalized "search key"
+# (casefolded, accents stripped: "Öström" -> "ostrom") in a `<column>_key`
+# column, maintained by the models on write. Each index is an external-content
+# FTS5 table over those key columns, kept in sync with its source table by
+# triggers. The trigram tokenizer indexes every 3-character substring, so a
+# MATCH on a normalized, quoted term answers "contains this substring, ignoring
+# case and accents" through the index.
+
+MIN_TERM_LENGTH = 3  # the trigram index cannot answer shorter terms
+
+FTS_INDEXES = {
+    # fts table: (source table, indexed columns)
+    "people_fts": ("people", ("first_name_key", "last_name_key", "email_key")),
+    "projects_fts": ("projects", ("title_key", "project_number")),
+    "courses_fts": ("courses", ("title_key",)),
+    "institutions_fts": ("institutions", ("institution_key",)),
+}
+
+# letters that NFKD does not decompose into base letter + accent
+_FOLDED_LETTERS = str.maketrans({
+    "ø": "o", "æ": "ae", "œ": "oe", "đ": "d", "ð": "d", "ł": "l", "þ": "th", "ı": "i",
+})
+
+
+def search_key(value):
+    """Casefolded, accent-stripped form of `value` used for searching."""
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return stripped.translate(_FOLDED_LETTERS)
+
+
+def create_statements(fts_table: str, source: str, columns) -> list[str]:
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"{cols}, content='{source}', content_rowid='id', tokenize='trigram')",
+
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source} BEGIN "
+        f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {cols} ON {source} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+
+        # index whatever rows the source table already holds
+        f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')",
+    ]
+
+
+def drop_statements(fts_table: str) -> list[str]:
+    return [
+        f"DROP TRIGGER IF EXISTS {fts_table}_ai",
+        f"DROP TRIGGER IF EXISTS {fts_table}_ad",
+        f"DROP TRIGGER IF EXISTS {fts_table}_au",
+        f"DROP TABLE IF EXISTS {fts_table}",
+    ]
+
+
+# metadata.create_all()/drop_all() (debug mode, tests) manage the FTS tables
+# too; migrated databases get them from the Alembic revision.
+for _fts_table, (_source, _columns) in FTS_INDEXES.items():
+    for _statement in create_statements(_fts_table, _source, _columns):
+        event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    for _statement in drop_statements(_fts_table):
+        event.listen(Base.metadata, "before_drop", DDL(_statement).execute_if(dialect="sqlite"))
+
+
+def match_query(term: str, columns=None) -> str:
+    """An FTS5 query matching `term` as a literal substring of any of `columns`."""
+    phrase = '"' + term.replace('"', '""') + '"'
+    if columns:
+        return "{" + " ".join(columns) + "} : " + phrase
+    return phrase
+
+
+def fts_rowids(fts_table: str, term: str, columns=None):
+    """SELECT of the source-table ids whose `columns` contain `term`."""
+    fts = table(fts_table, column("rowid"))
+    return select(fts.c.rowid).where(literal_column(fts_table).op("MATCH")(match_query(term, columns)))
+
+
+def contains_filter(model, fts_table: str, term: str, columns):
+    """
+    Substring filter for `term` on the key `columns` of `model` (a mapped class
+    or alias): its id must be among the FTS hits. Terms too short for the
+    trigram index are matched with LIKE on the same key columns.
+    """
+    key = search_key(term)
+    if len(key) < MIN_TERM_LENGTH:
+        return or_(*(getattr(model, c).contains(key, autoescape=True) for c in columns))
+    return model.id.in_(fts_rowids(fts_table, key, columns))
+
+
+def ranked_matches(q, model, fts_table: str, columns, term: str):
+    """
+    Restrict `q` (a query over `model`) to rows whose key `columns` contain
+    `term`, best matches first: values starting with the term, then FTS5's
+    bm25 rank.
+    """
+    term = search_key(term)
+    starts_with = or_(*(getattr(model, c).startswith(term, autoescape=True) for c in columns))
+    if len(term) < MIN_TERM_LENGTH:
+        # too short for the trigram index: fall back to prefix matches only
+        return q.filter(starts_with).order_by(model.id)
+    fts = table(fts_table, column("rowid"), column("rank"))
+    return (
+        q.join(fts, fts.c.rowid == model.id)
+        .filter(literal_column(fts_table).op("MATCH")(match_query(term, columns)))
+        .order_by(case((starts_with, 0), else_=1), fts.c.rank)
+    )
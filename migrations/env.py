@@ -33,6 +33,15 @@ if config.config_file_name is not None:
 # target_metadata = None
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names):
+    """Keep autogenerate away from the FTS5 search tables (and their shadow tables),
+    which are managed by hand-written revisions."""
+    if type_ == "table" and name and "_fts" in name:
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -59,6 +68,7 @@ def run_migrations_offline() -> None:
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
         render_as_batch=True,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -83,7 +93,8 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
-            render_as_batch=True
+            render_as_batch=True,
+            include_name=include_name
         )
 
         with context.begin_transaction():
@@ -0,0 +1,138 @@
+"""add normalized search key columns
+
+Casefolded, accent-stripped copies of the searched columns; the FTS5 indexes
+are rebuilt over them.
+
+Revision ID: a6c26cba2e44
+Revises: e7363665be54
+Create Date: 2026-10-17 03:17:48.804191
+
+"""
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c26cba2e44'
+down_revision: Union[str, None] = 'e7363665be54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# fts table: (source table, indexed columns) before and after this revision
+OLD_FTS_INDEXES = {
+    "people_fts": ("people", ("first_name", "last_name", "email")),
+    "projects_fts": ("projects", ("title", "project_number")),
+    "courses_fts": ("courses", ("title",)),
+}
+NEW_FTS_INDEXES = {
+    "people_fts": ("people", ("first_name_key", "last_name_key", "email_key")),
+    "projects_fts": ("projects", ("title_key", "project_number")),
+    "courses_fts": ("courses", ("title_key",)),
+    "institutions_fts": ("institutions", ("institution_key",)),
+}
+
+# table: {key column: source column}
+SEARCH_KEYS = {
+    "people": {"first_name_key": "first_name", "last_name_key": "last_name", "email_key": "email"},
+    "projects": {"title_key": "title"},
+    "courses": {"title_key": "title"},
+    "institutions": {"institution_key": "institution"},
+}
+
+
+# The normalization and the FTS DDL as of this revision, copied from
+# app/search.py: the revision must keep doing the same whatever the app does later.
+
+# letters that NFKD does not decompose into base letter + accent
+_FOLDED_LETTERS = str.maketrans({
+    "ø": "o", "æ": "ae", "œ": "oe", "đ": "d", "ð": "d", "ł": "l", "þ": "th", "ı": "i",
+})
+
+
+def search_key(value):
+    """Casefolded, accent-stripped form of `value` used for searching."""
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return stripped.translate(_FOLDED_LETTERS)
+
+
+def _drop_fts(indexes):
+    for fts_table in indexes:
+        op.execute(f"DROP TRIGGER IF EXISTS {fts_table}_ai")
+        op.execute(f"DROP TRIGGER IF EXISTS {fts_table}_ad")
+        op.execute(f"DROP TRIGGER IF EXISTS {fts_table}_au")
+        op.execute(f"DROP TABLE IF EXISTS {fts_table}")
+
+
+def _create_fts(indexes):
+    for fts_table, (source, columns) in indexes.items():
+        cols = ", ".join(columns)
+        new_values = ", ".join(f"new.{c}" for c in columns)
+        old_values = ", ".join(f"old.{c}" for c in columns)
+
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+            f"{cols}, content='{source}', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {source} BEGIN "
+            f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {source} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts_table}_au AFTER UPDATE OF {cols} ON {source} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+        )
+        # index the existing rows
+        op.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the batch table rebuilds below would drop the FTS triggers anyway
+    _drop_fts(OLD_FTS_INDEXES)
+    conn = op.get_bind()
+
+    for table_name, keys in SEARCH_KEYS.items():
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for key_column in keys:
+                batch_op.add_column(sa.Column(key_column, sa.String(), nullable=True))
+
+        # backfill with the same normalization the models apply on write
+        sources = list(keys.values())
+        rows = conn.execute(sa.text(f"SELECT id, {', '.join(sources)} FROM {table_name}")).fetchall()
+        assignments = ", ".join(f"{key_column} = :{key_column}" for key_column in keys)
+        for row in rows:
+            values = {key_column: search_key(value) for key_column, value in zip(keys, row[1:])}
+            conn.execute(sa.text(f"UPDATE {table_name} SET {assignments} WHERE id = :id"),
+                         {"id": row[0], **values})
+
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for key_column in keys:
+                batch_op.alter_column(key_column, existing_type=sa.String(), nullable=False)
+                batch_op.create_index(batch_op.f(f"ix_{table_name}_{key_column}"), [key_column], unique=False)
+
+    _create_fts(NEW_FTS_INDEXES)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _drop_fts(NEW_FTS_INDEXES)
+
+    for table_name, keys in SEARCH_KEYS.items():
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for key_column in keys:
+                batch_op.drop_index(batch_op.f(f"ix_{table_name}_{key_column}"))
+                batch_op.drop_column(key_column)
+
+    _create_fts(OLD_FTS_INDEXES)
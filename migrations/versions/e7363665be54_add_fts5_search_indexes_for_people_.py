@@ -0,0 +1,62 @@
+"""add fts5 search indexes for people, projects and courses
+
+Revision ID: e7363665be54
+Revises: 3276562fdf0c
+Create Date: 2026-10-17 03:15:07.726085
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7363665be54'
+down_revision: Union[str, None] = '3276562fdf0c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# fts table: (source table, indexed columns) -- external-content, trigram tokenizer
+FTS_INDEXES = {
+    "people_fts": ("people", ("first_name", "last_name", "email")),
+    "projects_fts": ("projects", ("title", "project_number")),
+    "courses_fts": ("courses", ("title",)),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for fts_table, (source, columns) in FTS_INDEXES.items():
+        cols = ", ".join(columns)
+        new_values = ", ".join(f"new.{c}" for c in columns)
+        old_values = ", ".join(f"old.{c}" for c in columns)
+
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+            f"{cols}, content='{source}', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {source} BEGIN "
+            f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {source} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts_table}_au AFTER UPDATE OF {cols} ON {source} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+        )
+        # index the existing rows
+        op.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for fts_table in FTS_INDEXES:
+        op.execute(f"DROP TRIGGER IF EXISTS {fts_table}_ai")
+        op.execute(f"DROP TRIGGER IF EXISTS {fts_table}_ad")
+        op.execute(f"DROP TRIGGER IF EXISTS {fts_table}_au")
+        op.execute(f"DROP TABLE IF EXISTS {fts_table}")
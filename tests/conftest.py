@@ -0,0 +1,122 @@
+import os
+
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+import pytest
+
+from app import logger
+from app.dependencies import get_db, get_read_db
+from app.database import Base
+from app.main import app, seed_roles
+from app.query_stats import track_queries
+
+# Shared database fixtures.
+#
+# The schema is created once per test session; every test then runs inside a
+# transaction on one connection that is rolled back afterwards. Sessions join
+# it through a SAVEPOINT, so the app's own commits and rollbacks only ever
+# touch the test's savepoint and nothing leaks into the next test.
+#
+# The database lives in memory, one per process: with pytest-xdist
+# (`pytest -n auto`) every worker gets its own.
+
+
+@pytest.fixture(scope="session", autouse=True)
+def log_files(tmp_path_factory):
+    """Write the app log and the slow-query log to a temp dir instead of logs/."""
+    directory = tmp_path_factory.mktemp("logs")
+    for log_handler in (logger.handler, logger.slow_query_handler):
+        with log_handler.lock:  # the listener thread may be writing
+            if log_handler.stream:
+                log_handler.stream.close()
+                log_handler.stream = None
+            log_handler.baseFilename = str(directory / os.path.basename(log_handler.baseFilename))
+    return directory
+
+
+@pytest.fixture(scope="session")
+def test_engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    # pysqlite begins transactions (and so SAVEPOINTs) on its own terms;
+    # turn that off and emit BEGIN ourselves
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_conn, connection_record):
+        dbapi_conn.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    track_queries(engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def connection(test_engine):
+    """The test's connection; everything done on it is rolled back at the end."""
+    with test_engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            yield conn
+        finally:
+            transaction.rollback()
+
+
+@pytest.fixture
+def session_factory(connection):
+    """Makes sessions that commit to a SAVEPOINT of the test's transaction."""
+    return sessionmaker(
+        bind=connection,
+        autocommit=False,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def roles(db):
+    """The role rows the app seeds at startup."""
+    seed_roles(db)
+
+
+@pytest.fixture
+def client(session_factory):
+    """A TestClient whose requests, reads included, use the test's transaction."""
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    # reads share the request's session: two sessions would nest SAVEPOINTs on
+    # the one connection and release them out of order
+    def override_get_read_db(db: Session = Depends(get_db)):
+        return db
+
+    # put back any overrides installed before, e.g. by a module-scoped registry
+    previous = {dep: app.dependency_overrides.get(dep) for dep in (get_db, get_read_db)}
+    app.dependency_overrides.update({get_db: override_get_db, get_read_db: override_get_read_db})
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.update(previous)
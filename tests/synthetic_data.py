@@ -0,0 +1,205 @@
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.main import seed_roles
+from app.search import search_key
+
+# Deterministic synthetic registry data for the benchmarks.
+#
+# populate() fills every table with a registry of BASE_COUNTS × `scale`
+# entities (lookup tables stay small) and their links: supervisions, course
+# enrolments and teachers, project members and fields, grad school and abroad
+# activities, decision letters. The same scale and seed always produce the
+# same rows. Rows are inserted in bulk with explicit ids; the FTS triggers
+# index them as usual.
+
+BASE_COUNTS = {
+    "institutions": 20,
+    "researchers": 150,
+    "phd_students": 300,
+    "postdocs": 60,
+    "projects": 80,
+    "courses": 60,
+    "grad_school_activities": 30,
+}
+
+FIRST_NAMES = ["Anna", "Björn", "Cecilia", "David", "Elin", "Fredrik", "Greta", "Hugo", "Ingrid", "Johan",
+               "Karin", "Lars", "Maja", "Nils", "Olivia", "Per", "Rut", "Sven", "Tove", "Ulf", "Åsa", "Örjan"]
+LAST_NAMES = ["Andersson", "Berg", "Carlsson", "Dahl", "Ek", "Forsberg", "Gustafsson", "Holm", "Isaksson",
+              "Johansson", "Karlsson", "Lindqvist", "Magnusson", "Nyström", "Olsson", "Persson", "Öström"]
+WORDS = ["ethics", "automation", "language", "trust", "work", "learning", "society", "law", "media", "care",
+         "democracy", "education", "health", "markets", "culture", "history", "robots", "data", "public", "risk"]
+
+TITLES = ["Professor", "Associate Professor", "Assistant Professor", "Senior Lecturer", "Researcher", "Other"]
+BRANCHES = {
+    "Humanities": ["Philosophy", "History", "Linguistics", "Art History", "Religious Studies"],
+    "Social Sciences": ["Economics", "Sociology", "Political Science", "Psychology", "Law"],
+    "Technology": ["Computer Science", "Robotics", "Human-Computer Interaction", "Data Science", "Design"],
+    "Medicine": ["Public Health", "Nursing", "Medical Ethics", "Epidemiology", "Neuroscience"],
+}
+CALL_TYPES = ["Research project", "Industrial PhD", "Expedition", "Infrastructure"]
+ACTIVITY_TYPES = ["Summer school", "Workshop", "Conference", "Study visit"]
+COUNTRIES = ["USA", "UK", "Germany", "Japan", "Canada", "France", "Netherlands", "Australia"]
+
+START = datetime(2018, 1, 1)
+
+
+def _date(rng: random.Random, years: float = 6) -> datetime:
+    return START + timedelta(days=rng.randrange(int(365 * years)))
+
+
+def _title(rng: random.Random, words: int = 4) -> str:
+    return " ".join(rng.sample(WORDS, words)).capitalize()
+
+
+def populate(db: Session, scale: float = 1, seed: int = 0) -> Dict[str, int]:
+    """
+    Fill an empty database with a synthetic registry; returns the number of
+    rows written per table.
+    """
+    rng = random.Random(seed)
+    counts = {name: max(1, round(n * scale)) for name, n in BASE_COUNTS.items()}
+    rows: Dict[type, List[dict]] = {}
+
+    def add(model, **values) -> int:
+        table_rows = rows.setdefault(model, [])
+        values.setdefault("id", len(table_rows) + 1)
+        table_rows.append(values)
+        return values["id"]
+
+    seed_roles(db)
+    role_ids = {r.role: r.id for r in db.query(models.Role)}
+
+    # --- lookup tables ---
+    title_ids = [add(models.ResearcherTitle, title=t) for t in TITLES]
+    field_ids = []
+    for branch, fields in BRANCHES.items():
+        branch_id = add(models.AcademicBranch, branch=branch)
+        field_ids += [add(models.AcademicField, field=f, branch_id=branch_id) for f in fields]
+    call_type_ids = [add(models.ProjectCallType, type=t) for t in CALL_TYPES]
+    activity_type_ids = [add(models.GradSchoolActivityType, type=t) for t in ACTIVITY_TYPES]
+    term_ids = [add(models.CourseTerm, season=season, year=year, is_active=year >= 2024)
+                for year in range(2021, 2026) for season in (models.Season.SPRING, models.Season.FALL)]
+    institution_ids = []
+    for i in range(counts["institutions"]):
+        name = f"{rng.choice(['Royal', 'National', 'City', 'Northern'])} University of {rng.choice(WORDS).title()} {i}"
+        institution_ids.append(add(models.Institution, institution=name, institution_key=search_key(name)))
+
+    # --- people ---
+    def person_role(role: models.RoleType) -> int:
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        person_id = len(rows.get(models.Person, [])) + 1
+        email = f"{search_key(first)}.{search_key(last)}.{person_id}@example.org"
+        add(models.Person, first_name=first, last_name=last, email=email, first_name_key=search_key(first),
+            last_name_key=search_key(last), email_key=email)
+        start = _date(rng)
+        end = start + timedelta(days=rng.randrange(365, 365 * 5)) if rng.random() < 0.3 else None
+        pr_id = add(models.PersonRole, person_id=person_id, role_id=role_ids[role], start_date=start, end_date=end)
+        for institution_id in rng.sample(institution_ids, min(len(institution_ids), rng.choice([1, 1, 2]))):
+            add(models.PersonInstitution, person_role_id=pr_id, institution_id=institution_id, start_date=start,
+                end_date=end)
+        for field_id in rng.sample(field_ids, rng.choice([1, 2])):
+            add(models.PersonField, person_role_id=pr_id, field_id=field_id)
+        if rng.random() < 0.3:
+            add(models.DecisionLetter, entity_type=models.EntityType.PERSON_ROLE, entity_id=pr_id,
+                link=f"https://example.org/letters/person-role/{pr_id}")
+        return pr_id
+
+    researcher_roles = []
+    for _ in range(counts["researchers"]):
+        pr_id = person_role(models.RoleType.RESEARCHER)
+        researcher_roles.append(pr_id)
+        add(models.Researcher, person_role_id=pr_id, title_id=rng.choice(title_ids),
+            original_title_id=rng.choice(title_ids) if rng.random() < 0.2 else None)
+
+    student_roles, student_ids = [], []
+    for _ in range(counts["phd_students"]):
+        pr_id = person_role(models.RoleType.PHD_STUDENT)
+        student_roles.append(pr_id)
+        student_ids.append(add(
+            models.PhDStudent, person_role_id=pr_id, cohort_number=rng.randint(1, 8),
+            is_affiliated=rng.random() < 0.3, department=f"Department of {rng.choice(WORDS).title()}",
+            discipline=rng.choice(list(BRANCHES)), phd_project_title=_title(rng), is_graduated=rng.random() < 0.2,
+        ))
+        supervisors = rng.sample(researcher_roles, min(len(researcher_roles), rng.choice([1, 2, 2, 3])))
+        for n, supervisor in enumerate(supervisors):
+            add(models.SupervisorPhDStudent, supervisor_role_id=supervisor, student_role_id=pr_id, is_main=n == 0)
+
+    postdoc_roles = []
+    for _ in range(counts["postdocs"]):
+        pr_id = person_role(models.RoleType.POSTDOC)
+        postdoc_roles.append(pr_id)
+        add(models.Postdoc, person_role_id=pr_id, cohort_number=rng.randint(1, 5),
+            postdoc_project_title=_title(rng), is_incoming=rng.random() < 0.5, is_graduated=rng.random() < 0.2,
+            current_title_id=rng.choice(title_ids), current_institution_id=rng.choice(institution_ids))
+
+    # --- projects ---
+    for i in range(counts["projects"]):
+        start = _date(rng)
+        title = _title(rng)
+        project_id = add(models.Project, call_type_id=rng.choice(call_type_ids), title=title,
+                         title_key=search_key(title), project_number=f"P{2018 + i % 7}-{i:05d}",
+                         final_report_submitted=rng.random() < 0.3, is_extended=rng.random() < 0.1,
+                         start_date=start, end_date=start + timedelta(days=365 * rng.randint(2, 5)))
+        members = rng.sample(researcher_roles, min(len(researcher_roles), rng.randint(1, 3)))
+        members += rng.sample(student_roles + postdoc_roles, rng.randint(1, 3))
+        for n, pr_id in enumerate(members):
+            add(models.PersonProject, person_role_id=pr_id, project_id=project_id,
+                is_principal_investigator=n == 0, is_contact_person=n == 0 or rng.random() < 0.1,
+                is_active=rng.random() < 0.9)
+        for field_id in rng.sample(field_ids, 2):
+            add(models.ProjectField, project_id=project_id, field_id=field_id)
+        add(models.ResearchOutputReport, project_id=project_id, link=f"https://example.org/reports/{project_id}")
+        add(models.DecisionLetter, entity_type=models.EntityType.PROJECT, entity_id=project_id,
+            link=f"https://example.org/letters/project/{project_id}")
+
+    # --- grad school activities and courses ---
+    activity_ids = [
+        add(models.GradSchoolActivity, activity_type_id=rng.choice(activity_type_ids),
+            description=_title(rng, 3), year=rng.randint(2021, 2025))
+        for _ in range(counts["grad_school_activities"])
+    ]
+    course_ids = []
+    for _ in range(counts["courses"]):
+        title = _title(rng, 3)
+        linked = rng.random() < 0.3
+        course_id = add(models.Course, title=title, title_key=search_key(title),
+                        course_term_id=None if linked else rng.choice(term_ids),
+                        grad_school_activity_id=rng.choice(activity_ids) if linked else None,
+                        credit_points=Decimal(rng.choice(["1.5", "3.0", "4.5", "7.5"])))
+        course_ids.append(course_id)
+        add(models.CourseInstitution, course_id=course_id, institution_id=rng.choice(institution_ids))
+        for pr_id in rng.sample(researcher_roles, min(len(researcher_roles), rng.randint(1, 2))):
+            add(models.CourseTeacher, course_id=course_id, person_role_id=pr_id)
+        if rng.random() < 0.2:
+            add(models.DecisionLetter, entity_type=models.EntityType.COURSE, entity_id=course_id,
+                link=f"https://example.org/letters/course/{course_id}")
+
+    # --- student enrolments and activities ---
+    for student_id in student_ids:
+        for course_id in rng.sample(course_ids, min(len(course_ids), rng.randint(0, 4))):
+            completed = rng.random() < 0.6
+            add(models.PhDStudentCourse, phd_student_id=student_id, course_id=course_id, is_completed=completed,
+                grade=rng.choice(list(models.GradeType)) if completed else None)
+        for activity_id in rng.sample(activity_ids, min(len(activity_ids), rng.randint(0, 2))):
+            add(models.StudentActivity, phd_student_id=student_id, activity_type=models.ActivityType.GRAD_SCHOOL,
+                activity_id=activity_id, is_completed=rng.random() < 0.5)
+        if rng.random() < 0.25:
+            start = _date(rng)
+            add(models.StudentActivity, phd_student_id=student_id, activity_type=models.ActivityType.ABROAD,
+                activity_id=0, description="Research stay", start_date=start,
+                end_date=start + timedelta(days=rng.randint(30, 180)), city=rng.choice(WORDS).title(),
+                country=rng.choice(COUNTRIES), host_institution=f"{rng.choice(WORDS).title()} Institute")
+
+    for model, table_rows in rows.items():
+        # one executemany per table: every row needs the same keys
+        keys = dict.fromkeys(key for row in table_rows for key in row)
+        db.execute(insert(model.__table__), [{key: row.get(key) for key in keys} for row in table_rows])
+    db.commit()
+    return {model.__tablename__: len(table_rows) for model, table_rows in rows.items()}
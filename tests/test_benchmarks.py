@@ -0,0 +1,127 @@
+import os
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import pytest
+
+from app.dependencies import get_db, get_read_db
+from app.database import Base
+from app.main import app
+from .synthetic_data import populate
+
+# Endpoint benchmarks on a synthetic registry (see synthetic_data).
+#
+# Opt-in, and needs pytest-benchmark: BENCHMARK_SCALES lists the registry
+# sizes to run at, as multiples of the base data set. See the README for
+# storing a baseline and failing on regressions.
+
+SCALES = [float(s) for s in os.environ.get("BENCHMARK_SCALES", "").split(",") if s.strip()]
+ROUNDS = int(os.environ.get("BENCHMARK_ROUNDS", "5"))
+
+pytestmark = pytest.mark.skipif(not SCALES, reason="set BENCHMARK_SCALES (e.g. 1,10,100) to run the benchmarks")
+
+LIST_ENDPOINTS = [
+    "/institutions/",
+    "/branches/",
+    "/fields/",
+    "/researcher-titles/",
+    "/project-call-types/",
+    "/course-terms/",
+    "/grad-school-activity-types/",
+    "/grad-school-activities/",
+    "/courses/",
+    "/projects/",
+    "/people/",
+    "/person-roles/",
+    "/researchers/",
+    "/researchers/?search=ann",
+    "/phd-students/",
+    "/phd-students/?search=ann",
+    "/postdocs/",
+    "/search/?q=ann",
+]
+REPORT_ENDPOINTS = [
+    "/reports/supervisions/",
+    "/reports/supervisions/?cohort_number=3",
+    "/reports/project-leaders/",
+    "/reports/semester-abroad-data/",
+]
+EXPORT_ENDPOINTS = [
+    "/institutions/export/institutions.xlsx",
+    "/grad-school-activities/export/grad-school-activities.xlsx",
+    "/courses/export/courses.xlsx",
+    "/projects/export/projects.xlsx",
+    "/researchers/export/researchers.xlsx",
+    "/researchers/export/emails",
+    "/phd-students/export/phd-students.xlsx",
+    "/phd-students/export/phd-students.xlsx?format=csv",
+    "/phd-students/export/emails",
+    "/postdocs/export/postdocs.xlsx",
+    "/postdocs/export/emails",
+    "/reports/supervisions/export/excel",
+    "/reports/supervisions/export/emails",
+    "/reports/project-leaders/export/excel",
+    "/reports/project-leaders/export/emails",
+    "/reports/semester-abroad-data/export/excel",
+    "/export/registry.xlsx",
+]
+
+HEADERS = {"X-Dev-User": "alice"}
+
+
+@pytest.fixture(scope="module", params=SCALES, ids=lambda scale: f"{scale:g}x")
+def registry_db(request, tmp_path_factory):
+    """A file database holding the synthetic registry at one scale, shared by the module."""
+    path = tmp_path_factory.mktemp("benchmark") / "registry.sqlite3"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+    try:
+        populate(db, scale=request.param)
+    finally:
+        db.close()
+    yield SessionLocal
+    engine.dispose()
+
+
+@pytest.fixture
+def client(registry_db):
+    def override_get_db():
+        db = registry_db()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    previous = {dep: app.dependency_overrides.get(dep) for dep in (get_db, get_read_db)}
+    app.dependency_overrides.update({get_db: override_get_db, get_read_db: override_get_db})
+    test_client = TestClient(app)
+    test_client.get("/users/me", headers=HEADERS)  # creates the dev user outside the timings
+    yield test_client
+    app.dependency_overrides.update(previous)
+
+
+def _bench(benchmark, client, url):
+    def get():
+        r = client.get(url, headers=HEADERS)
+        assert r.status_code == 200, r.text
+        return r
+
+    benchmark.pedantic(get, rounds=ROUNDS, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("url", LIST_ENDPOINTS)
+def test_list_endpoint(benchmark, client, url):
+    _bench(benchmark, client, url)
+
+
+@pytest.mark.parametrize("url", REPORT_ENDPOINTS)
+def test_report_endpoint(benchmark, client, url):
+    _bench(benchmark, client, url)
+
+
+@pytest.mark.parametrize("url", EXPORT_ENDPOINTS)
+def test_export_endpoint(benchmark, client, url):
+    _bench(benchmark, client, url)
@@ -1,47 +1,8 @@
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-import pytest
-
-from app.dependencies import get_db
-from app.database import Base
-from app.main import app
 from app import schemas
 
-# in-memory
-test_engine = create_engine(
-    "sqlite:///:memory:",
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool
-)
-TestingSessionLocal = sessionmaker(bind=test_engine, autocommit=False, autoflush=False)
-
-Base.metadata.create_all(bind=test_engine)
-
-
-def override_get_db():
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-# app.dependency_overrides[get_db] = lambda: next(__import__('__main__').TestingSessionLocal())  # type: ignore
-app.dependency_overrides[get_db] = override_get_db  # type: ignore
-client = TestClient(app)
-
-
-@pytest.fixture(autouse=True)
-def reset():
-    Base.metadata.drop_all(bind=test_engine)
-    Base.metadata.create_all(bind=test_engine)
-    yield
-
 
 # --- CourseTerm tests ---
-def test_course_term_lifecycle():
+def test_course_term_lifecycle(client):
     # list empty
     assert client.get("/course-terms/", headers={"X-Dev-User": "alice"}).json() == []
 
@@ -68,7 +29,7 @@ def test_course_term_lifecycle():
 
 
 # --- Course tests ---
-def test_course_basic_crud_and_filters():
+def test_course_basic_crud_and_filters(client):
     # prepare term
     t1 = client.post("/course-terms/next", headers={"X-Dev-User": "alice"}).json()
     t2 = client.post("/course-terms/next", headers={"X-Dev-User": "alice"}).json()
@@ -0,0 +1,100 @@
+import itertools
+
+from sqlalchemy import event
+import pytest
+
+from app import models
+
+pytestmark = pytest.mark.usefixtures("roles")
+
+
+HEADERS = {"X-Dev-User": "alice"}
+_emails = itertools.count()
+
+
+def _seed_course_and_students(session_factory, n):
+    db = session_factory()
+    try:
+        role = db.query(models.Role).filter_by(role=models.RoleType.PHD_STUDENT).one()
+        course = models.Course(title="Methods", course_term=models.CourseTerm(season=models.Season.FALL, year=2024))
+        students = [
+            models.PhDStudent(person_role=models.PersonRole(role=role, person=models.Person(
+                first_name=f"S{i:02}", last_name="Example", email=f"bulk{next(_emails)}@example.org"
+            )))
+            for i in range(n)
+        ]
+        db.add_all([course, *students])
+        db.commit()
+        return course.id, [s.id for s in students]
+    finally:
+        db.close()
+
+
+def _bulk(client, course_id, **changes):
+    return client.post(f"/courses/{course_id}/students/bulk", json=changes, headers=HEADERS)
+
+
+def _links(client, course_id):
+    return {
+        s["phd_student_id"]: (s["is_completed"], s["grade"])
+        for s in client.get(f"/courses/{course_id}/students/", headers=HEADERS).json()
+    }
+
+
+def test_bulk_enrolment_in_one_transaction(client, session_factory):
+    course_id, ids = _seed_course_and_students(session_factory, 40)
+    client.get("/roles/", headers=HEADERS)  # provisions the dev user
+
+    commits = []
+
+    def on_commit(session):
+        commits.append(session)
+
+    event.listen(session_factory, "after_commit", on_commit)
+    try:
+        resp = _bulk(client, course_id, add=[{"phd_student_id": i} for i in ids])
+    finally:
+        event.remove(session_factory, "after_commit", on_commit)
+    assert resp.status_code == 200
+    assert len(resp.json()) == 40
+    assert len(commits) == 1
+
+
+def test_bulk_update_and_remove(client, session_factory):
+    course_id, ids = _seed_course_and_students(session_factory, 3)
+    _bulk(client, course_id, add=[{"phd_student_id": i} for i in ids])
+
+    resp = _bulk(
+        client,
+        course_id,
+        update=[{"phd_student_id": ids[0], "is_completed": True, "grade": "pass"},
+                {"phd_student_id": ids[1], "grade": "fail"}],
+        remove=[ids[2]],
+    )
+    assert resp.status_code == 200
+    assert _links(client, course_id) == {ids[0]: (True, "pass"), ids[1]: (False, "fail")}
+
+
+def test_bulk_ignores_null_completion(client, session_factory):
+    course_id, ids = _seed_course_and_students(session_factory, 2)
+    _bulk(client, course_id, add=[{"phd_student_id": ids[0], "is_completed": None},
+                                  {"phd_student_id": ids[1], "is_completed": True, "grade": "pass"}])
+
+    resp = _bulk(client, course_id, update=[{"phd_student_id": i, "is_completed": None, "grade": None} for i in ids])
+    assert resp.status_code == 200
+    assert _links(client, course_id) == {ids[0]: (False, None), ids[1]: (True, None)}
+
+
+def test_bulk_rejects_whole_batch(client, session_factory):
+    course_id, ids = _seed_course_and_students(session_factory, 3)
+    _bulk(client, course_id, add=[{"phd_student_id": ids[0]}])
+
+    # one duplicate makes the whole batch fail; nothing else is written
+    resp = _bulk(client, course_id, add=[{"phd_student_id": i} for i in ids])
+    assert resp.status_code == 400
+    assert _links(client, course_id).keys() == {ids[0]}
+
+    assert _bulk(client, course_id, add=[{"phd_student_id": 999}]).status_code == 404
+    assert _bulk(client, course_id, remove=[ids[1]]).status_code == 404
+    assert _bulk(client, course_id, add=[{"phd_student_id": ids[1]}], remove=[ids[1]]).status_code == 400
+    assert _bulk(client, 999, add=[{"phd_student_id": ids[1]}]).status_code == 404
@@ -0,0 +1,100 @@
+import importlib
+import pkgutil
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+import pytest
+
+from app import dependencies, routers
+from app.config import settings
+from app.database import make_engine
+
+SYNCHRONOUS = {"off": 0, "normal": 1, "full": 2, "extra": 3}
+TEMP_STORE = {"default": 0, "file": 1, "memory": 2}
+
+
+def _pragmas(engine):
+    with engine.connect() as conn:
+        return {
+            name: conn.execute(text(f"PRAGMA {name}")).scalar()
+            for name in ("foreign_keys", "journal_mode", "synchronous", "cache_size", "mmap_size",
+                         "temp_store", "busy_timeout")
+        }
+
+
+@pytest.mark.parametrize("config", [
+    settings,
+    settings.model_copy(update={
+        "sqlite_journal_mode": "delete", "sqlite_synchronous": "full", "sqlite_cache_size": 500,
+        "sqlite_mmap_size": 0, "sqlite_temp_store": "file", "sqlite_busy_timeout": 100,
+    }),
+], ids=["default", "custom"])
+def test_connections_get_the_tuning_profile(tmp_path, config):
+    engine = make_engine(f"sqlite:///{tmp_path / 'wasp.sqlite3'}", config=config)
+    try:
+        assert _pragmas(engine) == {
+            "foreign_keys": 1,
+            "journal_mode": config.sqlite_journal_mode,
+            "synchronous": SYNCHRONOUS[config.sqlite_synchronous],
+            "cache_size": config.sqlite_cache_size,
+            "mmap_size": config.sqlite_mmap_size,
+            "temp_store": TEMP_STORE[config.sqlite_temp_store],
+            "busy_timeout": config.sqlite_busy_timeout,
+        }
+    finally:
+        engine.dispose()
+
+
+def test_wal_readers_do_not_wait_for_a_writer(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'wasp.sqlite3'}", config=settings.model_copy(update={
+        "sqlite_journal_mode": "wal", "sqlite_busy_timeout": 0,
+    }))
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        with engine.connect() as writer, engine.connect() as reader:
+            writer.execute(text("INSERT INTO t VALUES (2)"))  # write transaction left open
+            # the reader sees the last committed state instead of "database is locked"
+            assert reader.execute(text("SELECT count(*) FROM t")).scalar() == 1
+            writer.rollback()
+    finally:
+        engine.dispose()
+
+
+def test_read_only_engine_refuses_writes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'wasp.sqlite3'}"
+    engine, read_engine = make_engine(url), make_engine(url, read_only=True)
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        with read_engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                conn.execute(text("INSERT INTO t VALUES (2)"))
+    finally:
+        read_engine.dispose()
+        engine.dispose()
+
+
+def _is_bulk_read(route) -> bool:
+    """Lists (paths ending in "/"), reports and exports, and the export jobs that run them."""
+    if route.path.startswith("/export-jobs/"):
+        return route.methods == {"POST"}
+    return route.methods == {"GET"} and (route.path.endswith("/") or "export/" in route.path)
+
+
+def test_bulk_reads_use_the_read_only_engine():
+    # and nothing else does: a write on the read-only engine fails
+    wrong = []
+    for module in pkgutil.iter_modules(routers.__path__):
+        router = importlib.import_module(f"{routers.__name__}.{module.name}").router
+        for route in router.routes:
+            calls = {dep.call for dep in route.dependant.dependencies}
+            if calls & {dependencies.get_db, dependencies.get_read_db} and \
+                    (dependencies.get_read_db in calls) != _is_bulk_read(route):
+                wrong.append(f"{', '.join(sorted(route.methods))} {route.path}")
+    assert not wrong, "get_db / get_read_db mixed up for: " + "; ".join(wrong)
@@ -1,47 +1,5 @@
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-import pytest
-
-from app.dependencies import get_db
-from app.database import Base
-from app.main import app
-
-# Setup in‐memory DB
-test_engine = create_engine(
-    "sqlite:///:memory:",
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool
-)
-TestingSessionLocal = sessionmaker(bind=test_engine, autocommit=False, autoflush=False)
-
-# create schema once
-Base.metadata.create_all(bind=test_engine)
-
-
-# dependency override
-def override_get_db():
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-app.dependency_overrides[get_db] = override_get_db  # type: ignore
-client = TestClient(app)
-
-
-@pytest.fixture(autouse=True)
-def reset_db():
-    Base.metadata.drop_all(bind=test_engine)
-    Base.metadata.create_all(bind=test_engine)
-    yield
-
-
 # --- Branch tests ---
-def test_create_and_list_branch():
+def test_create_and_list_branch(client):
     resp = client.post("/branches/", json={"branch":"Branch A"}, headers={"X-Dev-User":"alice"})
     assert resp.status_code == 200
     b = resp.json()
@@ -53,7 +11,7 @@ def test_create_and_list_branch():
     assert "Branch A" in names
 
 
-def test_read_branch():
+def test_read_branch(client):
     resp = client.post("/branches/", json={"branch":"B"}, headers={"X-Dev-User":"alice"})
     bid = resp.json()["id"]
 
@@ -67,21 +25,21 @@ def test_read_branch():
     assert resp.status_code == 404
 
 
-def test_update_branch():
+def test_update_branch(client):
     bid = client.post("/branches/", json={"branch":"Old"}, headers={"X-Dev-User":"alice"}).json()["id"]
     resp = client.put(f"/branches/{bid}", json={"branch":"New"}, headers={"X-Dev-User":"alice"})
     assert resp.status_code == 200
     assert resp.json()["branch"] == "New"
 
 
-def test_delete_branch():
+def test_delete_branch(client):
     bid = client.post("/branches/", json={"branch":"ToDel"}, headers={"X-Dev-User":"alice"}).json()["id"]
     resp = client.delete(f"/branches/{bid}", headers={"X-Dev-User":"alice"})
     assert resp.status_code == 204
     assert all(x["id"] != bid for x in client.get("/branches/", headers={"X-Dev-User":"alice"}).json())
 
 
-def test_delete_branch_with_fields():
+def test_delete_branch_with_fields(client):
     bid = client.post("/branches/", json={"branch":"HasF"}, headers={"X-Dev-User":"alice"}).json()["id"]
     # seed a field
     client.post("/fields/", json={"field":"F1","branch_id":bid}, headers={"X-Dev-User":"alice"})
@@ -89,7 +47,7 @@ def test_delete_branch_with_fields():
     assert resp.status_code == 400
 
 
-def test_search_branches():
+def test_search_branches(client):
     client.post("/branches/", json={"branch":"Alpha"}, headers={"X-Dev-User":"alice"})
     client.post("/branches/", json={"branch":"Beta"},  headers={"X-Dev-User":"alice"})
     resp = client.get("/branches/?search=alp", headers={"X-Dev-User":"alice"})
@@ -97,7 +55,7 @@ def test_search_branches():
 
 
 # --- Field tests ---
-def test_create_and_list_field():
+def test_create_and_list_field(client):
     bid = client.post("/branches/", json={"branch":"B1"}, headers={"X-Dev-User":"alice"}).json()["id"]
     resp = client.post("/fields/", json={"field":"F1","branch_id":bid}, headers={"X-Dev-User":"alice"})
     assert resp.status_code == 200
@@ -109,7 +67,7 @@ def test_create_and_list_field():
     assert ("F1", bid) in pairs
 
 
-def test_read_field():
+def test_read_field(client):
     bid = client.post("/branches/", json={"branch":"B2"}, headers={"X-Dev-User":"alice"}).json()["id"]
     fid = client.post("/fields/", json={"field":"F2","branch_id":bid}, headers={"X-Dev-User":"alice"}).json()["id"]
 
@@ -121,7 +79,7 @@ def test_read_field():
     assert resp.status_code == 404
 
 
-def test_update_field():
+def test_update_field(client):
     bid1 = client.post("/branches/", json={"branch":"B3"}, headers={"X-Dev-User":"alice"}).json()["id"]
     bid2 = client.post("/branches/", json={"branch":"B4"}, headers={"X-Dev-User":"alice"}).json()["id"]
     fid = client.post("/fields/", json={"field":"OldF","branch_id":bid1}, headers={"X-Dev-User":"alice"}).json()["id"]
@@ -132,7 +90,7 @@ def test_update_field():
     assert data["field"] == "NewF" and data["branch_id"] == bid2
 
 
-def test_delete_field():
+def test_delete_field(client):
     bid = client.post("/branches/", json={"branch":"B5"}, headers={"X-Dev-User":"alice"}).json()["id"]
     fid = client.post("/fields/", json={"field":"ToDel","branch_id":bid}, headers={"X-Dev-User":"alice"}).json()["id"]
 
@@ -141,7 +99,7 @@ def test_delete_field():
     assert all(x["id"] != fid for x in client.get("/fields/", headers={"X-Dev-User":"alice"}).json())
 
 
-def test_list_fields_by_branch():
+def test_list_fields_by_branch(client):
     b1 = client.post("/branches/", json={"branch":"B6"}, headers={"X-Dev-User":"alice"}).json()["id"]
     b2 = client.post("/branches/", json={"branch":"B7"}, headers={"X-Dev-User":"alice"}).json()["id"]
     client.post("/fields/", json={"field":"FX","branch_id":b1}, headers={"X-Dev-User":"alice"})
@@ -151,7 +109,7 @@ def test_list_fields_by_branch():
     assert [x["field"] for x in resp.json()] == ["FX"]
 
 
-def test_search_fields():
+def test_search_fields(client):
     b = client.post("/branches/", json={"branch":"B8"}, headers={"X-Dev-User":"alice"}).json()["id"]
     client.post("/fields/", json={"field":"AlphaF","branch_id":b}, headers={"X-Dev-User":"alice"})
     client.post("/fields/", json={"field":"BetaF","branch_id":b}, headers={"X-Dev-User":"alice"})
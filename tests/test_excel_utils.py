@@ -0,0 +1,89 @@
+import io
+from datetime import date, datetime
+from decimal import Decimal
+
+import openpyxl
+import pytest
+
+from app import excel_utils
+from app.excel_utils import ExcelSheet, generate_excel_response, generate_excel_workbook
+
+
+def _load(chunks):
+    return openpyxl.load_workbook(io.BytesIO(b"".join(chunks)))
+
+
+def _values(sheet):
+    return [[cell.value for cell in row] for row in sheet.iter_rows()]
+
+
+def test_generate_excel_response_consumes_rows_lazily():
+    consumed = []
+
+    def rows():
+        for i in range(3):
+            consumed.append(i)
+            yield {"Name": f"Row {i}", "Count": i, "Credits": Decimal("7.5")}
+
+    chunks = generate_excel_response(rows(), ["Name", "Count", "Credits"], "Data", filter_info=["Search: x"])
+    first = next(chunks)  # workbook metadata goes out before any row is built
+    assert consumed == []
+
+    sheet = _load([first, *chunks]).active
+    assert consumed == [0, 1, 2]
+    assert sheet.title == "Data"
+
+
+def test_generate_excel_response_layout_and_values():
+    rows = [
+        {"Name": "Ada & <Bob>", "Count": 2, "Credits": Decimal("7.5")},
+        {"Name": " padded\x01", "Count": None},
+    ]
+    sheet = _load(generate_excel_response(rows, ["Name", "Count", "Credits"], "Data",
+                                          filter_info=["Search: ö", "Status: Active"])).active
+    assert _values(sheet) == [
+        ["Search: ö", None, None],
+        ["Status: Active", None, None],
+        [None, None, None],
+        ["Name", "Count", "Credits"],
+        ["Ada & <Bob>", 2, 7.5],
+        [" padded", None, None],
+    ]
+
+
+def test_generate_excel_response_writes_dates_as_dates():
+    rows = [{"Start Date": date(2024, 1, 15), "Updated": datetime(2024, 3, 1, 13, 30, 15)}]
+    sheet = _load(generate_excel_response(rows, ["Start Date", "Updated"], "Data")).active
+
+    start, updated = sheet["A2"], sheet["B2"]
+    assert start.is_date and start.number_format == "yyyy-mm-dd"
+    assert start.value == datetime(2024, 1, 15)
+    assert updated.is_date and updated.number_format == "yyyy-mm-dd h:mm:ss"
+    assert updated.value == datetime(2024, 3, 1, 13, 30, 15)
+
+
+def test_generate_excel_workbook_multiple_sheets():
+    workbook = _load(generate_excel_workbook([
+        ExcelSheet("People: all", ["Name"], iter([{"Name": "Ada"}])),
+        ExcelSheet("people: ALL", ["Title"], []),
+    ]))
+    assert workbook.sheetnames == ["People all", "people ALL 2"]
+    assert _values(workbook["People all"]) == [["Name"], ["Ada"]]
+    assert _values(workbook["people ALL 2"]) == [["Title"]]
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    monkeypatch.setattr(excel_utils, "POOL_BATCH_ROWS", 7)  # several batches in flight
+    excel_utils.start_process_pool(2)
+    yield
+    excel_utils.shutdown_process_pool()
+
+
+def test_generate_excel_response_in_process_pool(process_pool):
+    rows = ({"Name": f"Row {i}", "Count": i, "Credits": Decimal("1.5")} for i in range(50))
+    sheet = _load(generate_excel_response(rows, ["Name", "Count", "Credits"], "Data",
+                                          filter_info=["Search: x"])).active
+    values = _values(sheet)
+    assert values[:3] == [["Search: x", None, None], [None, None, None], ["Name", "Count", "Credits"]]
+    assert values[3:] == [[f"Row {i}", i, 1.5] for i in range(50)]
@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+import sys
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.export_utils import (
+    ExportFormat, ExportFormatUnavailableError, export_response, generate_arrow, generate_csv, generate_ndjson
+)
+
+HEADERS = ["Name", "Credits", "Start Date"]
+ROWS = [
+    {"Name": "Åsa, \"the\" first", "Credits": Decimal("7.5"), "Start Date": date(2024, 1, 15)},
+    {"Name": "Bo", "Credits": None, "Start Date": None},
+]
+
+
+def test_generate_csv_quotes_values():
+    text = b"".join(generate_csv(iter(ROWS), HEADERS)).decode("utf-8")
+    assert list(csv.reader(io.StringIO(text))) == [
+        HEADERS,
+        ["Åsa, \"the\" first", "7.5", "2024-01-15"],
+        ["Bo", "", ""],
+    ]
+
+
+def test_generate_csv_without_rows_has_header():
+    assert b"".join(generate_csv(iter([]), HEADERS)) == b"Name,Credits,Start Date\r\n"
+
+
+def test_generate_ndjson_one_object_per_line():
+    lines = b"".join(generate_ndjson(iter(ROWS), HEADERS)).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"Name": "Åsa, \"the\" first", "Credits": 7.5, "Start Date": "2024-01-15"},
+        {"Name": "Bo", "Credits": None, "Start Date": None},
+    ]
+
+
+@pytest.mark.parametrize("export_format, filename", [
+    (ExportFormat.XLSX, "report.xlsx"),
+    (ExportFormat.CSV, "report.csv"),
+    (ExportFormat.NDJSON, "report.ndjson"),
+])
+def test_export_response_filename(export_format, filename):
+    resp = export_response(iter(ROWS), HEADERS, "Report", "report", export_format)
+    assert resp.headers["content-disposition"] == f"attachment; filename={filename}"
+
+
+@pytest.mark.parametrize("parquet", [True, False])
+def test_generate_arrow_round_trips(parquet):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    rows = [{"Name": f"Row {i}", "Count": i, "Empty": None} for i in range(2500)]
+    data = b"".join(generate_arrow(iter(rows), ["Name", "Count", "Empty"], parquet=parquet,
+                                   column_types={"Count": int}))
+
+    result = _read_arrow(pa, data, parquet)
+    assert result.num_rows == 2500
+    assert result.schema.field("Empty").type == pa.string()
+    assert result.column("Count").to_pylist()[-1] == 2499
+
+
+def _read_arrow(pa, data, parquet):
+    if parquet:
+        return pa.parquet.read_table(pa.BufferReader(data))
+    return pa.ipc.open_stream(data).read_all()
+
+
+@pytest.mark.parametrize("parquet", [True, False])
+def test_generate_arrow_nulls_before_ints(parquet):
+    # sorted by name, the first batches can all lack a cohort
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    cohorts = [None] * 1500 + list(range(500))
+    rows = ({"Name": f"Row {i}", "Cohort": cohort} for i, cohort in enumerate(cohorts))
+
+    typed = _read_arrow(pa, b"".join(generate_arrow(rows, ["Name", "Cohort"], parquet=parquet,
+                                                    column_types={"Cohort": int})), parquet)
+    assert typed.schema.field("Cohort").type == pa.int64()
+    assert typed.column("Cohort").to_pylist() == cohorts
+
+    rows = ({"Name": f"Row {i}", "Cohort": cohort} for i, cohort in enumerate(cohorts))
+    untyped = _read_arrow(pa, b"".join(generate_arrow(rows, ["Name", "Cohort"], parquet=parquet)), parquet)
+    assert untyped.schema.field("Cohort").type == pa.string()
+    assert untyped.column("Cohort").to_pylist()[-1] == "499"
+
+
+@pytest.mark.parametrize("parquet", [True, False])
+def test_generate_arrow_mixed_ints_and_empty_strings(parquet):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    years = [2024, "", 2025, ""]
+    rows = [{"Year": year, "Credits": Decimal("7.5")} for year in years]
+
+    typed = _read_arrow(pa, b"".join(generate_arrow(iter(rows), ["Year", "Credits"], parquet=parquet,
+                                                    column_types={"Year": int, "Credits": float})), parquet)
+    assert typed.column("Year").to_pylist() == [2024, None, 2025, None]
+    assert typed.column("Credits").to_pylist() == [7.5] * 4
+
+    untyped = _read_arrow(pa, b"".join(generate_arrow(iter(rows), ["Year", "Credits"], parquet=parquet)), parquet)
+    assert untyped.column("Year").to_pylist() == ["2024", "", "2025", ""]
+    assert untyped.column("Credits").to_pylist() == ["7.5"] * 4
+
+
+def test_generate_arrow_without_rows():
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    data = b"".join(generate_arrow(iter([]), HEADERS, parquet=True))
+    assert pa.parquet.read_table(pa.BufferReader(data)).column_names == HEADERS
+
+
+def test_generate_arrow_without_pyarrow(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)  # makes `import pyarrow` fail
+    with pytest.raises(ExportFormatUnavailableError):
+        generate_arrow(iter(ROWS), HEADERS, parquet=True)
@@ -0,0 +1,95 @@
+import io
+
+import openpyxl
+import pytest
+
+from app import models
+from app.main import seed_roles
+
+
+@pytest.fixture(autouse=True)
+def seed_db(db):
+    seed_roles(db)
+    db.add_all([
+        models.Institution(institution="Lunds universitet"),
+        models.AcademicField(field="History", branch=models.AcademicBranch(branch="Humanities")),
+        models.Person(first_name="Existing", last_name="Person", email="taken@example.org"),
+    ])
+    db.commit()
+
+
+HEADERS = {"X-Dev-User": "alice"}
+CSV_HEADER = "First Name,Last Name,Email,Start Date,Cohort,Affiliated,Institutions,Fields\n"
+
+
+def _import(client, content, dry_run=False, content_type="text/csv"):
+    return client.post("/import/phd-students", params={"dry_run": dry_run}, content=content,
+                       headers={**HEADERS, "Content-Type": content_type})
+
+
+def _students(session_factory):
+    db = session_factory()
+    try:
+        return {
+            s.person_role.person.email: (
+                s.cohort_number, s.is_affiliated,
+                [pi.institution.institution for pi in s.person_role.institutions],
+                [pf.field.field for pf in s.person_role.fields],
+            )
+            for s in db.query(models.PhDStudent)
+        }
+    finally:
+        db.close()
+
+
+def test_import_csv_creates_students(client, session_factory):
+    content = (CSV_HEADER +
+               "Ada,Lovelace,ada@example.org,2024-09-01,5,yes,LUNDS UNIVERSITET,History\n"
+               "Bo,Åström,bo@example.org,,5,,,\n").encode("utf-8")
+
+    resp = _import(client, content)
+    assert resp.status_code == 200
+    assert resp.json() == {"dry_run": False, "rows": 2, "created": 2, "errors": []}
+    assert _students(session_factory) == {
+        "ada@example.org": (5, True, ["Lunds universitet"], ["History"]),
+        "bo@example.org": (5, False, [], []),
+    }
+
+
+def test_import_dry_run_reports_every_row_and_writes_nothing(client, session_factory):
+    content = (CSV_HEADER +
+               "Ada,Lovelace,ada@example.org,2024-09-01,five,maybe,Nowhere,History\n"
+               "Bo,Åström,taken@example.org,,5,,,\n"
+               "Cleo,,cleo@example.org,,,,,\n"
+               "Dan,Ok,dan@example.org,,,,,\n").encode("utf-8")
+
+    resp = _import(client, content, dry_run=True)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["created"] == 0
+    errors = {e["row"]: e["errors"] for e in report["errors"]}
+    assert sorted(errors) == [2, 3, 4]
+    assert [m.split(":")[0] for m in errors[2]] == ["Cohort", "Affiliated", "Institutions"]
+    assert errors[3] == ["Email: a person with email taken@example.org already exists"]
+    assert errors[4][0].startswith("Last Name:")
+
+    # without dry run the same file is rejected as a whole
+    assert _import(client, content).status_code == 400
+    assert _students(session_factory) == {}
+
+
+def test_import_xlsx(client, session_factory):
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["first name", "LAST NAME", "Email", "Cohort", "Notes"])
+    workbook.active.append(["Ada", "Lovelace", "ada@example.org", 3, "ignored column"])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    resp = _import(client, buffer.getvalue(), content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    assert resp.status_code == 200
+    assert _students(session_factory) == {"ada@example.org": (3, False, [], [])}
+
+
+def test_import_rejects_unreadable_file(client):
+    assert _import(client, b"Name,Email\nAda,ada@example.org\n").status_code == 400
+    assert _import(client, b"").status_code == 422  # no body at all
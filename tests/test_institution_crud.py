@@ -1,49 +1,10 @@
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-import pytest
-
-from app.dependencies import get_db
-from app.database import Base
-from app.main import app
-from app import schemas
-
-# in-memory DB
-test_engine = create_engine(
-    "sqlite:///:memory:",
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool
-)
-TestingSessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=test_engine
-)
-
-# create schema once
-Base.metadata.create_all(bind=test_engine)
-
-
-def override_get_db():
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-app.dependency_overrides[get_db] = override_get_db  # type: ignore
-client = TestClient(app)
-
+from datetime import datetime
 
-# reset before each test
-@pytest.fixture(autouse=True)
-def reset_db():
-    Base.metadata.drop_all(bind=test_engine)
-    Base.metadata.create_all(bind=test_engine)
-    yield
+from app.main import seed_roles
+from app import crud, models, schemas
 
 
-def test_create_and_list_institution():
+def test_create_and_list_institution(client):
     # create
     resp = client.post(
         "/institutions/",
@@ -61,7 +22,7 @@ def test_create_and_list_institution():
     assert "Uni A" in names
 
 
-def test_read_institution():
+def test_read_institution(client):
     # seed
     resp = client.post("/institutions/", json={"institution": "Uni B"}, headers={"X-Dev-User": "alice"})
     inst_id = resp.json()["id"]
@@ -76,7 +37,7 @@ def test_read_institution():
     assert resp.status_code == 404
 
 
-def test_update_institution():
+def test_update_institution(client):
     # seed
     resp = client.post("/institutions/", json={"institution": "X"}, headers={"X-Dev-User": "alice"})
     inst_id = resp.json()["id"]
@@ -91,7 +52,7 @@ def test_update_institution():
     assert resp.json()["institution"] == "Y"
 
 
-def test_delete_institution():
+def test_delete_institution(client):
     # seed & delete
     resp = client.post("/institutions/", json={"institution": "ToRemove"}, headers={"X-Dev-User": "alice"})
     inst_id = resp.json()["id"]
@@ -103,7 +64,7 @@ def test_delete_institution():
     assert all(i["id"] != inst_id for i in resp.json())
 
 
-def test_search_institution():
+def test_search_institution(client):
     # seed multiple
     client.post("/institutions/", json={"institution": "Alpha Inst"}, headers={"X-Dev-User": "alice"})
     client.post("/institutions/", json={"institution": "Beta Inst"},  headers={"X-Dev-User": "alice"})
@@ -114,7 +75,7 @@ def test_search_institution():
     assert [i["institution"] for i in resp.json()] == ["Alpha Inst"]
 
 
-def test_create_duplicate_institution():
+def test_create_duplicate_institution(client):
     # first create succeeds
     resp1 = client.post(
         "/institutions/",
@@ -131,3 +92,34 @@ def test_create_duplicate_institution():
     )
     assert resp2.status_code == 400
     assert resp2.json()["detail"] == "Institution 'Dup Uni' already exists"
+
+
+def test_institution_headcounts(session_factory):
+    db = session_factory()
+    try:
+        seed_roles(db)
+        roles = {r.role: r for r in db.query(models.Role).all()}
+        uni = models.Institution(institution="Uni A")
+        empty = models.Institution(institution="Uni B")
+        db.add_all([uni, empty])
+
+        def link(email, role_type, role_ended=False, link_ended=False):
+            person = models.Person(first_name="Test", last_name="Person", email=email)
+            pr = models.PersonRole(person=person, role=roles[role_type],
+                                   end_date=datetime(2000, 1, 1) if role_ended else None)
+            db.add(models.PersonInstitution(person_role=pr, institution=uni,
+                                            end_date=datetime(2000, 1, 1) if link_ended else None))
+
+        link("r1@example.org", models.RoleType.RESEARCHER)
+        link("r2@example.org", models.RoleType.RESEARCHER, role_ended=True)
+        link("p1@example.org", models.RoleType.PHD_STUDENT, link_ended=True)
+        link("d1@example.org", models.RoleType.POSTDOC)
+        db.commit()
+
+        a, b = crud.get_institutions(db)
+        assert (a.researchers_active, a.researchers_total) == (1, 2)
+        assert (a.phd_students_active, a.phd_students_total) == (0, 1)
+        assert (a.postdocs_active, a.postdocs_total) == (1, 1)
+        assert (b.researchers_total, b.phd_students_total, b.postdocs_total) == (0, 0, 0)
+    finally:
+        db.close()
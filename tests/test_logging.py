@@ -0,0 +1,76 @@
+import json
+import logging
+import queue
+
+from starlette.requests import Request
+import pytest
+
+from app.logger import JsonFormatter, RequestQueueHandler, bind_request, request_context
+
+pytestmark = pytest.mark.usefixtures("roles")
+
+
+@pytest.fixture
+def records():
+    """The records the "app" loggers emit during the test, as formatted JSON."""
+    log_queue = queue.Queue()
+    handler = RequestQueueHandler(log_queue)
+    logging.getLogger("app").addHandler(handler)
+    formatter = JsonFormatter()
+
+    def drain():
+        entries = []
+        while not log_queue.empty():
+            entries.append(json.loads(formatter.format(log_queue.get_nowait())))
+        return entries
+
+    yield drain
+    logging.getLogger("app").removeHandler(handler)
+
+
+def test_records_outside_a_request_have_no_request_fields(records):
+    logging.getLogger("app.test").warning("plain %s", "message")
+
+    [entry] = records()
+    assert entry["level"] == "WARNING"
+    assert entry["logger"] == "app.test"
+    assert entry["message"] == "plain message"
+    assert "request_id" not in entry
+
+
+def test_records_carry_request_context_and_exception(records):
+    request = Request({"type": "http", "method": "POST", "path": "/x", "headers": []})
+    with request_context(request, "req-1"):
+        bind_request(user="alice")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("app.test").exception("failed")
+
+    [entry] = records()
+    assert entry["request_id"] == "req-1"
+    assert entry["method"] == "POST"
+    assert entry["route"] == "unmatched"
+    assert entry["user"] == "alice"
+    assert entry["exception"].startswith("Traceback") and "ValueError: boom" in entry["exception"]
+
+
+def test_request_log_lines_are_structured(client, records):
+    r = client.get("/institutions/", headers={"X-Dev-User": "alice", "X-Request-ID": "abc123"})
+    assert r.status_code == 200
+    assert r.headers["X-Request-ID"] == "abc123"
+
+    entries = [e for e in records() if e.get("request_id") == "abc123"]
+    assert entries[0]["message"].startswith("→ GET")
+    last = entries[-1]
+    assert last["message"].startswith("← GET")
+    assert last["route"] == "/institutions/"
+    assert last["user"] == "alice"
+    assert last["status"] == 200
+    assert last["duration_ms"] >= 0 and last["db_queries"] > 0
+
+
+def test_request_id_is_generated_when_missing(client):
+    first = client.get("/openapi.json").headers["X-Request-ID"]
+    second = client.get("/openapi.json").headers["X-Request-ID"]
+    assert first and second and first != second
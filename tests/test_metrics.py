@@ -0,0 +1,96 @@
+import re
+
+import pytest
+
+from app import metrics
+
+pytestmark = pytest.mark.usefixtures("roles")
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    # metrics created in a test are not left in the application registry
+    monkeypatch.setattr(metrics, "REGISTRY", [])
+    return metrics.REGISTRY
+
+
+HEADERS = {"X-Dev-User": "alice"}
+
+
+def _sample(text: str, name: str, **labels) -> float:
+    label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    match = re.search(rf"^{re.escape(name)}{re.escape('{' + label_text + '}' if labels else '')} (\S+)$",
+                      text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_render_counter_and_gauge(registry):
+    counter = metrics.Counter("things_total", "Things seen", ["kind"])
+    gauge = metrics.Gauge("busy", "Busy workers")
+    counter.labels('a "quoted"\nkind').inc(2)
+    gauge.labels().inc()
+    gauge.labels().inc()
+    gauge.labels().dec()
+
+    assert metrics.render() == (
+        "# HELP things_total Things seen\n"
+        "# TYPE things_total counter\n"
+        'things_total{kind="a \\"quoted\\"\\nkind"} 2\n'
+        "# HELP busy Busy workers\n"
+        "# TYPE busy gauge\n"
+        "busy 1\n"
+    )
+
+
+def test_render_histogram_buckets_are_cumulative(registry):
+    histogram = metrics.Histogram("latency_seconds", "Latency", ["route"], buckets=[0.1, 1])
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.labels("/x").observe(value)
+
+    assert metrics.render().splitlines()[2:] == [
+        'latency_seconds_bucket{route="/x",le="0.1"} 2',
+        'latency_seconds_bucket{route="/x",le="1"} 3',
+        'latency_seconds_bucket{route="/x",le="+Inf"} 4',
+        'latency_seconds_sum{route="/x"} 3.65',
+        'latency_seconds_count{route="/x"} 4',
+    ]
+
+
+def test_labels_must_match_labelnames(registry):
+    counter = metrics.Counter("things_total", "Things seen", ["kind"])
+    with pytest.raises(ValueError):
+        counter.labels()
+
+
+def test_metrics_endpoint_reports_requests_by_route_template(client):
+    client.get("/institutions/", headers=HEADERS)  # creates the dev user
+    before = client.get("/metrics", headers=HEADERS).text
+    client.get("/institutions/", headers=HEADERS)
+    client.get("/institutions/12345", headers=HEADERS)
+
+    r = client.get("/metrics", headers=HEADERS)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = r.text
+
+    def delta(name, **labels):
+        return _sample(text, name, **labels) - _sample(before, name, **labels)
+
+    assert delta("wasp_http_requests_total", method="GET", route="/institutions/", status="200") == 1
+    assert delta("wasp_http_requests_total", method="GET", route="/institutions/{institution_id}", status="404") == 1
+    assert delta("wasp_http_request_duration_seconds_count", method="GET", route="/institutions/") == 1
+    assert delta("wasp_db_queries_total", method="GET", route="/institutions/") > 0
+    assert _sample(text, "wasp_http_requests_in_progress", method="GET") >= 1
+
+
+def test_metrics_endpoint_reports_exports(client):
+    before = client.get("/metrics", headers=HEADERS).text
+    client.post("/institutions/", json={"institution": "KTH"}, headers=HEADERS)
+    r = client.get("/institutions/export/institutions.xlsx?format=csv", headers=HEADERS)
+    assert r.status_code == 200
+
+    text = client.get("/metrics", headers=HEADERS).text
+    assert _sample(text, "wasp_export_rows_total", format="csv") - _sample(before, "wasp_export_rows_total",
+                                                                           format="csv") == 1
+    assert (_sample(text, "wasp_export_bytes_sum", format="csv")
+            - _sample(before, "wasp_export_bytes_sum", format="csv")) == len(r.content)
@@ -0,0 +1,175 @@
+import io
+import itertools
+
+import openpyxl
+from sqlalchemy import event
+import pytest
+
+pytestmark = pytest.mark.usefixtures("roles")
+
+
+HEADERS = {"X-Dev-User": "alice"}
+_emails = itertools.count()
+
+
+def _role_id(client, role_name):
+    roles = client.get("/roles/", headers=HEADERS).json()
+    return next(r["id"] for r in roles if r["role"] == role_name)
+
+
+def _create_student(client, first_name, last_name, cohort=1):
+    person = client.post("/people/", json={
+        "first_name": first_name, "last_name": last_name, "email": f"student{next(_emails)}@example.org"
+    }, headers=HEADERS).json()
+    pr = client.post("/person-roles/", json={
+        "person_id": person["id"], "role_id": _role_id(client, "phd_student")
+    }, headers=HEADERS).json()
+    return client.post("/phd-students/", json={
+        "person_role_id": pr["id"], "cohort_number": cohort
+    }, headers=HEADERS).json()
+
+
+def _create_students_in_branch(client, first_names, cohort=1):
+    """Students who each have two fields of one new branch; returns the branch id."""
+    branch = client.post("/branches/", json={"branch": f"Branch {next(_emails)}"}, headers=HEADERS).json()
+    fields = [
+        client.post("/fields/", json={"field": f"Field {next(_emails)}", "branch_id": branch["id"]},
+                    headers=HEADERS).json()
+        for _ in range(2)
+    ]
+    for first_name in first_names:
+        student = _create_student(client, first_name, "Fielder", cohort=cohort)
+        for field in fields:
+            client.post(f"/person-roles/{student['person_role_id']}/fields/", json={"field_id": field["id"]},
+                        headers=HEADERS)
+    return branch["id"]
+
+
+def _count_statements(test_engine, fn):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = fn()
+    finally:
+        event.remove(test_engine, "before_cursor_execute", before_cursor_execute)
+    return result, len(statements)
+
+
+def test_list_phd_students_includes_person_graph(client):
+    _create_student(client, "Ada", "Lovelace")
+    _create_student(client, "Alan", "Turing", cohort=2)
+
+    resp = client.get("/phd-students/", headers=HEADERS)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [s["person_role"]["person"]["first_name"] for s in data] == ["Ada", "Alan"]
+    assert data[0]["person_role"]["role"]["role"] == "phd_student"
+    assert data[0]["person_role"]["person"]["roles"][0]["role"]["role"] == "phd_student"
+
+
+def test_list_phd_students_statement_count_is_flat(client, test_engine):
+    _create_student(client, "Ada", "Lovelace")
+    _, few = _count_statements(test_engine, lambda: client.get("/phd-students/", headers=HEADERS))
+
+    for i in range(5):
+        _create_student(client, f"Student{i}", "Example")
+    resp, many = _count_statements(test_engine, lambda: client.get("/phd-students/", headers=HEADERS))
+
+    assert len(resp.json()) == 6
+    assert many == few
+
+
+def test_list_phd_students_keyset_pages(client):
+    # duplicate names make the id tie-breaker matter
+    for first_name in ["Cleo", "Ada", "Bo", "Ada", "Ada"]:
+        _create_student(client, first_name, "Same")
+    full = [s["id"] for s in client.get("/phd-students/", headers=HEADERS).json()]
+
+    seen, after = [], None
+    while True:
+        params = {"limit": 2}
+        if after:
+            params["after"] = after
+        resp = client.get("/phd-students/", params=params, headers=HEADERS)
+        assert resp.status_code == 200
+        page = resp.json()
+        assert len(page) <= 2
+        seen += [s["id"] for s in page]
+        after = resp.headers.get("X-Next-Cursor")
+        if not after:
+            break
+
+    assert seen == full
+
+
+def test_list_phd_students_keyset_pages_with_branch_filter(client):
+    # several matching fields per student must not cost rows or end the pages early
+    branch_id = _create_students_in_branch(client, ["Ada", "Bo", "Cleo"])
+
+    seen, after = [], None
+    while True:
+        params = {"limit": 2, "branch_id": branch_id}
+        if after:
+            params["after"] = after
+        resp = client.get("/phd-students/", params=params, headers=HEADERS)
+        assert resp.status_code == 200
+        seen += [s["person_role"]["person"]["first_name"] for s in resp.json()]
+        after = resp.headers.get("X-Next-Cursor")
+        if not after:
+            break
+
+    assert seen == ["Ada", "Bo", "Cleo"]
+
+
+def test_list_phd_students_rejects_bad_cursor(client):
+    resp = client.get("/phd-students/", params={"limit": 2, "after": "not-a-cursor"}, headers=HEADERS)
+    assert resp.status_code == 400
+
+
+def test_export_phd_students_streams_workbook(client):
+    for first_name in ["Cleo", "Ada", "Bo"]:
+        _create_student(client, first_name, "Åström", cohort=3)
+
+    resp = client.get("/phd-students/export/phd-students.xlsx", params={"cohort_number": 3}, headers=HEADERS)
+    assert resp.status_code == 200
+
+    sheet = openpyxl.load_workbook(io.BytesIO(resp.content)).active
+    rows = [[cell.value for cell in row] for row in sheet.iter_rows()]
+    assert ["Cohort: 3"] + [None] * 6 in rows
+    header = rows.index(["Name", "Email", "Cohort", "Affiliated", "Graduated", "Start Date", "End Date"])
+    assert [r[0] for r in rows[header + 1:]] == ["Ada Åström", "Bo Åström", "Cleo Åström"]
+    assert rows[header + 1][2] == 3
+
+
+def test_export_phd_students_as_csv(client):
+    for first_name in ["Bo", "Ada"]:
+        _create_student(client, first_name, "Åström", cohort=4)
+
+    resp = client.get(
+        "/phd-students/export/phd-students.xlsx", params={"cohort_number": 4, "format": "csv"}, headers=HEADERS
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "text/csv; charset=utf-8"
+    assert resp.headers["content-disposition"] == "attachment; filename=phd_students.csv"
+    lines = resp.text.splitlines()
+    assert lines[0] == "Name,Email,Cohort,Affiliated,Graduated,Start Date,End Date"
+    assert [line.split(",")[0] for line in lines[1:]] == ["Ada Åström", "Bo Åström"]
+
+
+def test_export_phd_students_by_branch_lists_each_student_once(client):
+    branch_id = _create_students_in_branch(client, ["Bo", "Ada"], cohort=5)
+
+    resp = client.get(
+        "/phd-students/export/phd-students.xlsx", params={"branch_id": branch_id, "format": "csv"}, headers=HEADERS
+    )
+    assert resp.status_code == 200
+    assert [line.split(",")[0] for line in resp.text.splitlines()[1:]] == ["Ada Fielder", "Bo Fielder"]
+
+
+def test_export_phd_students_rejects_unknown_format(client):
+    resp = client.get("/phd-students/export/phd-students.xlsx", params={"format": "pdf"}, headers=HEADERS)
+    assert resp.status_code == 422
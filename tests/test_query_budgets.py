@@ -0,0 +1,215 @@
+import importlib
+import pkgutil
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import pytest
+
+from app import models, routers
+from app.dependencies import get_db, get_read_db
+from app.database import Base
+from app.main import app
+from .synthetic_data import populate
+
+# Statement budgets per endpoint.
+#
+# Every request below runs against the synthetic registry at two sizes and
+# must stay within its budget at both, so a lazy load in a loop (N+1) fails
+# here instead of in production. Budgets include the user lookup done by
+# authentication. Keep the scales small enough that no list passes the 500
+# keys selectinload fetches per statement.
+
+SCALES = (0.1, 0.5)
+
+# {student_role} / {supervisor_role} are filled in per registry; other ids exist at every scale
+BUDGETS = {
+    # user
+    "/users/me": 1,
+    "/users/alice": 2,
+    "/users/": 2,
+    # institution
+    "/institutions/": 2,
+    "/institutions/1": 2,
+    "/institutions/export/institutions.xlsx": 2,
+    # domain
+    "/branches/": 2,
+    "/branches/1": 2,
+    "/fields/": 2,
+    "/fields/1": 2,
+    "/researcher-titles/": 2,
+    "/project-call-types/": 2,
+    "/course-terms/": 2,
+    "/grad-school-activity-types/": 2,
+    # grad_school_activity
+    "/grad-school-activities/": 3,
+    "/grad-school-activities/1": 3,
+    "/grad-school-activities/1/student-activities/": 4,
+    "/grad-school-activities/1/student-activities/export/emails": 4,
+    "/grad-school-activities/1/courses/": 4,
+    "/grad-school-activities/export/grad-school-activities.xlsx": 3,
+    # course
+    "/courses/": 3,
+    "/courses/1": 4,
+    "/courses/1/institutions/": 4,
+    "/courses/1/teachers/": 4,
+    "/courses/1/teachers/export/emails": 4,
+    "/courses/1/students/": 3,
+    "/courses/1/students/export/emails": 3,
+    "/courses/1/decision-letters/": 2,
+    "/courses/export/courses.xlsx": 2,
+    # project
+    "/projects/": 3,
+    "/projects/1": 3,
+    "/projects/1/fields/": 5,
+    "/projects/1/people-roles/": 4,
+    "/projects/1/people-roles/export/emails": 4,
+    "/projects/1/research-output-reports/": 2,
+    "/projects/1/decision-letters/": 2,
+    "/projects/export/projects.xlsx": 2,
+    # person
+    "/roles/": 2,
+    "/people/": 4,
+    "/people/1": 4,
+    "/person-roles/": 4,
+    "/person-roles/1": 5,
+    "/person-roles/1/institutions/": 3,
+    "/person-roles/1/fields/": 4,
+    "/person-roles/1/projects/": 4,
+    "/person-roles/1/courses_teaching/": 3,
+    "/person-roles/1/decision-letters/": 2,
+    "/person-roles/{student_role}/supervisors/": 4,
+    "/person-roles/{supervisor_role}/students/": 4,
+    # researcher
+    "/researchers/": 4,
+    "/researchers/1": 8,
+    "/researchers/export/researchers.xlsx": 2,
+    "/researchers/export/emails": 3,
+    # phd_student
+    "/phd-students/": 4,
+    "/phd-students/?search=ann": 4,
+    "/phd-students/1": 6,
+    "/phd-students/1/activities/": 4,
+    "/phd-students/1/courses/": 3,
+    "/phd-students/export/phd-students.xlsx": 2,
+    "/phd-students/export/emails": 3,
+    # postdoc
+    "/postdocs/": 4,
+    "/postdocs/1": 8,
+    "/postdocs/export/postdocs.xlsx": 2,
+    "/postdocs/export/emails": 3,
+    # report
+    "/reports/supervisions/": 4,
+    "/reports/supervisions/export/excel": 2,
+    "/reports/supervisions/export/emails": 2,
+    "/reports/project-leaders/": 3,
+    "/reports/project-leaders/export/excel": 2,
+    "/reports/project-leaders/export/emails": 2,
+    "/reports/semester-abroad-data/": 3,
+    "/reports/semester-abroad-data/export/excel": 2,
+    # search, registry, monitoring, export_job
+    "/search/?q=ann": 5,
+    "/export/registry.xlsx": 11,
+    "/metrics": 1,
+    "/slow-queries": 1,
+    "/export-jobs/unknown": 1,
+}
+# the poll endpoint of an unknown job; the jobs themselves run the export endpoints above
+EXPECTED_STATUS = {"/export-jobs/unknown": 404}
+
+IMPORT_BUDGET = 5
+IMPORT_CSV = (
+    "First Name,Last Name,Email,Start Date,Cohort,Affiliated,Institutions,Fields\n"
+    "Budget,One,budget.one@example.org,2024-09-01,3,yes,,\n"
+    "Budget,Two,budget.two@example.org,2024-09-01,3,no,,\n"
+)
+
+HEADERS = {"X-Dev-User": "alice"}
+
+
+@contextmanager
+def record_statements(engine) -> Iterator[List[str]]:
+    """Collect the SQL of every statement `engine` executes inside the block."""
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(" ".join(statement.split()))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def assert_within_budget(statements: List[str], budget: int, what: str):
+    assert len(statements) <= budget, (
+        f"{what} issued {len(statements)} statements (budget {budget}):\n" + "\n".join(statements)
+    )
+
+
+@pytest.fixture(scope="module", params=SCALES, ids=lambda scale: f"{scale:g}x")
+def registry(request):
+    """A synthetic registry at one scale: (engine, client, ids for the URL placeholders)."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+    try:
+        populate(db, scale=request.param)
+        supervision = db.query(models.SupervisorPhDStudent).order_by(models.SupervisorPhDStudent.id).first()
+        ids = {"student_role": supervision.student_role_id, "supervisor_role": supervision.supervisor_role_id}
+    finally:
+        db.close()
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    previous = {dep: app.dependency_overrides.get(dep) for dep in (get_db, get_read_db)}
+    app.dependency_overrides.update({get_db: override_get_db, get_read_db: override_get_db})
+    client = TestClient(app)
+    client.get("/users/me", headers=HEADERS)  # creates the dev user outside the budgets
+    yield engine, client, ids
+    app.dependency_overrides.update(previous)
+    engine.dispose()
+
+
+@pytest.mark.parametrize("url", BUDGETS)
+def test_endpoint_within_statement_budget(registry, url):
+    engine, client, ids = registry
+    with record_statements(engine) as statements:
+        resp = client.get(url.format(**ids), headers=HEADERS)
+    assert resp.status_code == EXPECTED_STATUS.get(url, 200), resp.text
+    assert_within_budget(statements, BUDGETS[url], f"GET {url}")
+
+
+def test_import_dry_run_within_statement_budget(registry):
+    engine, client, _ = registry
+    with record_statements(engine) as statements:
+        resp = client.post("/import/phd-students", params={"dry_run": True}, content=IMPORT_CSV,
+                           headers={**HEADERS, "Content-Type": "text/csv"})
+    assert resp.status_code == 200, resp.text
+    assert_within_budget(statements, IMPORT_BUDGET, "POST /import/phd-students")
+
+
+def test_every_router_has_a_budget():
+    # the first path segment of every GET route in app/routers appears above
+    budgeted = {url.split("?")[0].split("/")[1] for url in BUDGETS}
+    missing = set()
+    for module in pkgutil.iter_modules(routers.__path__):
+        router = importlib.import_module(f"{routers.__name__}.{module.name}").router
+        missing |= {
+            route.path.split("/")[1] for route in router.routes if "GET" in getattr(route, "methods", ())
+        } - budgeted
+    assert not missing, f"no statement budget for any GET /{', /'.join(sorted(missing))}"
@@ -0,0 +1,61 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import pytest
+
+from app import crud
+from app.database import Base
+
+# in-memory SQLite, only used to compile and EXPLAIN the crud queries
+plan_engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+PlanSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=plan_engine
+)
+
+Base.metadata.create_all(bind=plan_engine)
+
+
+def query_plan(fn):
+    """Run `fn(db)` and return the EXPLAIN QUERY PLAN lines of its first SELECT."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    db = PlanSessionLocal()
+    event.listen(plan_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn(db)
+    finally:
+        event.remove(plan_engine, "before_cursor_execute", before_cursor_execute)
+        db.close()
+
+    statement, parameters = statements[0]
+    with plan_engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[3] for row in rows]
+
+
+@pytest.mark.parametrize("fn, expected_index, unscanned", [
+    (lambda db: crud.get_institutions(db),
+     "ix_person_institutions_institution_id_end_date_person_role_id", "people_roles"),
+    (lambda db: crud.list_courses(db),
+     "ix_phd_students_courses_course_id", "course_terms"),
+    (lambda db: crud.list_projects(db),
+     "ix_project_fields_project_id_field_id", "project_call_types"),
+    (lambda db: crud.list_phd_students(db, institution_id=1, field_id=1),
+     "ix_person_fields_person_role_id_field_id", "person_fields"),
+    (lambda db: crud.report_supervisions(db, cohort_number=1),
+     "ix_phd_students_person_role_id", "phd_students"),
+])
+def test_key_queries_use_indexes(fn, expected_index, unscanned):
+    plan = query_plan(fn)
+    assert any(expected_index in line for line in plan), plan
+    assert not any(line.startswith(f"SCAN {unscanned}") for line in plan), plan
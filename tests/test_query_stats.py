@@ -0,0 +1,65 @@
+import copy
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+import pytest
+
+from app import query_stats
+from app.config import settings
+from app.query_stats import collect, statement_shape, track_queries
+
+pytestmark = pytest.mark.usefixtures("roles")
+
+
+def test_statement_shape_collapses_in_lists_and_whitespace():
+    assert statement_shape("SELECT a\n  FROM t WHERE id IN (?, ?, ?)") == "SELECT a FROM t WHERE id IN (?)"
+    assert statement_shape("SELECT a FROM t WHERE id IN (?)") == "SELECT a FROM t WHERE id IN (?)"
+
+
+def test_collect_counts_statements_and_flags_repeats(connection):
+    connection.execute(text("SELECT 1"))  # outside collect(): not counted
+    with collect() as stats:
+        for i in range(query_stats.REPEAT_THRESHOLD):
+            connection.execute(text("SELECT id FROM roles WHERE id = :id"), {"id": i})
+        connection.execute(text("SELECT count(*) FROM roles"))
+
+    assert stats.count == query_stats.REPEAT_THRESHOLD + 1
+    assert stats.duration > 0
+    assert stats.repeated() == [("SELECT id FROM roles WHERE id = ?", query_stats.REPEAT_THRESHOLD)]
+
+
+def test_failed_statements_leave_nothing_on_the_connection(connection):
+    info = copy.deepcopy(connection.info)
+    with collect() as stats:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM no_such_table"))
+        connection.execute(text("SELECT 1"))
+
+    assert stats.count == 1  # only statements that completed are counted
+    assert connection.info == info
+
+
+def test_track_queries_is_idempotent(test_engine, connection):
+    track_queries(test_engine)
+    with collect() as stats:
+        connection.execute(text("SELECT 1"))
+    assert stats.count == 1
+
+
+def test_request_reports_query_headers_in_debug(client, monkeypatch):
+    monkeypatch.setattr(settings, "debug", True)
+    client.get("/institutions/", headers={"X-Dev-User": "alice"})  # creates the dev user
+
+    r = client.get("/institutions/", headers={"X-Dev-User": "alice"})
+    assert r.status_code == 200
+    assert int(r.headers["X-DB-Queries"]) > 0
+    assert float(r.headers["X-DB-Time-ms"]) >= 0
+    assert r.headers["X-DB-Repeated-Statements"] == "0"
+
+
+def test_request_omits_query_headers_outside_debug(client, monkeypatch):
+    monkeypatch.setattr(settings, "debug", False)
+    r = client.get("/openapi.json")
+    assert r.status_code == 200
+    assert "X-DB-Queries" not in r.headers
@@ -0,0 +1,99 @@
+import io
+import itertools
+
+import openpyxl
+from sqlalchemy import event
+import pytest
+
+from app import models
+
+pytestmark = pytest.mark.usefixtures("roles")
+
+
+HEADERS = {"X-Dev-User": "alice"}
+_emails = itertools.count()
+
+
+def _person_role(db, first_name, role_type):
+    role = db.query(models.Role).filter_by(role=role_type).one()
+    person = models.Person(first_name=first_name, last_name="Example", email=f"reg{next(_emails)}@example.org")
+    pr = models.PersonRole(person=person, role=role)
+    db.add(pr)
+    return pr
+
+
+def _seed(session_factory, n_students):
+    db = session_factory()
+    try:
+        supervisor = _person_role(db, "Ada", models.RoleType.RESEARCHER)
+        db.add(models.Researcher(person_role=supervisor))
+        db.add(models.Postdoc(person_role=_person_role(db, "Bo", models.RoleType.POSTDOC), cohort_number=1))
+        project = models.Project(title="Registry", project_number="P1",
+                                 call_type=models.ProjectCallType(type="Call"))
+        course = models.Course(title="Methods", course_term=models.CourseTerm(season=models.Season.FALL, year=2024))
+        db.add(models.PersonProject(person_role=supervisor, project=project, is_principal_investigator=True))
+        for i in range(n_students):
+            pr = _person_role(db, f"Student{i}", models.RoleType.PHD_STUDENT)
+            student = models.PhDStudent(person_role=pr, cohort_number=2)
+            db.add_all([
+                student,
+                models.SupervisorPhDStudent(supervisor=supervisor, student=pr, is_main=i == 0),
+                models.PhDStudentCourse(student=student, course=course, is_completed=True,
+                                        grade=models.GradeType.PASS),
+            ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def _export(client, test_engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        resp = client.get("/export/registry.xlsx", headers=HEADERS)
+    finally:
+        event.remove(test_engine, "before_cursor_execute", before_cursor_execute)
+    assert resp.status_code == 200
+    return openpyxl.load_workbook(io.BytesIO(resp.content)), len(statements)
+
+
+def _values(sheet):
+    return [[cell.value for cell in row] for row in sheet.iter_rows()]
+
+
+def test_registry_workbook_sheets(client, session_factory, test_engine):
+    _seed(session_factory, 2)
+    workbook, _ = _export(client, test_engine)
+
+    assert workbook.sheetnames == [
+        "PhD Students", "Postdocs", "Researchers", "Projects", "Courses", "Institutions",
+        "Supervisions", "Course Enrolments", "Project Memberships",
+    ]
+    assert [(r[0], r[2]) for r in _values(workbook["PhD Students"])[1:]] == [
+        ("Student0 Example", 2), ("Student1 Example", 2)
+    ]
+    assert [r[0] for r in _values(workbook["Postdocs"])[1:]] == ["Bo Example"]
+    assert [r[1] for r in _values(workbook["Researchers"])[1:]] == ["Ada Example"]
+    assert [(r[0], r[2], r[3], r[5]) for r in _values(workbook["Supervisions"])[1:]] == [
+        ("Ada Example", "Researcher", "Student0 Example", "Yes"),
+        ("Ada Example", "Researcher", "Student1 Example", "No"),
+    ]
+    assert [r[::3] for r in _values(workbook["Course Enrolments"])[1:]] == [
+        ["Methods", "Yes"], ["Methods", "Yes"]
+    ]
+    assert _values(workbook["Project Memberships"])[1][:3] == ["P1", "Registry", "Ada Example"]
+    assert _values(workbook["Projects"])[1][:3] == ["P1", "Call", "Registry"]
+
+
+def test_registry_statement_count_is_flat(client, session_factory, test_engine):
+    _export(client, test_engine)  # provisions the dev user
+    _seed(session_factory, 2)
+    _, few = _export(client, test_engine)
+
+    _seed(session_factory, 10)
+    _, many = _export(client, test_engine)
+    assert many == few
@@ -0,0 +1,53 @@
+import itertools
+
+import pytest
+
+from app import crud, models
+
+pytestmark = pytest.mark.usefixtures("roles")
+
+
+_emails = itertools.count()
+
+
+def _person_role(db, first_name, role_type):
+    role = db.query(models.Role).filter_by(role=role_type).one()
+    person = models.Person(first_name=first_name, last_name="Example", email=f"p{next(_emails)}@example.org")
+    pr = models.PersonRole(person=person, role=role)
+    db.add(pr)
+    return pr
+
+
+def test_report_supervisions_aggregates_per_supervisor(db):
+    bea = _person_role(db, "Bea", models.RoleType.RESEARCHER)
+    ada = _person_role(db, "Ada", models.RoleType.RESEARCHER)
+    students = [_person_role(db, f"S{i}", models.RoleType.PHD_STUDENT) for i in range(3)]
+    db.add_all([
+        models.SupervisorPhDStudent(supervisor=bea, student=students[0], is_main=False),
+        models.SupervisorPhDStudent(supervisor=bea, student=students[1], is_main=True),
+        models.SupervisorPhDStudent(supervisor=ada, student=students[2], is_main=False),
+    ])
+    db.commit()
+
+    assert len(crud.report_supervisions(db)) == 3
+    rows = crud.report_supervisions(db, aggregate=True)
+    assert [(pr.person.first_name, is_main) for pr, is_main in rows] == [("Ada", False), ("Bea", True)]
+
+
+def test_report_project_leaders_aggregates_per_person(db):
+    call_type = models.ProjectCallType(type="Call")
+    projects = [models.Project(title=f"P{i}", project_number=f"N{i}", call_type=call_type) for i in range(2)]
+    cleo = _person_role(db, "Cleo", models.RoleType.RESEARCHER)
+    dan = _person_role(db, "Dan", models.RoleType.RESEARCHER)
+    db.add_all([
+        models.PersonProject(person_role=cleo, project=projects[0], is_principal_investigator=True),
+        models.PersonProject(person_role=cleo, project=projects[1], is_contact_person=True),
+        models.PersonProject(person_role=dan, project=projects[1], is_contact_person=True),
+        models.PersonProject(person_role=dan, project=projects[0]),  # regular member: excluded
+    ])
+    db.commit()
+
+    rows = crud.report_project_leaders(db, aggregate=True)
+    assert [(pr.person.first_name, is_pi, is_contact) for pr, is_pi, is_contact in rows] == [
+        ("Cleo", True, True), ("Dan", False, True)
+    ]
@@ -0,0 +1,81 @@
+import itertools
+
+import pytest
+
+pytestmark = pytest.mark.usefixtures("roles")
+
+
+HEADERS = {"X-Dev-User": "alice"}
+_emails = itertools.count()
+
+
+def _create_person(client, first_name, last_name):
+    return client.post("/people/", json={
+        "first_name": first_name, "last_name": last_name, "email": f"person{next(_emails)}@example.org"
+    }, headers=HEADERS).json()
+
+
+def _search_people(client, term):
+    resp = client.get("/people/", params={"search": term}, headers=HEADERS)
+    assert resp.status_code == 200
+    return sorted(p["last_name"] for p in resp.json())
+
+
+def test_people_search_matches_substrings_ignoring_case(client):
+    _create_person(client, "Anna", "Strömberg")
+    _create_person(client, "Erik", "Lindström")
+    _create_person(client, "Ada", "Lovelace")
+
+    assert _search_people(client, "STRÖM") == ["Lindström", "Strömberg"]
+    assert _search_people(client, "ovel") == ["Lovelace"]
+    assert _search_people(client, "person") == ["Lindström", "Lovelace", "Strömberg"]  # email
+
+
+def test_people_search_short_terms_fall_back(client):
+    _create_person(client, "Bo", "Ek")
+    _create_person(client, "Ada", "Lovelace")
+
+    assert _search_people(client, "ek") == ["Ek"]
+
+
+def test_people_search_follows_updates_and_deletes(client):
+    person = _create_person(client, "Anna", "Strömberg")
+    _create_person(client, "Ada", "Lovelace")
+
+    client.put(f"/people/{person['id']}", json={"last_name": "Berg"}, headers=HEADERS)
+    assert _search_people(client, "ström") == []
+    assert _search_people(client, "berg") == ["Berg"]
+
+    client.delete(f"/people/{person['id']}", headers=HEADERS)
+    assert _search_people(client, "berg") == []
+
+
+def test_registry_search_ranks_prefix_matches_first(client):
+    _create_person(client, "Anna", "Lindberg")
+    _create_person(client, "Berit", "Bergman")
+
+    resp = client.get("/search/", params={"q": "berg"}, headers=HEADERS)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [p["last_name"] for p in data["people"]] == ["Bergman", "Lindberg"]
+    assert data["projects"] == [] and data["courses"] == []
+
+
+def test_people_search_ignores_accents(client):
+    _create_person(client, "Åsa", "Öström")
+    _create_person(client, "Asa", "Lindqvist")
+    _create_person(client, "Søren", "Kierkegaard")
+
+    assert _search_people(client, "ostrom") == ["Öström"]
+    assert _search_people(client, "åsa") == ["Lindqvist", "Öström"]
+    assert _search_people(client, "soren") == ["Kierkegaard"]
+    assert _search_people(client, "ÅS") == ["Lindqvist", "Öström"]  # short terms use the key columns too
+
+
+def test_institution_search_ignores_accents(client):
+    for name in ["Göteborgs universitet", "Lunds universitet"]:
+        client.post("/institutions/", json={"institution": name}, headers=HEADERS)
+
+    resp = client.get("/institutions/", params={"search": "GOTEBORG"}, headers=HEADERS)
+    assert resp.status_code == 200
+    assert [i["institution"] for i in resp.json()] == ["Göteborgs universitet"]
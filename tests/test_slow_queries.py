@@ -0,0 +1,77 @@
+import pytest
+
+from app import crud
+from app.config import settings
+from app.query_stats import SlowQueryLog, slow_queries
+
+pytestmark = pytest.mark.usefixtures("roles")
+
+
+@pytest.fixture
+def every_query_is_slow(monkeypatch):
+    monkeypatch.setattr(settings, "slow_query_ms", 1e-9)
+    slow_queries.clear()
+    yield
+    slow_queries.clear()
+
+
+HEADERS = {"X-Dev-User": "alice"}
+
+
+def test_slow_query_is_recorded_with_origin_parameters_and_plan(session_factory, every_query_is_slow):
+    db = session_factory()
+    try:
+        crud.list_researchers(db, institution_id=7, search="ann")
+    finally:
+        db.close()
+
+    # (the test transaction's SAVEPOINT is logged from there too)
+    [entry] = [e for e in slow_queries.worst(200)
+               if e.origin == "app.crud:list_researchers" and e.statement.startswith("SELECT")]
+    assert entry.calls == 1
+    assert entry.max_ms == entry.total_ms > 0
+    assert "7" in entry.parameters
+    assert entry.plan and any(step.lstrip().startswith(("SCAN", "SEARCH")) for step in entry.plan)
+
+
+def test_slow_query_log_is_off_at_zero(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "slow_query_ms", 0)
+    slow_queries.clear()
+    db = session_factory()
+    try:
+        crud.list_researchers(db)
+    finally:
+        db.close()
+    assert slow_queries.worst(200) == []
+
+
+def test_slow_query_log_aggregates_and_evicts_least_slow():
+    log = SlowQueryLog(max_entries=2)
+    explained = []
+
+    def explain():
+        explained.append(True)
+        return ["SCAN t"]
+
+    log.record("A", 5, (1,), "app.crud:a", explain)
+    log.record("A", 3, (2,), "app.crud:a", explain)  # not the slowest: no new plan
+    log.record("B", 1, (), None, explain)
+    log.record("C", 4, (), None, explain)  # evicts B
+
+    assert [(e.statement, e.calls, e.total_ms, e.max_ms) for e in log.worst(10)] == [("A", 2, 8, 5), ("C", 1, 4, 4)]
+    assert log.worst(10)[0].parameters == "(1,)"
+    assert len(explained) == 3
+
+
+def test_slow_queries_endpoint_lists_worst_offenders(client, every_query_is_slow):
+    client.get("/institutions/", headers=HEADERS)
+    for _ in range(3):
+        client.get("/institutions/", headers=HEADERS)
+
+    r = client.get("/slow-queries?order=calls&limit=5", headers=HEADERS)
+    assert r.status_code == 200
+    entries = r.json()
+    assert 0 < len(entries) <= 5
+    assert [e["calls"] for e in entries] == sorted((e["calls"] for e in entries), reverse=True)
+    listing = next(e for e in entries if e["origin"] == "app.crud:get_institutions")
+    assert listing["calls"] >= 4 and listing["plan"]
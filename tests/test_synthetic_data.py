@@ -0,0 +1,39 @@
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.database import Base
+from .synthetic_data import populate
+
+
+def _populated(scale, seed=0):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    db = Session(bind=engine)
+    return db, populate(db, scale=scale, seed=seed)
+
+
+def test_populate_fills_every_table():
+    db, counts = _populated(0.2)
+    try:
+        empty = [t.name for t in Base.metadata.sorted_tables
+                 if t.name not in ("users", "data_version") and not db.execute(t.select().limit(1)).first()]
+        assert empty == []
+        assert counts["phd_students"] == 60
+        assert db.query(func.count(models.Person.id)).scalar() == counts["people"]
+        # rows are indexed for search like any other
+        assert crud.search_registry(db, "ostrom", limit=1)["people"]
+    finally:
+        db.close()
+
+
+def test_populate_is_deterministic():
+    db1, counts1 = _populated(0.2, seed=3)
+    db2, counts2 = _populated(0.2, seed=3)
+    try:
+        assert counts1 == counts2
+        rows = lambda db: db.query(models.Person.email, models.PersonRole.start_date).join(models.PersonRole).all()
+        assert rows(db1) == rows(db2)
+    finally:
+        db1.close()
+        db2.close()
@@ -1,55 +1,4 @@
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-import pytest
-
-from app.dependencies import get_db
-from app.database import Base
-from app.main import app
-
-# Use in-memory SQLite for tests with a single connection pool
-test_engine = create_engine(
-    "sqlite:///:memory:",
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool
-)
-TestingSessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=test_engine
-)
-
-# Create tables once for the in-memory DB
-Base.metadata.create_all(bind=test_engine)
-
-
-# Override the dependency to use our in-memory DB
-def override_get_db():
-    # Base.metadata.create_all(bind=test_engine)
-
-    # tables were created once at import; just hand out the session
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-# Suppress IDE warning about dependency_overrides
-app.dependency_overrides[get_db] = override_get_db  # type: ignore
-client = TestClient(app)
-
-
-# this runs before *each* test, giving us a fresh schema every time
-@pytest.fixture(autouse=True)
-def reset_db():
-    Base.metadata.drop_all(bind=test_engine)
-    Base.metadata.create_all(bind=test_engine)
-    yield
-
-
-def test_create_and_list_user():
+def test_create_and_list_user(client):
     response = client.post(
         "/users/",
         json={
@@ -76,7 +25,7 @@ def test_create_and_list_user():
     assert "bob" in usernames
 
 
-def test_update_user():
+def test_update_user(client):
     # Create a user “bob”
     client.post(
         "/users/",
@@ -96,7 +45,7 @@ def test_update_user():
     assert data["is_admin"] is True
 
 
-def test_delete_user():
+def test_delete_user(client):
     # Create “carol”
     client.post(
         "/users/",
@@ -115,7 +64,7 @@ def test_delete_user():
     assert "carol" not in usernames
 
 
-def test_read_user():
+def test_read_user(client):
     # create bob
     client.post(
         "/users/",
@@ -144,7 +93,7 @@ def test_read_user():
     assert resp.json()["username"] == "bob"
 
 
-def test_filter_users_by_admin_flag():
+def test_filter_users_by_admin_flag(client):
     # Seed some users
     client.post(
         "/users/",
@@ -172,7 +121,7 @@ def test_filter_users_by_admin_flag():
     assert any(u["username"] == "bob" for u in users)
 
 
-def test_search_users_by_substring():
+def test_search_users_by_substring(client):
     # seed two distinct users
     client.post(
         "/users/",